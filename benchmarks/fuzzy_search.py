@@ -0,0 +1,63 @@
+import argparse
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from car.search_one_by.trigram_index import TrigramIndex  # noqa: E402
+
+BRANDS = ['Toyota', 'Nissan', 'Chevrolet', 'Volkswagen', 'Honda', 'Mazda', 'Kia', 'Hyundai', 'Ford', 'BMW',
+          'Mercedes-Benz', 'Audi', 'Peugeot', 'Renault', 'Suzuki', 'Mitsubishi', 'Subaru', 'Volvo', 'Tesla', 'Seat']
+SYLLABLES = ['co', 'ro', 'la', 'ca', 'mry', 'ci', 'vic', 'sen', 'tra', 'ver', 'sa', 'jet', 'ta', 'rio', 'for',
+             'te', 'mus', 'tan', 'go', 'lf', 'po', 'lo', 'xa', 'vi', 'on', 'rav', 'es', 'cape']
+TYPOS = [('brand', 'Toyta'), ('brand', 'Nisan'), ('brand', 'Volkswagn'), ('brand', 'Peujeot'), ('model', 'Corola'),
+         ('model', 'Sentar'), ('model', 'Jeta'), ('model', 'Mustnag')]
+
+
+def build_catalog(size, seed=42):
+    rng = random.Random(seed)
+    models = set()
+    for _ in range(size):
+        model = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if rng.random() < 0.3:
+            model += f' {rng.randint(1, 9)}00'
+        models.add(model)
+    models.update(['Corolla', 'Sentra', 'Jetta', 'Mustang'])
+    return sorted(models)
+
+
+def measure(label, run, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = run()
+    elapsed_us = (time.perf_counter() - started) * 1_000_000 / repeat
+    print(f'{label:<36} {elapsed_us:>12.1f}  {result[:3]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencia de la búsqueda difusa por trigramas de search_one_by.')
+    parser.add_argument('--cars', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    models = build_catalog(args.cars)
+    terms = {'brand': BRANDS, 'model': models}
+
+    index = TrigramIndex(5)
+    started = time.perf_counter()
+    index.build(1, terms)
+    print(f'{args.cars} autos, {len(models)} modelos distintos, índice construido en '
+          f'{(time.perf_counter() - started) * 1000:.1f} ms')
+
+    print(f'{"consulta":<36} {"µs":>12}  resultado')
+    for field, typo in TYPOS:
+        measure(f'trigramas {field}={typo}', lambda: index.search(field, typo), args.repeat)
+        measure(f'difflib   {field}={typo}',
+                lambda: difflib.get_close_matches(typo, terms[field], n=5, cutoff=0.6), max(1, args.repeat // 10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import base64
+import gzip
+import json
+import random
+import time
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BRANDS = ['Toyota', 'Nissan', 'Chevrolet', 'Volkswagen', 'Honda', 'Mazda', 'Kia', 'Hyundai', 'Ford', 'BMW']
+TYPES = ['Sedan', 'SUV', 'Hatchback', 'Pickup', 'Coupe']
+FUELS = ['Gasolina', 'Diesel', 'Híbrido', 'Eléctrico']
+
+
+def build_catalog(size, seed=42):
+    rng = random.Random(seed)
+    cars = []
+    for id_auto in range(1, size + 1):
+        brand = rng.choice(BRANDS)
+        cars.append({
+            'id_auto': id_auto,
+            'model': f'{brand} {rng.randint(1, 99)}',
+            'brand': brand,
+            'year': rng.randint(2005, 2025),
+            'price': "${:,.2f}".format(rng.randint(150000, 1500000)),
+            'type': rng.choice(TYPES),
+            'fuel': rng.choice(FUELS),
+            'doors': rng.choice([2, 4, 5]),
+            'engine': f'{rng.choice([1.4, 1.6, 2.0, 2.5, 3.5])}L',
+            'height': rng.randint(1300, 1900),
+            'width': rng.randint(1600, 2000),
+            'length': rng.randint(3800, 5400),
+            'description': f'Auto {brand} en excelentes condiciones, único dueño, servicio de agencia #{id_auto}.',
+            'status': 'Activo',
+            'images': [f'https://coauto-images.s3.amazonaws.com/autos/{id_auto}/{n}.jpg' for n in range(3)],
+            'average_rating': round(rng.uniform(1, 5), 2)
+        })
+    return cars
+
+
+def measure(label, encode, payload, repeat, binary=True):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encoded = encode(payload)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+    # Compressed bodies travel base64 encoded through API Gateway.
+    body_size = len(base64.b64encode(encoded)) if binary else len(encoded)
+    print(f'{label:<12} {len(encoded):>12,} {body_size:>12,} {elapsed_ms:>10.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tamaño y costo de CPU de comprimir el catálogo de autos.')
+    parser.add_argument('--cars', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    body = json.dumps({
+        'statusCode': 200,
+        'message': 'Autos obtenidos correctamente',
+        'data': build_catalog(args.cars)
+    })
+    payload = body.encode('utf-8')
+
+    print(f'{args.cars} autos, {len(payload):,} bytes sin comprimir')
+    print(f'{"encoding":<12} {"bytes":>12} {"body":>12} {"ms":>10}')
+    measure('identity', lambda data: data, payload, args.repeat, binary=False)
+    for level in (1, 6, 9):
+        measure(f'gzip-{level}', lambda data, level=level: gzip.compress(data, compresslevel=level), payload,
+                args.repeat)
+    if brotli is None:
+        print('brotli no está instalado; se omiten sus mediciones.')
+        return
+    for quality in (1, 5, 11):
+        measure(f'br-{quality}', lambda data, quality=quality: brotli.compress(data, quality=quality), payload,
+                args.repeat)
+
+
+if __name__ == '__main__':
+    main()
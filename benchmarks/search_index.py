@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.response_compression import build_catalog  # noqa: E402
+from car.search_car_by.app import parse_filters  # noqa: E402
+from car.search_car_by.search_index import CatalogIndex  # noqa: E402
+
+QUERIES = [
+    {'brand': 'Toyota'},
+    {'fuel': 'Híbrido,Eléctrico', 'min_year': '2018', 'sort': '-year'},
+    {'type': 'SUV', 'min_price': '300000', 'max_price': '600000', 'sort': 'price'},
+    {'q': 'agencia toyota', 'doors': '4'},
+]
+
+
+def measure(label, run, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    elapsed_us = (time.perf_counter() - started) * 1_000_000 / repeat
+    print(f'{label:<70} {elapsed_us:>12.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencia del índice de búsqueda en memoria de search_car_by.')
+    parser.add_argument('--cars', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    cars = build_catalog(args.cars)
+    for car in cars:
+        car['price'] = float(car['price'].strip('$').replace(',', ''))
+
+    index = CatalogIndex(5)
+    started = time.perf_counter()
+    index.build(1, cars)
+    print(f'{args.cars} autos, índice construido en {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    changed = [dict(car, price=car['price'] * 1.05) for car in cars[::max(1, args.cars // 10)]]
+    started = time.perf_counter()
+    index.apply(2, changed)
+    print(f'{len(changed)} autos modificados aplicados en {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    print(f'{"consulta":<70} {"µs":>12}')
+    for filters in QUERIES:
+        criteria = parse_filters(filters)
+        measure(str(filters), lambda: index.search(criteria), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
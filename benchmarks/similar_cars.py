@@ -0,0 +1,44 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.response_compression import build_catalog  # noqa: E402
+from car.similar_cars.feature_matrix import FeatureMatrix  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latencia de la búsqueda de autos similares con NumPy.')
+    parser.add_argument('--cars', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=6)
+    args = parser.parse_args()
+
+    cars = build_catalog(args.cars)
+    for car in cars:
+        car['price'] = float(car['price'].strip('$').replace(',', ''))
+
+    matrix = FeatureMatrix(5)
+    started = time.perf_counter()
+    matrix.build(1, cars)
+    print(f'{args.cars} autos, matriz {matrix.matrix.shape} construida en '
+          f'{(time.perf_counter() - started) * 1000:.1f} ms')
+
+    rng = random.Random(7)
+    ids = [rng.randint(1, args.cars) for _ in range(args.queries)]
+    timings = []
+    for id_auto in ids:
+        started = time.perf_counter()
+        matrix.nearest(id_auto, args.k)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    print(f'k={args.k}, {args.queries} consultas: p50 {timings[len(timings) // 2]:.2f} ms, '
+          f'p95 {timings[int(len(timings) * 0.95)]:.2f} ms, max {timings[-1]:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
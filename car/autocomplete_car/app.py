@@ -0,0 +1,80 @@
+try:
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+    from prefix_index import prefix_index, RANKINGS
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+    from .prefix_index import prefix_index, RANKINGS
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+MAX_PREFIX_LENGTH = 50
+# Cars in any other status were withdrawn through delete_data_car.
+ACTIVE_CAR_STATUS = 3
+
+COMPLETIONS_QUERY = """SELECT a.brand, a.model, COUNT(*), SUM(rs.rate_count), SUM(rs.rate_sum)
+                       FROM auto a
+                       LEFT JOIN rate_summary rs ON rs.id_auto = a.id_auto
+                       WHERE a.id_status = %s
+                       GROUP BY a.brand, a.model"""
+
+
+def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
+
+    prefix = (query_params.get('q') or '').strip()
+    if not prefix:
+        return handle_response(None, 'Falta el parámetro q.', 400)
+    if len(prefix) > MAX_PREFIX_LENGTH:
+        return handle_response(None, f'El parámetro q no debe exceder los {MAX_PREFIX_LENGTH} caracteres.', 400)
+
+    ranking = query_params.get('rank') or 'count'
+    if ranking not in RANKINGS:
+        return handle_response(None, 'El parámetro rank debe ser count o rating.', 400)
+
+    try:
+        limit = get_limit(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro limit debe ser un entero entre 1 y {MAX_LIMIT}.', 400)
+
+    if prefix_index.needs_version_check():
+        connection = None
+        try:
+            connection = get_connection()
+            refresh_prefix_index(connection)
+        except Exception as e:
+            # A stale index is still a better answer than an error while the user is typing.
+            if prefix_index.version is None:
+                return handle_response(e, 'Ocurrió un error al obtener las sugerencias.', 500)
+        finally:
+            if connection is not None:
+                release_connection(connection)
+
+    completions = prefix_index.complete(prefix, limit, ranking)
+    return handle_response_success(200, 'Sugerencias obtenidas correctamente.', completions, None,
+                                   get_header(event, 'Accept-Encoding'))
+
+
+def get_limit(query_params):
+    limit = int(query_params.get('limit') or DEFAULT_LIMIT)
+    if limit < 1 or limit > MAX_LIMIT:
+        raise ValueError(limit)
+    return limit
+
+
+def refresh_prefix_index(connection):
+    with connection.cursor() as cursor:
+        version = get_catalog_version(cursor)
+        if version == prefix_index.version:
+            prefix_index.mark_checked()
+            return
+
+        cursor.execute(COMPLETIONS_QUERY, (ACTIVE_CAR_STATUS,))
+        rows = cursor.fetchall()
+
+    prefix_index.build(version, rows)
+
+
+def get_catalog_version(cursor):
+    cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+    result = cursor.fetchone()
+    return result[0] if result else 0
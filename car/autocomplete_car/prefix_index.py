@@ -0,0 +1,92 @@
+import heapq
+import os
+import time
+import unicodedata
+from bisect import bisect_left
+
+CATALOG_VERSION_CHECK_SECONDS = int(os.environ.get('CATALOG_VERSION_CHECK_SECONDS', '5'))
+
+RANKINGS = ('count', 'rating')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', ' '.join((text or '').lower().split()))
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+class PrefixIndex:
+    def __init__(self, version_check_seconds):
+        self.version_check_seconds = version_check_seconds
+        self.version = None
+        self.version_checked_at = 0.0
+        self.build(None, [])
+
+    def build(self, version, rows):
+        brands = {}
+        entries = []
+        for brand, model, listing_count, rate_count, rate_sum in rows:
+            if not brand:
+                continue
+            # SUM() over DECIMAL/INT columns comes back as Decimal or NULL.
+            listing_count, rate_count, rate_sum = int(listing_count), int(rate_count or 0), int(rate_sum or 0)
+            totals = brands.setdefault(normalize(brand), [brand, 0, 0, 0])
+            totals[1] += listing_count
+            totals[2] += rate_count
+            totals[3] += rate_sum
+            if model:
+                entries.append(self.make_entry('model', brand, model, listing_count, rate_count, rate_sum))
+
+        entries.extend(self.make_entry('brand', brand, None, *totals) for brand, *totals in brands.values())
+
+        # A model is reachable by its own name and by "brand model".
+        pairs = []
+        for position, entry in enumerate(entries):
+            pairs.append((normalize(entry['text']), position))
+            if entry['type'] == 'model':
+                pairs.append((normalize(entry['model']), position))
+        pairs.sort()
+
+        self.entries = entries
+        self.keys = [key for key, _ in pairs]
+        self.positions = [position for _, position in pairs]
+        self.version = version
+        self.version_checked_at = time.monotonic()
+
+    @staticmethod
+    def make_entry(kind, brand, model, listing_count, rate_count, rate_sum):
+        return {
+            'type': kind,
+            'text': f'{brand} {model}' if model else brand,
+            'brand': brand,
+            'model': model,
+            'count': listing_count,
+            'average_rating': round(rate_sum / rate_count, 2) if rate_count else 0
+        }
+
+    def needs_version_check(self):
+        if self.version is None:
+            return True
+        return time.monotonic() - self.version_checked_at >= self.version_check_seconds
+
+    def mark_checked(self):
+        self.version_checked_at = time.monotonic()
+
+    def complete(self, prefix, limit, ranking='count'):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        start = bisect_left(self.keys, prefix)
+        stop = bisect_left(self.keys, prefix + '\uffff', start)
+        candidates = {self.positions[index] for index in range(start, stop)}
+
+        def rank(position):
+            entry = self.entries[position]
+            if ranking == 'rating':
+                return -entry['average_rating'], -entry['count'], entry['text']
+            return -entry['count'], -entry['average_rating'], entry['text']
+
+        return [self.entries[position] for position in heapq.nsmallest(limit, candidates, key=rank)]
+
+
+prefix_index = PrefixIndex(CATALOG_VERSION_CHECK_SECONDS)
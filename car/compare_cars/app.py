@@ -0,0 +1,171 @@
+import json
+from decimal import Decimal
+try:
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header, \
+        decode_body
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header, \
+        decode_body
+
+MIN_IDS = 2
+MAX_IDS = 5
+
+SPEC_FIELDS = ('price', 'year', 'engine', 'doors', 'height', 'width', 'length', 'average_rating')
+NUMERIC_FIELDS = ('price', 'year', 'doors', 'height', 'width', 'length', 'average_rating')
+
+
+def lambda_handler(event, context):
+    if event.get('queryStringParameters'):
+        raw_ids = event['queryStringParameters'].get('ids')
+    else:
+        try:
+            body = json.loads(decode_body(event, event.get('body') or '{}'))
+            raw_ids = body.get('ids')
+        except (TypeError, AttributeError, json.JSONDecodeError) as e:
+            return handle_response(e, 'Parametros inválidos', 400)
+
+    if not raw_ids:
+        return handle_response(None, 'Falta un parametro.', 400)
+
+    try:
+        ids = parse_ids(raw_ids)
+    except (TypeError, ValueError) as e:
+        return handle_response(e, 'El parámetro ids debe ser una lista de enteros.', 400)
+
+    if len(ids) < MIN_IDS or len(ids) > MAX_IDS:
+        return handle_response(None, f'Se deben comparar entre {MIN_IDS} y {MAX_IDS} autos distintos.', 400)
+
+    connection = None
+
+    try:
+        connection = get_connection()
+        cars_by_id = get_cars(connection, ids)
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener la información de los autos.', 500)
+
+    finally:
+        if connection is not None:
+            release_connection(connection)
+
+    missing = [id_auto for id_auto in ids if id_auto not in cars_by_id]
+    if missing:
+        return handle_response(None, f"No se encontraron los autos: {', '.join(str(id_auto) for id_auto in missing)}.",
+                               404)
+
+    comparison = compare([cars_by_id[id_auto] for id_auto in ids])
+    return handle_response_success(200, 'Comparación obtenida correctamente.', comparison, None,
+                                   get_header(event, 'Accept-Encoding'))
+
+
+def parse_ids(raw_ids):
+    if isinstance(raw_ids, str):
+        raw_ids = [value for value in raw_ids.split(',') if value.strip()]
+    if not isinstance(raw_ids, list):
+        raise TypeError(raw_ids)
+
+    return list(dict.fromkeys(int(str(value).strip()) for value in raw_ids))
+
+
+def compare(cars):
+    specs = {field: [] for field in SPEC_FIELDS}
+    summary = {}
+
+    for car in cars:
+        for field in SPEC_FIELDS:
+            value = car[field]
+            specs[field].append(value)
+            if field not in NUMERIC_FIELDS or value is None:
+                continue
+
+            bounds = summary.get(field)
+            if bounds is None:
+                summary[field] = {'min': value, 'max': value, 'min_ids': [car['id_auto']], 'max_ids': [car['id_auto']]}
+                continue
+            for key, better in (('min', value < bounds['min']), ('max', value > bounds['max'])):
+                if better:
+                    bounds[key] = value
+                    bounds[f'{key}_ids'] = [car['id_auto']]
+                elif value == bounds[key]:
+                    bounds[f'{key}_ids'].append(car['id_auto'])
+
+    for bounds in summary.values():
+        bounds['delta'] = round(bounds['max'] - bounds['min'], 2)
+
+    return {
+        'cars': [
+            {
+                'id_auto': car['id_auto'],
+                'brand': car['brand'],
+                'model': car['model'],
+                'cover_image': car['images'][0] if car['images'] else None
+            }
+            for car in cars
+        ],
+        'specs': specs,
+        'summary': summary
+    }
+
+
+def to_number(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def get_cars(connection, ids):
+    placeholders = ', '.join(['%s'] * len(ids))
+    query = f"SELECT id_auto, model, brand, year, price, engine, doors, height, width, length FROM auto WHERE id_auto IN ({placeholders})"
+    cars = {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, ids)
+        result = cursor.fetchall()
+
+        found = [row[0] for row in result]
+        images = get_images(cursor, found)
+        ratings = get_average_ratings(cursor, found)
+
+        for row in result:
+            cars[row[0]] = {
+                'id_auto': row[0],
+                'model': row[1],
+                'brand': row[2],
+                'year': row[3],
+                'price': to_number(row[4]),
+                'engine': row[5],
+                'doors': row[6],
+                'height': to_number(row[7]),
+                'width': to_number(row[8]),
+                'length': to_number(row[9]),
+                'images': images.get(row[0], []),
+                'average_rating': ratings.get(row[0], 0)
+            }
+
+    return cars
+
+
+def get_images(cursor, ids):
+    images = {}
+    if not ids:
+        return images
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id_auto, url FROM auto_image WHERE id_auto IN ({placeholders})", ids)
+    for id_auto, url in cursor.fetchall():
+        images.setdefault(id_auto, []).append(url)
+
+    return images
+
+
+def get_average_ratings(cursor, ids):
+    ratings = {}
+    if not ids:
+        return ratings
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(
+        f"SELECT id_auto, rate_sum / rate_count FROM rate_summary WHERE id_auto IN ({placeholders}) AND rate_count > 0",
+        ids)
+    for id_auto, average in cursor.fetchall():
+        ratings[id_auto] = round(float(average), 2)
+
+    return ratings
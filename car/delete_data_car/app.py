@@ -1,9 +1,11 @@
 import json
 
 try:
-    from connection import get_connection, handle_response, handle_response_success, get_jwt_claims
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_jwt_claims, \
+        decode_body
 except ImportError:
-    from .connection import get_connection, handle_response, handle_response_success, get_jwt_claims
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_jwt_claims, \
+        decode_body
 
 
 def lambda_handler(event, context):
@@ -23,7 +25,7 @@ def lambda_handler(event, context):
         return handle_response(e, 'Error al decodificar token.', 401)
 
     try:
-        body = json.loads(event['body'])
+        body = json.loads(decode_body(event, event['body']))
     except (TypeError, KeyError, json.JSONDecodeError) as e:
         return handle_response(e, 'Parametros inválidos', 400)
 
@@ -49,12 +51,17 @@ def delete_car(id_auto, id_status):
             if not result:
                 return handle_response(None, 'El status no es válido para autos.', 400)
 
-            cursor.execute("UPDATE auto SET id_status=%s WHERE id_auto=%s", (id_status, id_auto))
+            cursor.execute("UPDATE auto SET id_status=%s, updated_at=CURRENT_TIMESTAMP(6) WHERE id_auto=%s", (id_status, id_auto))
+            bump_catalog_version(cursor)
             connection.commit()
 
     except Exception as e:
         return handle_response(e, 'Error al actualizar auto.', 500)
     finally:
-        connection.close()
+        release_connection(connection)
 
     return handle_response_success(200, 'Auto actualizado correctamente.', None)
+
+
+def bump_catalog_version(cursor):
+    cursor.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
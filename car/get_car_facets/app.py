@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+try:
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+    from cache import facet_cache
+    import search_filters
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+    from .cache import facet_cache
+    from ..search_car_by import search_filters
+
+PRICE_BUCKET_SIZE = int(os.environ.get('PRICE_BUCKET_SIZE', '100000'))
+
+FACET_FIELDS = ('brand', 'model', 'year', 'fuel', 'type', 'doors')
+FROM_CLAUSE = "FROM auto a INNER JOIN status s ON a.id_status = s.id_status"
+
+
+def parse_filters(filters):
+    criteria = search_filters.parse_filters(filters)
+    criteria['price_bucket'] = parse_price_bucket(filters.get('price_bucket'))
+
+    return criteria
+
+
+def parse_price_bucket(price_bucket):
+    if price_bucket in (None, ''):
+        return PRICE_BUCKET_SIZE
+
+    price_bucket = search_filters.parse_value('price_bucket', int, price_bucket)
+    if price_bucket < 1:
+        raise ValueError('price_bucket')
+
+    return price_bucket
+
+
+def build_query(criteria):
+    where, parameters = search_filters.compile_conditions(criteria)
+    bucket = criteria['price_bucket']
+
+    selects = [f"SELECT '{field}', a.{field}, COUNT(*) {FROM_CLAUSE}{where} GROUP BY a.{field}" for field in FACET_FIELDS]
+    params = parameters * len(FACET_FIELDS)
+
+    selects.append(f"SELECT 'price', FLOOR(a.price / %s), COUNT(*) {FROM_CLAUSE}{where} GROUP BY FLOOR(a.price / %s)")
+    params += [bucket] + parameters + [bucket]
+
+    return " UNION ALL ".join(selects), params
+
+
+def cache_key(criteria):
+    return json.dumps([criteria['equals'], criteria['ranges'], criteria['text'], criteria['price_bucket']])
+
+
+def lambda_handler(event, context):
+    filters = event.get('queryStringParameters') or {}
+
+    try:
+        criteria = parse_filters(filters)
+    except ValueError as e:
+        return handle_response(e, f'El filtro {e} no es válido.', 400)
+
+    connection = None
+    key = cache_key(criteria)
+
+    try:
+        if facet_cache.needs_version_check():
+            connection = get_connection()
+            facet_cache.sync_version(get_catalog_version(connection))
+
+        facets = facet_cache.get(key)
+        if facets is None:
+            if connection is None:
+                connection = get_connection()
+            facets = count_facets(connection, criteria)
+            facet_cache.put(key, facets)
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener las facetas.', 500)
+
+    finally:
+        if connection is not None:
+            release_connection(connection)
+
+    logging.info("Facet cache stats: %s", facet_cache.stats())
+    return handle_response_success(200, 'Facetas obtenidas correctamente.', facets, None,
+                                   get_header(event, 'Accept-Encoding'))
+
+
+def count_facets(connection, criteria):
+    query, params = build_query(criteria)
+    bucket = criteria['price_bucket']
+    facets = {field: {} for field in FACET_FIELDS}
+    prices = []
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        for field, value, count in cursor.fetchall():
+            if value is None:
+                continue
+            if field == 'price':
+                start = int(value) * bucket
+                prices.append({'min': start, 'max': start + bucket, 'count': count})
+            else:
+                facets[field][str(value)] = count
+
+    facets['price'] = sorted(prices, key=lambda price: price['min'])
+    return facets
+
+
+def get_catalog_version(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+        result = cursor.fetchone()
+
+    return result[0] if result else 0
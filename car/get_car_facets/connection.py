@@ -0,0 +1,220 @@
+import boto3
+import pymysql
+from botocore.exceptions import ClientError
+import json
+import os
+import time
+import base64
+import gzip
+from pymysql.constants import ER
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+headers_cors = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': '*',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
+}
+
+SECRET_NAME = 'COAUTO'
+REGION_NAME = 'us-east-1'
+SECRET_TTL_SECONDS = int(os.environ.get('SECRET_TTL_SECONDS', '300'))
+ACCESS_DENIED_ERRORS = (ER.ACCESS_DENIED_ERROR, ER.DBACCESS_DENIED_ERROR)
+
+DB_MAX_LIFETIME_SECONDS = int(os.environ.get('DB_MAX_LIFETIME_SECONDS', '3600'))
+DB_IDLE_TIMEOUT_SECONDS = int(os.environ.get('DB_IDLE_TIMEOUT_SECONDS', '300'))
+
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+_secret_cache = {'value': None, 'expires_at': 0.0}
+_connection_state = {'connection': None, 'opened_at': 0.0, 'last_used_at': 0.0}
+
+
+def get_connection():
+    connection = _connection_state['connection']
+    if connection is not None:
+        if is_reusable(connection):
+            return connection
+        discard_connection()
+
+    connection = create_connection()
+    now = time.monotonic()
+    _connection_state['connection'] = connection
+    _connection_state['opened_at'] = now
+    _connection_state['last_used_at'] = now
+
+    return connection
+
+
+def create_connection():
+    secrets = get_secret()
+    try:
+        connection = open_connection(secrets)
+    except pymysql.err.OperationalError as e:
+        if e.args[0] not in ACCESS_DENIED_ERRORS:
+            raise e
+        # The cached credentials may be stale after a rotation.
+        connection = open_connection(get_secret(force_refresh=True))
+
+    return connection
+
+
+def open_connection(secrets):
+    return pymysql.connect(
+        host=secrets['HOST'],
+        user=secrets['USERNAME'],
+        password=secrets['PASSWORD'],
+        database=secrets['DB_NAME']
+    )
+
+
+def is_reusable(connection):
+    now = time.monotonic()
+    if now - _connection_state['opened_at'] > DB_MAX_LIFETIME_SECONDS:
+        return False
+    if now - _connection_state['last_used_at'] > DB_IDLE_TIMEOUT_SECONDS:
+        return False
+
+    try:
+        connection.ping(reconnect=True)
+    except pymysql.MySQLError:
+        return False
+
+    _connection_state['last_used_at'] = now
+    return True
+
+
+def release_connection(connection):
+    if connection is not _connection_state['connection']:
+        connection.close()
+        return
+
+    # Keep the connection for the next invocation, but never leave a transaction
+    # (and its read snapshot) open between requests.
+    try:
+        connection.rollback()
+    except pymysql.MySQLError:
+        discard_connection()
+        return
+
+    _connection_state['last_used_at'] = time.monotonic()
+
+
+def discard_connection():
+    connection = _connection_state['connection']
+    _connection_state['connection'] = None
+    if connection is not None:
+        try:
+            connection.close()
+        except pymysql.MySQLError:
+            pass
+
+
+def get_secret(force_refresh=False):
+    now = time.monotonic()
+    if not force_refresh and _secret_cache['value'] is not None and now < _secret_cache['expires_at']:
+        return _secret_cache['value']
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=REGION_NAME
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=SECRET_NAME
+        )
+        secret = get_secret_value_response['SecretString']
+    except ClientError as e:
+        raise e
+
+    _secret_cache['value'] = json.loads(secret)
+    _secret_cache['expires_at'] = now + SECRET_TTL_SECONDS
+
+    return _secret_cache['value']
+
+
+def clear_secret_cache():
+    _secret_cache['value'] = None
+    _secret_cache['expires_at'] = 0.0
+
+
+def handle_response(error, message, status_code):
+    return {
+        'statusCode': status_code,
+        'headers': headers_cors,
+        'body': json.dumps({
+            'statusCode': status_code,
+            'message': message,
+            'error': str(error)
+        })
+    }
+
+
+def handle_response_success(status_code, message, data, extra=None, accept_encoding=None):
+    body = {
+        'statusCode': status_code,
+        'message': message,
+        'data': data
+    }
+    if extra:
+        body.update(extra)
+
+    return encode_response(status_code, json.dumps(body), headers_cors, accept_encoding)
+
+
+def encode_response(status_code, body, headers, accept_encoding=None):
+    encoding = choose_encoding(accept_encoding) if len(body) >= COMPRESSION_MIN_BYTES else None
+    if encoding is None:
+        return {
+            'statusCode': status_code,
+            'headers': headers,
+            'body': body
+        }
+
+    payload = body.encode('utf-8')
+    if encoding == 'br':
+        payload = brotli.compress(payload, quality=BROTLI_QUALITY)
+    else:
+        payload = gzip.compress(payload, compresslevel=GZIP_LEVEL)
+
+    return {
+        'statusCode': status_code,
+        'headers': {**headers, 'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'},
+        'body': base64.b64encode(payload).decode('ascii'),
+        'isBase64Encoded': True
+    }
+
+
+def choose_encoding(accept_encoding):
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        try:
+            weight = float(params.strip()[2:]) if params.strip().startswith('q=') else 1.0
+        except ValueError:
+            weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    wildcard = weights.get('*', 0.0)
+    if brotli is not None and weights.get('br', wildcard) > 0:
+        return 'br'
+    if weights.get('gzip', wildcard) > 0:
+        return 'gzip'
+    return None
+
+
+def get_header(event, name):
+    headers = event.get('headers') or {}
+    for key, value in headers.items():
+        if key.lower() == name.lower():
+            return value
+    return None
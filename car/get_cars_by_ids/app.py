@@ -0,0 +1,124 @@
+import json
+try:
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header, \
+        decode_body
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header, \
+        decode_body
+
+MAX_IDS = 100
+
+
+def lambda_handler(event, context):
+    if event.get('queryStringParameters'):
+        raw_ids = event['queryStringParameters'].get('ids')
+    else:
+        try:
+            body = json.loads(decode_body(event, event.get('body') or '{}'))
+            raw_ids = body.get('ids')
+        except (TypeError, AttributeError, json.JSONDecodeError) as e:
+            return handle_response(e, 'Parametros inválidos', 400)
+
+    if not raw_ids:
+        return handle_response(None, 'Falta un parametro.', 400)
+
+    try:
+        ids = parse_ids(raw_ids)
+    except (TypeError, ValueError) as e:
+        return handle_response(e, 'El parámetro ids debe ser una lista de enteros.', 400)
+
+    if len(ids) > MAX_IDS:
+        return handle_response(None, f'No se pueden solicitar más de {MAX_IDS} autos a la vez.', 400)
+
+    connection = None
+
+    try:
+        connection = get_connection()
+        cars_by_id = get_cars(connection, ids)
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener la información de los autos.', 500)
+
+    finally:
+        if connection is not None:
+            release_connection(connection)
+
+    cars = [cars_by_id[id_auto] for id_auto in ids if id_auto in cars_by_id]
+    missing = [id_auto for id_auto in ids if id_auto not in cars_by_id]
+
+    return handle_response_success(200, 'Informacion de los autos obtenida correctamente.', cars,
+                                   {'missing': missing}, get_header(event, 'Accept-Encoding'))
+
+
+def parse_ids(raw_ids):
+    if isinstance(raw_ids, str):
+        raw_ids = [value for value in raw_ids.split(',') if value.strip()]
+    if not isinstance(raw_ids, list):
+        raise TypeError(raw_ids)
+
+    # Repeated ids are answered once, in the position of their first appearance.
+    return list(dict.fromkeys(int(str(value).strip()) for value in raw_ids))
+
+
+def get_cars(connection, ids):
+    placeholders = ', '.join(['%s'] * len(ids))
+    query = f"SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status WHERE id_auto IN ({placeholders})"
+    cars = {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, ids)
+        result = cursor.fetchall()
+
+        found = [row[0] for row in result]
+        images = get_images(cursor, found)
+        ratings = get_average_ratings(cursor, found)
+
+        for row in result:
+            cars[row[0]] = {
+                'id_auto': row[0],
+                'model': row[1],
+                'brand': row[2],
+                'year': row[3],
+                'price': "${:,.2f}".format(row[4]),
+                'type': row[5],
+                'fuel': row[6],
+                'doors': row[7],
+                'engine': row[8],
+                'height': row[9],
+                'width': row[10],
+                'length': row[11],
+                'description': row[12],
+                'status': row[13],
+                'images': images.get(row[0], []),
+                'average_rating': ratings.get(row[0], 0)
+            }
+
+    return cars
+
+
+def get_images(cursor, ids):
+    images = {}
+    if not ids:
+        return images
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id_auto, url FROM auto_image WHERE id_auto IN ({placeholders})", ids)
+    for id_auto, url in cursor.fetchall():
+        images.setdefault(id_auto, []).append(url)
+
+    return images
+
+
+def get_average_ratings(cursor, ids):
+    ratings = {}
+    if not ids:
+        return ratings
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(
+        f"SELECT id_auto, rate_sum / rate_count FROM rate_summary WHERE id_auto IN ({placeholders}) AND rate_count > 0",
+        ids)
+    for id_auto, average in cursor.fetchall():
+        ratings[id_auto] = float(average)
+
+    return ratings
@@ -0,0 +1,155 @@
+import base64
+import json
+import os
+from datetime import datetime
+try:
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+# Rows newer than this are left for the next call, so transactions still
+# committing with an earlier timestamp cannot be skipped by the watermark.
+CHANGE_FEED_LAG_SECONDS = float(os.environ.get('CHANGE_FEED_LAG_SECONDS', '2'))
+# insert_data_car publishes cars with this status; any other status is a soft delete.
+ACTIVE_CAR_STATUS = 3
+
+EPOCH = datetime(1970, 1, 1)
+
+CARS_QUERY = """SELECT a.id_auto, a.model, a.brand, a.year, a.price, a.type, a.fuel, a.doors, a.engine, a.height, a.width, a.length, a.description, a.id_status, s.value, a.updated_at
+                FROM auto a
+                INNER JOIN status s ON a.id_status = s.id_status
+                WHERE (a.updated_at > %s OR (a.updated_at = %s AND a.id_auto > %s))
+                  AND a.updated_at <= NOW(6) - INTERVAL %s SECOND
+                ORDER BY a.updated_at, a.id_auto
+                LIMIT %s"""
+RATINGS_QUERY = """SELECT id_auto, rate_count, rate_sum, updated_at
+                   FROM rate_summary
+                   WHERE (updated_at > %s OR (updated_at = %s AND id_auto > %s))
+                     AND updated_at <= NOW(6) - INTERVAL %s SECOND
+                   ORDER BY updated_at, id_auto
+                   LIMIT %s"""
+
+
+def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
+
+    try:
+        limit = get_page_size(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro limit debe ser un entero entre 1 y {MAX_PAGE_SIZE}.', 400)
+
+    since = query_params.get('since')
+    try:
+        watermark = decode_watermark(since) if since else {'cars': (EPOCH, 0), 'ratings': (EPOCH, 0)}
+    except (ValueError, KeyError, TypeError) as e:
+        return handle_response(e, 'El parámetro since no es un cursor válido.', 400)
+
+    connection = None
+
+    try:
+        connection = get_connection()
+        with connection.cursor() as cursor:
+            car_rows, cars_more = fetch_changes(cursor, CARS_QUERY, watermark['cars'], limit)
+            rating_rows, ratings_more = fetch_changes(cursor, RATINGS_QUERY, watermark['ratings'], limit)
+
+            active_ids = [row[0] for row in car_rows if row[13] == ACTIVE_CAR_STATUS]
+            images = get_images(cursor, active_ids)
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener los cambios del catálogo.', 500)
+
+    finally:
+        if connection is not None:
+            release_connection(connection)
+
+    cars = []
+    deleted = []
+    for row in car_rows:
+        if row[13] != ACTIVE_CAR_STATUS:
+            deleted.append({'id_auto': row[0], 'status': row[14]})
+            continue
+        cars.append({
+            'id_auto': row[0],
+            'model': row[1],
+            'brand': row[2],
+            'year': row[3],
+            'price': "${:,.2f}".format(row[4]),
+            'type': row[5],
+            'fuel': row[6],
+            'doors': row[7],
+            'engine': row[8],
+            'height': row[9],
+            'width': row[10],
+            'length': row[11],
+            'description': row[12],
+            'status': row[14],
+            'images': images.get(row[0], [])
+        })
+
+    ratings = [
+        {
+            'id_auto': id_auto,
+            'rate_count': rate_count,
+            'average_rating': float(rate_sum / rate_count) if rate_count else 0
+        }
+        for id_auto, rate_count, rate_sum, _ in rating_rows
+    ]
+
+    if car_rows:
+        watermark['cars'] = (car_rows[-1][-1], car_rows[-1][0])
+    if rating_rows:
+        watermark['ratings'] = (rating_rows[-1][-1], rating_rows[-1][0])
+
+    return handle_response_success(200, 'Cambios del catálogo obtenidos correctamente.',
+                                   {'cars': cars, 'deleted': deleted, 'ratings': ratings},
+                                   {'next_since': encode_watermark(watermark), 'has_more': cars_more or ratings_more},
+                                   get_header(event, 'Accept-Encoding'))
+
+
+def fetch_changes(cursor, query, position, limit):
+    updated_at, last_id = position
+    cursor.execute(query, (updated_at, updated_at, last_id, CHANGE_FEED_LAG_SECONDS, limit + 1))
+    result = cursor.fetchall()
+    return result[:limit], len(result) > limit
+
+
+def get_images(cursor, ids):
+    images = {}
+    if not ids:
+        return images
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id_auto, url FROM auto_image WHERE id_auto IN ({placeholders})", ids)
+    for id_auto, url in cursor.fetchall():
+        images.setdefault(id_auto, []).append(url)
+
+    return images
+
+
+def get_page_size(query_params):
+    limit = query_params.get('limit')
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+
+    limit = int(limit)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(limit)
+
+    return limit
+
+
+def encode_watermark(watermark):
+    token = json.dumps({
+        stream: [updated_at.isoformat(), last_id] for stream, (updated_at, last_id) in watermark.items()
+    }).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('utf-8').rstrip('=')
+
+
+def decode_watermark(token):
+    payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    return {
+        stream: (datetime.fromisoformat(payload[stream][0]), int(payload[stream][1]))
+        for stream in ('cars', 'ratings')
+    }
@@ -1,60 +1,185 @@
+import base64
+import json
 try:
-    from connection import get_connection, handle_response, handle_response_success
+    from connection import get_connection, release_connection, handle_response, handle_response_success, \
+        handle_response_not_modified, get_header
 except ImportError:
-    from .connection import get_connection, handle_response, handle_response_success
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, \
+        handle_response_not_modified, get_header
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+CAR_COLUMNS = {
+    'id_auto': 'a.id_auto',
+    'model': 'a.model',
+    'brand': 'a.brand',
+    'year': 'a.year',
+    'price': 'a.price',
+    'type': 'a.type',
+    'fuel': 'a.fuel',
+    'doors': 'a.doors',
+    'engine': 'a.engine',
+    'height': 'a.height',
+    'width': 'a.width',
+    'length': 'a.length',
+    'description': 'a.description',
+    'status': 's.value'
+}
+RELATED_FIELDS = ('images', 'cover_image', 'average_rating')
+DEFAULT_FIELDS = [*CAR_COLUMNS, 'images', 'average_rating']
 
 
 def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
+
+    try:
+        limit = get_page_size(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro limit debe ser un entero entre 1 y {MAX_PAGE_SIZE}.', 400)
+
+    after = query_params.get('after')
+    try:
+        last_id = decode_cursor(after) if after else None
+    except (ValueError, KeyError, TypeError) as e:
+        return handle_response(e, 'El parámetro after no es un cursor válido.', 400)
+
+    try:
+        fields = get_fields(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro fields contiene campos no válidos: {e}.', 400)
+
+    columns = ['id_auto'] + [field for field in fields if field in CAR_COLUMNS and field != 'id_auto']
+    query = f"SELECT {', '.join(CAR_COLUMNS[column] for column in columns)} FROM auto a INNER JOIN status s ON a.id_status = s.id_status"
+    params = []
+    if last_id is not None:
+        query += " WHERE a.id_auto > %s"
+        params.append(last_id)
+    query += " ORDER BY a.id_auto LIMIT %s"
+    params.append(limit + 1)
+
     connection = get_connection()
 
     cars = []
+    next_cursor = None
 
     try:
         with connection.cursor() as cursor:
-            cursor.execute(
-                "SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status")
+            etag_parts = ['cars', get_catalog_version(cursor), last_id or 0, limit]
+            if query_params.get('fields'):
+                etag_parts.append('+'.join(fields))
+            etag = build_etag(*etag_parts)
+            etag_headers = {'ETag': etag, 'Access-Control-Expose-Headers': 'ETag'}
+            if etag_matches(get_header(event, 'If-None-Match'), etag):
+                return handle_response_not_modified(etag_headers)
+
+            cursor.execute(query, params)
             result = cursor.fetchall()
 
-            for row in result:
-                car = {
-                    'id_auto': row[0],
-                    'model': row[1],
-                    'brand': row[2],
-                    'year': row[3],
-                    'price': "${:,.2f}".format(row[4]),
-                    'type': row[5],
-                    'fuel': row[6],
-                    'doors': row[7],
-                    'engine': row[8],
-                    'height': row[9],
-                    'width': row[10],
-                    'length': row[11],
-                    'description': row[12],
-                    'status': row[13],
-                    'images': [],
-                    'average_rating': None
-                }
-                cursor.execute(
-                    "SELECT url FROM auto_image WHERE id_auto = %s", (row[0],))
-                image_results = cursor.fetchall()
-
-                for image_row in image_results:
-                    car['images'].append(image_row[0])
-
-                cursor.execute(
-                    "SELECT value FROM rate WHERE id_auto = %s", (row[0],))
-                rate_results = cursor.fetchall()
-
-                if rate_results:
-                    average_rating = sum(rate[0] for rate in rate_results) / len(rate_results)
-                else:
-                    average_rating = 0
-
-                car['average_rating'] = average_rating
+            if len(result) > limit:
+                result = result[:limit]
+                next_cursor = encode_cursor(result[-1][0])
+
+            ids = [row[0] for row in result]
+            wants_images = 'images' in fields or 'cover_image' in fields
+            images = get_images(cursor, ids) if wants_images else {}
+            ratings = get_average_ratings(cursor, ids) if 'average_rating' in fields else {}
 
+            for row in result:
+                car = dict(zip(columns, row))
+                if 'price' in car:
+                    car['price'] = "${:,.2f}".format(car['price'])
+                if 'images' in fields:
+                    car['images'] = images.get(row[0], [])
+                if 'cover_image' in fields:
+                    car['cover_image'] = next(iter(images.get(row[0], [])), None)
+                if 'average_rating' in fields:
+                    car['average_rating'] = ratings.get(row[0], 0)
                 cars.append(car)
 
     finally:
-        connection.close()
+        release_connection(connection)
+
+    return handle_response_success(200, 'Autos obtenidos correctamente', cars, {'next_cursor': next_cursor},
+                                   etag_headers, get_header(event, 'Accept-Encoding'))
+
+
+def get_images(cursor, ids):
+    images = {}
+    if not ids:
+        return images
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id_auto, url FROM auto_image WHERE id_auto IN ({placeholders})", ids)
+    for id_auto, url in cursor.fetchall():
+        images.setdefault(id_auto, []).append(url)
+
+    return images
+
+
+def get_average_ratings(cursor, ids):
+    ratings = {}
+    if not ids:
+        return ratings
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(
+        f"SELECT id_auto, rate_sum / rate_count FROM rate_summary WHERE id_auto IN ({placeholders}) AND rate_count > 0",
+        ids)
+    for id_auto, average in cursor.fetchall():
+        ratings[id_auto] = float(average)
+
+    return ratings
+
+
+def get_page_size(query_params):
+    limit = query_params.get('limit')
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+
+    limit = int(limit)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(limit)
+
+    return limit
+
+
+def get_fields(query_params):
+    fields = query_params.get('fields')
+    if not fields:
+        return DEFAULT_FIELDS
+
+    fields = list(dict.fromkeys(field.strip() for field in fields.split(',') if field.strip()))
+    invalid = [field for field in fields if field not in CAR_COLUMNS and field not in RELATED_FIELDS]
+    if invalid or not fields:
+        raise ValueError(', '.join(invalid))
+
+    return fields
+
+
+def encode_cursor(id_auto):
+    token = json.dumps({'id_auto': id_auto}).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('utf-8').rstrip('=')
+
+
+def decode_cursor(token):
+    payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    return int(json.loads(payload)['id_auto'])
+
+
+def get_catalog_version(cursor):
+    cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+    result = cursor.fetchone()
+    return result[0] if result else 0
+
+
+def build_etag(*parts):
+    return '"' + '-'.join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
 
-    return handle_response_success(200, 'Autos obtenidos correctamente', cars)
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or any(candidate.removeprefix('W/') == etag for candidate in candidates)
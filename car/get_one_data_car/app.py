@@ -1,8 +1,13 @@
 import json
+import logging
 try:
-    from connection import get_connection, handle_response, handle_response_success
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header, \
+        decode_body
+    from cache import car_cache
 except ImportError:
-    from .connection import get_connection, handle_response, handle_response_success
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header, \
+        decode_body
+    from .cache import car_cache
 
 
 def lambda_handler(event, context):
@@ -10,52 +15,80 @@ def lambda_handler(event, context):
     if 'queryStringParameters' in event and event['queryStringParameters'] is not None:
         id_auto = event['queryStringParameters'].get('id_auto')
     else:
-        body = json.loads(event.get('body', '{}'))
+        body = json.loads(decode_body(event, event.get('body', '{}')))
         id_auto = body.get('id_auto')
 
     if not id_auto:
         return handle_response(None, 'Falta un parametro.', 400)
 
-    connection = get_connection()
-    query = f"SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status WHERE id_auto = {id_auto}"
-    cars = []
+    connection = None
+    cache_key = str(id_auto)
 
     try:
-        with connection.cursor() as cursor:
-            cursor.execute(query)
-            result = cursor.fetchall()
-
-            for row in result:
-                car = {
-                    'id_auto': row[0],
-                    'model': row[1],
-                    'brand': row[2],
-                    'year': row[3],
-                    'price': row[4],
-                    'type': row[5],
-                    'fuel': row[6],
-                    'doors': row[7],
-                    'engine': row[8],
-                    'height': row[9],
-                    'width': row[10],
-                    'length': row[11],
-                    'description': row[12],
-                    'status': row[13],
-                    'images': []
-                }
-                cursor.execute(
-                    "SELECT url FROM auto_image WHERE id_auto = %s", (row[0],))
-                image_results = cursor.fetchall()
-
-                for image_row in image_results:
-                    car['images'].append(image_row[0])
-
-                cars.append(car)
+        if car_cache.needs_version_check():
+            connection = get_connection()
+            car_cache.sync_version(get_catalog_version(connection))
+
+        cars = car_cache.get(cache_key)
+        if cars is None:
+            if connection is None:
+                connection = get_connection()
+            cars = get_car(connection, id_auto)
+            car_cache.put(cache_key, cars)
 
     except Exception as e:
         return handle_response(e, 'Ocurrió un error al obtener la información del auto.', 500)
 
     finally:
-        connection.close()
+        if connection is not None:
+            release_connection(connection)
+
+    logging.info("Car cache stats: %s", car_cache.stats())
+    return handle_response_success(200, 'Informacion del auto obtenida correctamente.', cars,
+                                   get_header(event, 'Accept-Encoding'))
+
+
+def get_car(connection, id_auto):
+    query = "SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status WHERE id_auto = %s"
+    cars = []
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, (id_auto,))
+        result = cursor.fetchall()
+
+        for row in result:
+            car = {
+                'id_auto': row[0],
+                'model': row[1],
+                'brand': row[2],
+                'year': row[3],
+                'price': row[4],
+                'type': row[5],
+                'fuel': row[6],
+                'doors': row[7],
+                'engine': row[8],
+                'height': row[9],
+                'width': row[10],
+                'length': row[11],
+                'description': row[12],
+                'status': row[13],
+                'images': []
+            }
+            cursor.execute(
+                "SELECT url FROM auto_image WHERE id_auto = %s", (row[0],))
+            image_results = cursor.fetchall()
+
+            for image_row in image_results:
+                car['images'].append(image_row[0])
+
+            cars.append(car)
+
+    return cars
+
+
+def get_catalog_version(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+        result = cursor.fetchone()
 
-    return handle_response_success(200, 'Informacion del auto obtenida correctamente.', cars)
+    return result[0] if result else 0
@@ -0,0 +1,61 @@
+import os
+import time
+from collections import OrderedDict
+
+CAR_CACHE_MAX_ENTRIES = int(os.environ.get('CAR_CACHE_MAX_ENTRIES', '256'))
+CAR_CACHE_TTL_SECONDS = int(os.environ.get('CAR_CACHE_TTL_SECONDS', '300'))
+CATALOG_VERSION_CHECK_SECONDS = int(os.environ.get('CATALOG_VERSION_CHECK_SECONDS', '5'))
+
+
+class CarCache:
+    def __init__(self, max_entries, ttl_seconds, version_check_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self.entries = OrderedDict()
+        self.version = None
+        self.version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def needs_version_check(self):
+        if self.version is None:
+            return True
+        return time.monotonic() - self.version_checked_at >= self.version_check_seconds
+
+    def sync_version(self, version):
+        # Any catalog write bumps the version, so a new value invalidates every entry.
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+        self.version_checked_at = time.monotonic()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries), 'version': self.version}
+
+    def clear(self):
+        self.entries.clear()
+        self.version = None
+        self.version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+
+car_cache = CarCache(CAR_CACHE_MAX_ENTRIES, CAR_CACHE_TTL_SECONDS, CATALOG_VERSION_CHECK_SECONDS)
@@ -1,9 +1,11 @@
 import json
 
 try:
-    from connection import get_connection, handle_response, handle_response_success, get_jwt_claims
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_jwt_claims, \
+        decode_body
 except ImportError:
-    from .connection import get_connection, handle_response, handle_response_success, get_jwt_claims
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_jwt_claims, \
+        decode_body
 
 
 def lambda_handler(event, context):
@@ -23,7 +25,7 @@ def lambda_handler(event, context):
         return handle_response(e, 'Error al decodificar token.', 401)
 
     try:
-        body = json.loads(event['body'])
+        body = json.loads(decode_body(event, event['body']))
     except (TypeError, KeyError, json.JSONDecodeError):
         return handle_response(None, 'Parametros inválidos', 400)
 
@@ -115,12 +117,17 @@ def insert_into_car(model, brand, year, price, type, fuel, doors, engine, height
                 insert_image_query = "INSERT INTO auto_image (id_auto, url) VALUES (%s, %s)"
                 cursor.execute(insert_image_query, (auto_id, image_url))
 
+            bump_catalog_version(cursor)
             connection.commit()
 
     except Exception as e:
         return handle_response(e, 'Error al insertar auto.', 500)
 
     finally:
-        connection.close()
+        release_connection(connection)
 
     return handle_response_success(200, 'Auto guardado correctamente.', None)
+
+
+def bump_catalog_version(cursor):
+    cursor.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
@@ -1,75 +1,139 @@
+import logging
+import os
 try:
-    from connection import get_connection, handle_response_success
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+    from search_index import search_index, SEARCH_INDEX_ENABLED
+    from search_filters import parse_filters, compile_conditions, SORT_COLUMNS
 except ImportError:
-    from .connection import get_connection, handle_response_success
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+    from .search_index import search_index, SEARCH_INDEX_ENABLED
+    from .search_filters import parse_filters, compile_conditions, SORT_COLUMNS
+
+SEARCH_INDEX_MAX_CARS = int(os.environ.get('SEARCH_INDEX_MAX_CARS', '50000'))
+# Same margin as car/get_changed_cars: a write commits within this many
+# seconds of its updated_at, so the next refresh rereads that window.
+CHANGE_FEED_LAG_SECONDS = float(os.environ.get('CHANGE_FEED_LAG_SECONDS', '2'))
+
+CAR_QUERY = "SELECT a.id_auto, a.model, a.brand, a.year, a.price, a.type, a.fuel, a.doors, a.engine, a.height, a.width, a.length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status"
 
 
 def build_query(filters):
-    base_query = "SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status"
-    conditions = []
-    parameters = []
-
-    if 'year' in filters:
-        conditions.append("year = %s")
-        parameters.append(filters['year'])
-    if 'price' in filters:
-        conditions.append("price <= %s")
-        parameters.append(filters['price'])
-    if 'model' in filters:
-        conditions.append("model = %s")
-        parameters.append(filters['model'])
-    if 'brand' in filters:
-        conditions.append("brand = %s")
-        parameters.append(filters['brand'])
-    if 'doors' in filters:
-        conditions.append("doors = %s")
-        parameters.append(filters['doors'])
-
-    if conditions:
-        base_query += " WHERE " + " AND ".join(conditions)
+    return compile_query(parse_filters(filters))
+
+
+def compile_query(criteria):
+    where, parameters = compile_conditions(criteria)
+    base_query = CAR_QUERY + where
+
+    sort_field, descending = criteria['sort']
+    sort_column = SORT_COLUMNS[sort_field]
+    base_query += f" ORDER BY {sort_column} {'DESC' if descending else 'ASC'}"
+    if sort_column != 'a.id_auto':
+        base_query += ", a.id_auto ASC"
+
+    base_query += " LIMIT %s"
+    parameters.append(criteria['limit'])
 
     return base_query, parameters
 
 
 def lambda_handler(event, context):
-    filters = event.get('queryStringParameters', {})
-    connection = get_connection()
-    cars = []
+    filters = event.get('queryStringParameters') or {}
 
     try:
-        query, params = build_query(filters)
-        with connection.cursor() as cursor:
-            cursor.execute(query, params)
-            result = cursor.fetchall()
-
-            for row in result:
-                car = {
-                    'id_auto': row[0],
-                    'model': row[1],
-                    'brand': row[2],
-                    'year': row[3],
-                    'price': row[4],
-                    'type': row[5],
-                    'fuel': row[6],
-                    'doors': row[7],
-                    'engine': row[8],
-                    'height': row[9],
-                    'width': row[10],
-                    'length': row[11],
-                    'description': row[12],
-                    'status': row[13],
-                    'images': []
-                }
-                cursor.execute(
-                    "SELECT url FROM auto_image WHERE id_auto = %s", (row[0],))
-                image_results = cursor.fetchall()
-
-                for image_row in image_results:
-                    car['images'].append(image_row[0])
-
-                cars.append(car)
+        criteria = parse_filters(filters)
+    except ValueError as e:
+        return handle_response(e, f'El filtro {e} no es válido.', 400)
+
+    connection = None
+
+    try:
+        if SEARCH_INDEX_ENABLED and search_index.needs_refresh():
+            connection = get_connection()
+            refresh_search_index(connection)
+
+        if SEARCH_INDEX_ENABLED and search_index.complete:
+            cars = search_index.search(criteria)
+        else:
+            connection = connection or get_connection()
+            with connection.cursor() as cursor:
+                cars = search_cars(cursor, criteria)
 
     finally:
-        connection.close()
+        if connection is not None:
+            release_connection(connection)
+
+    return handle_response_success(200, 'Carros encontrados', cars, None, get_header(event, 'Accept-Encoding'))
+
+
+def search_cars(cursor, criteria):
+    query, params = compile_query(criteria)
+    cursor.execute(query, params)
+    result = cursor.fetchall()
+
+    images = get_images(cursor, [row[0] for row in result])
+    return [build_car(row, images) for row in result]
+
+
+def refresh_search_index(connection):
+    # Keyed on auto.updated_at rather than catalog_version: review writes bump
+    # the version but change nothing the index holds.
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT NOW(6) - INTERVAL %s SECOND", (CHANGE_FEED_LAG_SECONDS,))
+        watermark = cursor.fetchone()[0]
+
+        if search_index.watermark is None:
+            cursor.execute(CAR_QUERY + " ORDER BY a.id_auto LIMIT %s", (SEARCH_INDEX_MAX_CARS + 1,))
+        else:
+            cursor.execute(CAR_QUERY + " WHERE a.updated_at > %s ORDER BY a.id_auto LIMIT %s",
+                           (search_index.watermark, SEARCH_INDEX_MAX_CARS + 1))
+        result = cursor.fetchall()
+        if len(result) > SEARCH_INDEX_MAX_CARS:
+            logging.warning("Catalog exceeds %s cars, searching with SQL", SEARCH_INDEX_MAX_CARS)
+            search_index.mark_incomplete(watermark)
+            return
+
+        images = get_images(cursor, [row[0] for row in result])
+
+    cars = [build_car(row, images) for row in result]
+    if search_index.watermark is None:
+        search_index.build(watermark, cars)
+    else:
+        search_index.apply(watermark, cars)
+
+    if len(search_index.cars) > SEARCH_INDEX_MAX_CARS:
+        logging.warning("Catalog exceeds %s cars, searching with SQL", SEARCH_INDEX_MAX_CARS)
+        search_index.mark_incomplete(watermark)
+
+
+def build_car(row, images):
+    return {
+        'id_auto': row[0],
+        'model': row[1],
+        'brand': row[2],
+        'year': row[3],
+        'price': row[4],
+        'type': row[5],
+        'fuel': row[6],
+        'doors': row[7],
+        'engine': row[8],
+        'height': row[9],
+        'width': row[10],
+        'length': row[11],
+        'description': row[12],
+        'status': row[13],
+        'images': images.get(row[0], [])
+    }
+
+
+def get_images(cursor, ids):
+    images = {}
+    if not ids:
+        return images
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id_auto, url FROM auto_image WHERE id_auto IN ({placeholders})", ids)
+    for id_auto, url in cursor.fetchall():
+        images.setdefault(id_auto, []).append(url)
 
-    return handle_response_success(200, 'Carros encontrados', cars)
+    return images
@@ -0,0 +1,120 @@
+# Filter compiler shared by search_car_by and get_car_facets. This is the
+# only copy: the get_car_facets build copies it into its package (see
+# car/get_car_facets/Makefile).
+import re
+import unicodedata
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+EQUALITY_FILTERS = {
+    'model': ('a.model', str),
+    'brand': ('a.brand', str),
+    'year': ('a.year', int),
+    'doors': ('a.doors', int),
+    'fuel': ('a.fuel', str),
+    'type': ('a.type', str),
+    'status': ('s.value', str)
+}
+MULTI_VALUE_FILTERS = ('fuel', 'type', 'status')
+RANGE_FILTERS = {
+    'price': ('a.price', float),
+    'year': ('a.year', int),
+    'height': ('a.height', float),
+    'width': ('a.width', float),
+    'length': ('a.length', float)
+}
+SORT_COLUMNS = {
+    'id_auto': 'a.id_auto',
+    'price': 'a.price',
+    'year': 'a.year',
+    'brand': 'a.brand',
+    'model': 'a.model'
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def normalize(value):
+    if isinstance(value, str):
+        value = unicodedata.normalize('NFKD', value.strip().lower())
+        return ''.join(char for char in value if not unicodedata.combining(char))
+    return value
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(normalize(text or ''))
+
+
+def parse_filters(filters):
+    criteria = {'equals': [], 'ranges': [], 'text': tokenize(filters.get('q'))}
+
+    for name, (column, cast) in EQUALITY_FILTERS.items():
+        if filters.get(name) in (None, ''):
+            continue
+
+        raw_values = str(filters[name]).split(',') if name in MULTI_VALUE_FILTERS else [filters[name]]
+        criteria['equals'].append((name, [parse_value(name, cast, value) for value in raw_values]))
+
+    # 'price' alone keeps its original meaning of a maximum price.
+    range_filters = dict(filters)
+    if filters.get('price') not in (None, '') and filters.get('max_price') in (None, ''):
+        range_filters['max_price'] = filters['price']
+
+    for name, (column, cast) in RANGE_FILTERS.items():
+        for prefix, operator in (('min_', '>='), ('max_', '<=')):
+            value = range_filters.get(prefix + name)
+            if value in (None, ''):
+                continue
+            criteria['ranges'].append((name, operator, parse_value(prefix + name, cast, value)))
+
+    sort = filters.get('sort') or 'id_auto'
+    if sort.lstrip('-') not in SORT_COLUMNS:
+        raise ValueError('sort')
+
+    criteria['sort'] = (sort.lstrip('-'), sort.startswith('-'))
+    criteria['limit'] = parse_limit(filters.get('limit'))
+
+    return criteria
+
+
+def compile_conditions(criteria):
+    conditions = []
+    parameters = []
+
+    for name, values in criteria['equals']:
+        column = EQUALITY_FILTERS[name][0]
+        if len(values) == 1:
+            conditions.append(f"{column} = %s")
+        else:
+            conditions.append(f"{column} IN ({', '.join(['%s'] * len(values))})")
+        parameters.extend(values)
+
+    for name, operator, value in criteria['ranges']:
+        conditions.append(f"{RANGE_FILTERS[name][0]} {operator} %s")
+        parameters.append(value)
+
+    if criteria['text']:
+        conditions.append("MATCH(a.model, a.brand, a.description) AGAINST (%s IN BOOLEAN MODE)")
+        parameters.append(' '.join('+' + token for token in criteria['text']))
+
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, parameters
+
+
+def parse_value(name, cast, value):
+    try:
+        return cast(str(value).strip())
+    except ValueError:
+        raise ValueError(name)
+
+
+def parse_limit(limit):
+    if limit in (None, ''):
+        return DEFAULT_LIMIT
+
+    limit = parse_value('limit', int, limit)
+    if limit < 1 or limit > MAX_LIMIT:
+        raise ValueError('limit')
+
+    return limit
@@ -0,0 +1,223 @@
+import os
+import time
+from bisect import bisect_left, bisect_right
+try:
+    from search_filters import normalize, tokenize
+except ImportError:
+    from .search_filters import normalize, tokenize
+
+SEARCH_INDEX_ENABLED = os.environ.get('SEARCH_INDEX_ENABLED', 'false').lower() == 'true'
+SEARCH_INDEX_REFRESH_SECONDS = int(os.environ.get('SEARCH_INDEX_REFRESH_SECONDS', '5'))
+
+TEXT_FIELDS = ('brand', 'model', 'description')
+BITSET_FIELDS = ('model', 'brand', 'year', 'doors', 'fuel', 'type', 'status')
+SORTED_FIELDS = ('id_auto', 'price', 'year', 'height', 'width', 'length', 'brand', 'model')
+
+
+def positions_to_mask(positions, size):
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def car_tokens(car):
+    return {token for field in TEXT_FIELDS for token in tokenize(car.get(field))}
+
+
+class SortedField:
+    # Present values ascending, ties by id_auto like the SQL ORDER BY; MySQL
+    # sorts NULL first ascending and last descending.
+    def __init__(self, cars, positions, field):
+        present = [position for position in positions if cars[position].get(field) is not None]
+        present.sort(key=lambda position: (normalize(cars[position][field]), cars[position]['id_auto']))
+        self.values = [normalize(cars[position][field]) for position in present]
+        self.ids = [cars[position]['id_auto'] for position in present]
+        self.positions = present
+        self.missing_ids = [cars[position]['id_auto'] for position in positions
+                            if cars[position].get(field) is None]
+        self.missing_positions = [position for position in positions if cars[position].get(field) is None]
+
+    def locate(self, value, id_auto):
+        if value is None:
+            return bisect_left(self.missing_ids, id_auto)
+        value = normalize(value)
+        return bisect_left(self.ids, id_auto, bisect_left(self.values, value), bisect_right(self.values, value))
+
+    def insert(self, value, id_auto, position):
+        index = self.locate(value, id_auto)
+        if value is None:
+            self.missing_ids.insert(index, id_auto)
+            self.missing_positions.insert(index, position)
+        else:
+            self.values.insert(index, normalize(value))
+            self.ids.insert(index, id_auto)
+            self.positions.insert(index, position)
+
+    def remove(self, value, id_auto):
+        index = self.locate(value, id_auto)
+        if value is None:
+            del self.missing_ids[index], self.missing_positions[index]
+        else:
+            del self.values[index], self.ids[index], self.positions[index]
+
+    def ascending(self):
+        yield from self.missing_positions
+        yield from self.positions
+
+    def descending(self):
+        # Walk the groups of equal values from the end, each group still by id_auto.
+        stop = len(self.values)
+        while stop:
+            start = bisect_left(self.values, self.values[stop - 1], 0, stop)
+            yield from self.positions[start:stop]
+            stop = start
+        yield from self.missing_positions
+
+
+class CatalogIndex:
+    def __init__(self, refresh_seconds):
+        self.refresh_seconds = refresh_seconds
+        self.build(None, [])
+
+    def build(self, watermark, cars):
+        cars = sorted(cars, key=lambda car: car['id_auto'])
+        size = len(cars)
+        self.cars = cars
+        self.positions = {car['id_auto']: position for position, car in enumerate(cars)}
+        self.all_mask = (1 << size) - 1
+
+        postings = {}
+        for position, car in enumerate(cars):
+            for token in car_tokens(car):
+                postings.setdefault(token, []).append(position)
+        self.postings = {token: positions_to_mask(positions, size) for token, positions in postings.items()}
+
+        self.bitsets = {}
+        self.labels = {}
+        for field in BITSET_FIELDS:
+            groups = {}
+            for position, car in enumerate(cars):
+                if car.get(field) is None:
+                    continue
+                key = normalize(car[field])
+                groups.setdefault(key, []).append(position)
+                self.labels.setdefault(field, {}).setdefault(key, car[field])
+            self.bitsets[field] = {key: positions_to_mask(positions, size) for key, positions in groups.items()}
+
+        self.sorted = {field: SortedField(cars, range(size), field) for field in SORTED_FIELDS}
+
+        self.complete = True
+        self.refreshed(watermark)
+
+    def apply(self, watermark, changed):
+        # Patching costs a few list shifts per car; past a quarter of the
+        # catalog a full build is cheaper.
+        if len(changed) * 4 > len(self.cars):
+            merged = {car['id_auto']: car for car in self.cars}
+            merged.update((car['id_auto'], car) for car in changed)
+            self.build(watermark, merged.values())
+            return
+
+        for car in changed:
+            position = self.positions.get(car['id_auto'])
+            if position is None:
+                position = len(self.cars)
+                self.cars.append(car)
+                self.positions[car['id_auto']] = position
+                self.all_mask |= 1 << position
+            else:
+                self.remove_position(position)
+                self.cars[position] = car
+            self.add_position(position)
+
+        self.refreshed(watermark)
+
+    def add_position(self, position):
+        car = self.cars[position]
+        bit = 1 << position
+        for token in car_tokens(car):
+            self.postings[token] = self.postings.get(token, 0) | bit
+        for field in BITSET_FIELDS:
+            if car.get(field) is not None:
+                key = normalize(car[field])
+                self.bitsets[field][key] = self.bitsets[field].get(key, 0) | bit
+                self.labels.setdefault(field, {}).setdefault(key, car[field])
+        for field in SORTED_FIELDS:
+            self.sorted[field].insert(car.get(field), car['id_auto'], position)
+
+    def remove_position(self, position):
+        car = self.cars[position]
+        bit = 1 << position
+        for token in car_tokens(car):
+            self.postings[token] &= ~bit
+            if not self.postings[token]:
+                del self.postings[token]
+        for field in BITSET_FIELDS:
+            if car.get(field) is not None:
+                key = normalize(car[field])
+                self.bitsets[field][key] &= ~bit
+                if not self.bitsets[field][key]:
+                    del self.bitsets[field][key], self.labels[field][key]
+        for field in SORTED_FIELDS:
+            self.sorted[field].remove(car.get(field), car['id_auto'])
+
+    def mark_incomplete(self, watermark):
+        # The catalog outgrew the index: keep it empty and let callers query SQL.
+        self.build(watermark, [])
+        self.complete = False
+
+    def refreshed(self, watermark):
+        self.watermark = watermark
+        self.refreshed_at = time.monotonic()
+
+    def needs_refresh(self):
+        if self.watermark is None:
+            return True
+        return self.complete and time.monotonic() - self.refreshed_at >= self.refresh_seconds
+
+    def match(self, criteria):
+        mask = self.all_mask
+
+        for field, values in criteria['equals']:
+            field_mask = 0
+            for value in values:
+                field_mask |= self.bitsets[field].get(normalize(value), 0)
+            mask &= field_mask
+
+        # min_ and max_ on the same field narrow a single slice, so each field builds one mask.
+        bounds = {}
+        for field, operator, value in criteria['ranges']:
+            values = self.sorted[field].values
+            start, stop = bounds.get(field, (0, len(values)))
+            if operator == '>=':
+                start = max(start, bisect_left(values, value))
+            else:
+                stop = min(stop, bisect_right(values, value))
+            bounds[field] = (start, stop)
+
+        for field, (start, stop) in bounds.items():
+            mask &= positions_to_mask(self.sorted[field].positions[start:stop], len(self.cars))
+
+        for token in criteria['text']:
+            mask &= self.postings.get(token, 0)
+
+        return mask
+
+    def search(self, criteria):
+        mask = self.match(criteria)
+        field, descending = criteria['sort']
+        order = self.sorted[field].descending() if descending else self.sorted[field].ascending()
+
+        bits = mask.to_bytes((len(self.cars) + 7) // 8, 'little')
+        cars = []
+        for position in order:
+            if bits[position >> 3] >> (position & 7) & 1:
+                cars.append(self.cars[position])
+                if len(cars) == criteria['limit']:
+                    break
+
+        return cars
+
+
+search_index = CatalogIndex(SEARCH_INDEX_REFRESH_SECONDS)
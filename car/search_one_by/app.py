@@ -1,9 +1,16 @@
 import json
 
 try:
-    from connection import get_connection, handle_response, handle_response_success
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header, \
+        decode_body
+    from trigram_index import trigram_index
 except ImportError:
-    from .connection import get_connection, handle_response, handle_response_success
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header, \
+        decode_body
+    from .trigram_index import trigram_index
+
+CAR_QUERY = "SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status"
+FUZZY_FIELDS = ('brand', 'model')
 
 
 def lambda_handler(event, context):
@@ -14,7 +21,7 @@ def lambda_handler(event, context):
         attribute_type = event['queryStringParameters'].get('type')
         attribute_value = event['queryStringParameters'].get('value')
     else:
-        body = json.loads(event.get('body', '{}'))
+        body = json.loads(decode_body(event, event.get('body', '{}')))
         attribute_type = body.get('type')
         attribute_value = body.get('value')
 
@@ -31,45 +38,93 @@ def lambda_handler(event, context):
         return handle_response(None, 'Tipo de atributo no válido.', 400)
 
     connection = get_connection()
-    query = f"SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status WHERE {col} = %s"
-    cars = []
+    extra = None
 
     try:
         with connection.cursor() as cursor:
-            cursor.execute(query, (attribute_value,))
-            result = cursor.fetchall()
-
-            for row in result:
-                car = {
-                    'id_auto': row[0],
-                    'model': row[1],
-                    'brand': row[2],
-                    'year': row[3],
-                    'price': row[4],
-                    'type': row[5],
-                    'fuel': row[6],
-                    'doors': row[7],
-                    'engine': row[8],
-                    'height': row[9],
-                    'width': row[10],
-                    'length': row[11],
-                    'description': row[12],
-                    'status': row[13],
-                    'images': []
-                }
-                cursor.execute(
-                    "SELECT url FROM auto_image WHERE id_auto = %s", (row[0],))
-                image_results = cursor.fetchall()
-
-                for image_row in image_results:
-                    car['images'].append(image_row[0])
-
-                cars.append(car)
+            cars = search_cars(cursor, f"{col} = %s", [attribute_value])
+
+            # The trigram index is only touched when the exact lookup finds nothing.
+            if not cars and col in FUZZY_FIELDS:
+                if trigram_index.needs_version_check():
+                    refresh_trigram_index(cursor)
+
+                matches = trigram_index.search(col, attribute_value)
+                if matches:
+                    terms = [term for term, _ in matches]
+                    placeholders = ', '.join(['%s'] * len(terms))
+                    cars = search_cars(cursor, f"{col} IN ({placeholders})", terms)
+
+                    similarities = dict(matches)
+                    cars.sort(key=lambda car: -similarities.get(car[col], 0))
+                    extra = {
+                        'fuzzy': True,
+                        'matches': [{'value': term, 'similarity': similarity} for term, similarity in matches]
+                    }
 
     except Exception as e:
         return handle_response(e, 'Ocurrió un error al obtener la información del auto.', 500)
 
     finally:
-        connection.close()
+        release_connection(connection)
+
+    return handle_response_success(200, 'Consulta exitosa.', cars, extra, get_header(event, 'Accept-Encoding'))
+
+
+def search_cars(cursor, condition, params):
+    cursor.execute(f"{CAR_QUERY} WHERE {condition}", params)
+    result = cursor.fetchall()
+
+    images = get_images(cursor, [row[0] for row in result])
+
+    cars = []
+    for row in result:
+        car = {
+            'id_auto': row[0],
+            'model': row[1],
+            'brand': row[2],
+            'year': row[3],
+            'price': row[4],
+            'type': row[5],
+            'fuel': row[6],
+            'doors': row[7],
+            'engine': row[8],
+            'height': row[9],
+            'width': row[10],
+            'length': row[11],
+            'description': row[12],
+            'status': row[13],
+            'images': images.get(row[0], [])
+        }
+        cars.append(car)
+
+    return cars
+
+
+def refresh_trigram_index(cursor):
+    cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+    result = cursor.fetchone()
+    version = result[0] if result else 0
+    if version == trigram_index.version:
+        trigram_index.mark_checked()
+        return
+
+    terms = {}
+    for field in FUZZY_FIELDS:
+        cursor.execute(f"SELECT DISTINCT {field} FROM auto")
+        terms[field] = [row[0] for row in cursor.fetchall()]
+
+    trigram_index.build(version, terms)
+
+
+def get_images(cursor, ids):
+    images = {}
+    if not ids:
+        return images
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id_auto, url FROM auto_image WHERE id_auto IN ({placeholders})", ids)
+    for id_auto, url in cursor.fetchall():
+        images.setdefault(id_auto, []).append(url)
 
-    return handle_response_success(200, 'Consulta exitosa.', cars)
+    return images
@@ -0,0 +1,83 @@
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+
+CATALOG_VERSION_CHECK_SECONDS = int(os.environ.get('CATALOG_VERSION_CHECK_SECONDS', '5'))
+FUZZY_MIN_SIMILARITY = float(os.environ.get('FUZZY_MIN_SIMILARITY', '0.3'))
+FUZZY_MAX_TERMS = int(os.environ.get('FUZZY_MAX_TERMS', '5'))
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def trigrams(text):
+    text = unicodedata.normalize('NFKD', (text or '').lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+
+    # Same padding as pg_trgm: two spaces before each word and one after.
+    grams = set()
+    for word in WORD_PATTERN.findall(text):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    def __init__(self, version_check_seconds):
+        self.version_check_seconds = version_check_seconds
+        self.version = None
+        self.version_checked_at = 0.0
+        self.build(None, {})
+
+    def build(self, version, terms_by_field):
+        self.terms = {}
+        self.sizes = {}
+        self.postings = {}
+        for field, terms in terms_by_field.items():
+            terms = sorted({term for term in terms if term})
+            postings = {}
+            sizes = []
+            for position, term in enumerate(terms):
+                grams = trigrams(term)
+                sizes.append(len(grams))
+                for gram in grams:
+                    postings.setdefault(gram, []).append(position)
+            self.terms[field] = terms
+            self.sizes[field] = sizes
+            self.postings[field] = postings
+
+        self.version = version
+        self.version_checked_at = time.monotonic()
+
+    def needs_version_check(self):
+        if self.version is None:
+            return True
+        return time.monotonic() - self.version_checked_at >= self.version_check_seconds
+
+    def mark_checked(self):
+        self.version_checked_at = time.monotonic()
+
+    def search(self, field, value, min_similarity=FUZZY_MIN_SIMILARITY, limit=FUZZY_MAX_TERMS):
+        grams = trigrams(value)
+        postings = self.postings.get(field)
+        if not grams or not postings:
+            return []
+
+        # Only terms sharing at least one trigram are ever scored.
+        shared = Counter()
+        for gram in grams:
+            shared.update(postings.get(gram, ()))
+
+        sizes = self.sizes[field]
+        matches = []
+        for position, count in shared.items():
+            similarity = count / (len(grams) + sizes[position] - count)
+            if similarity >= min_similarity:
+                matches.append((self.terms[field][position], round(similarity, 4)))
+
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:limit]
+
+
+trigram_index = TrigramIndex(CATALOG_VERSION_CHECK_SECONDS)
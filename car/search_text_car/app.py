@@ -0,0 +1,145 @@
+import base64
+import json
+import pymysql
+from pymysql.constants import ER
+try:
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_QUERY_LENGTH = 200
+# Relevance pages are OFFSET based, so deep pages rescan every earlier row.
+MAX_OFFSET = 1000
+
+SEARCH_MODES = {
+    'natural': 'IN NATURAL LANGUAGE MODE',
+    'boolean': 'IN BOOLEAN MODE'
+}
+
+
+def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
+
+    text = (query_params.get('q') or '').strip()
+    if not text:
+        return handle_response(None, 'Falta el parámetro q.', 400)
+    if len(text) > MAX_QUERY_LENGTH:
+        return handle_response(None, f'El parámetro q no debe exceder los {MAX_QUERY_LENGTH} caracteres.', 400)
+
+    mode = query_params.get('mode') or 'natural'
+    if mode not in SEARCH_MODES:
+        return handle_response(None, 'El parámetro mode debe ser natural o boolean.', 400)
+
+    try:
+        limit = get_page_size(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro limit debe ser un entero entre 1 y {MAX_PAGE_SIZE}.', 400)
+
+    after = query_params.get('after')
+    try:
+        offset = decode_cursor(after) if after else 0
+    except (ValueError, KeyError, TypeError) as e:
+        return handle_response(e, 'El parámetro after no es un cursor válido.', 400)
+
+    match = f"MATCH(a.model, a.brand, a.description) AGAINST (%s {SEARCH_MODES[mode]})"
+    query = f"""SELECT a.id_auto, a.model, a.brand, a.year, a.price, a.type, a.fuel, a.doors, a.engine, a.height, a.width, a.length, a.description, s.value, {match} AS score
+                FROM auto a
+                INNER JOIN status s ON a.id_status = s.id_status
+                WHERE {match}
+                ORDER BY score DESC, a.id_auto ASC
+                LIMIT %s OFFSET %s"""
+    params = (text, text, limit + 1, offset)
+
+    connection = get_connection()
+
+    cars = []
+    next_cursor = None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            result = cursor.fetchall()
+
+            if len(result) > limit:
+                result = result[:limit]
+                if offset + limit <= MAX_OFFSET:
+                    next_cursor = encode_cursor(offset + limit)
+
+            ids = [row[0] for row in result]
+            images = get_images(cursor, ids)
+
+            for row in result:
+                car = {
+                    'id_auto': row[0],
+                    'model': row[1],
+                    'brand': row[2],
+                    'year': row[3],
+                    'price': row[4],
+                    'type': row[5],
+                    'fuel': row[6],
+                    'doors': row[7],
+                    'engine': row[8],
+                    'height': row[9],
+                    'width': row[10],
+                    'length': row[11],
+                    'description': row[12],
+                    'status': row[13],
+                    'score': round(float(row[14]), 4),
+                    'images': images.get(row[0], [])
+                }
+                cars.append(car)
+
+    except (pymysql.err.ProgrammingError, pymysql.err.InternalError) as e:
+        if mode == 'boolean' and e.args and e.args[0] == ER.PARSE_ERROR:
+            return handle_response(e, 'La búsqueda contiene operadores no válidos.', 400)
+        return handle_response(e, 'Ocurrió un error al buscar autos.', 500)
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al buscar autos.', 500)
+
+    finally:
+        release_connection(connection)
+
+    return handle_response_success(200, 'Carros encontrados', cars, {'next_cursor': next_cursor},
+                                   get_header(event, 'Accept-Encoding'))
+
+
+def get_images(cursor, ids):
+    images = {}
+    if not ids:
+        return images
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id_auto, url FROM auto_image WHERE id_auto IN ({placeholders})", ids)
+    for id_auto, url in cursor.fetchall():
+        images.setdefault(id_auto, []).append(url)
+
+    return images
+
+
+def get_page_size(query_params):
+    limit = query_params.get('limit')
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+
+    limit = int(limit)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(limit)
+
+    return limit
+
+
+def encode_cursor(offset):
+    token = json.dumps({'offset': offset}).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('utf-8').rstrip('=')
+
+
+def decode_cursor(token):
+    payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    offset = int(json.loads(payload)['offset'])
+    if offset < 0 or offset > MAX_OFFSET:
+        raise ValueError(offset)
+
+    return offset
@@ -0,0 +1,119 @@
+try:
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+    from feature_matrix import feature_matrix
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_header
+    from .feature_matrix import feature_matrix
+
+DEFAULT_K = 6
+MAX_K = 20
+# Cars in any other status were withdrawn through delete_data_car.
+ACTIVE_CAR_STATUS = 3
+
+FEATURES_QUERY = """SELECT a.id_auto, a.brand, a.model, a.year, a.price, a.doors, a.height, a.width, a.length, a.fuel, a.type, rs.rate_sum / rs.rate_count
+                    FROM auto a
+                    LEFT JOIN rate_summary rs ON rs.id_auto = a.id_auto AND rs.rate_count > 0
+                    WHERE a.id_status = %s
+                    ORDER BY a.id_auto"""
+
+
+def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
+
+    try:
+        id_auto = int(query_params.get('id_auto'))
+    except (TypeError, ValueError):
+        return handle_response(None, 'Falta un parametro.', 400)
+
+    try:
+        k = int(query_params.get('k') or DEFAULT_K)
+        if k < 1 or k > MAX_K:
+            raise ValueError(k)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro k debe ser un entero entre 1 y {MAX_K}.', 400)
+
+    connection = None
+
+    try:
+        connection = get_connection()
+        if feature_matrix.needs_version_check():
+            refresh_feature_matrix(connection)
+
+        neighbours = feature_matrix.nearest(id_auto, k)
+        if neighbours is None:
+            return handle_response(None, 'El auto no existe.', 404)
+
+        with connection.cursor() as cursor:
+            covers = get_cover_images(cursor, [car['id_auto'] for car, _ in neighbours])
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener los autos similares.', 500)
+
+    finally:
+        if connection is not None:
+            release_connection(connection)
+
+    cars = [
+        {
+            'id_auto': car['id_auto'],
+            'brand': car['brand'],
+            'model': car['model'],
+            'year': car['year'],
+            'price': car['price'],
+            'fuel': car['fuel'],
+            'type': car['type'],
+            'average_rating': car['average_rating'],
+            'cover_image': covers.get(car['id_auto']),
+            'distance': round(distance, 4)
+        }
+        for car, distance in neighbours
+    ]
+
+    return handle_response_success(200, 'Autos similares obtenidos correctamente.', cars, None,
+                                   get_header(event, 'Accept-Encoding'))
+
+
+def refresh_feature_matrix(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+        result = cursor.fetchone()
+        version = result[0] if result else 0
+        if version == feature_matrix.version:
+            feature_matrix.mark_checked()
+            return
+
+        cursor.execute(FEATURES_QUERY, (ACTIVE_CAR_STATUS,))
+        rows = cursor.fetchall()
+
+    cars = [
+        {
+            'id_auto': row[0],
+            'brand': row[1],
+            'model': row[2],
+            'year': row[3],
+            'price': float(row[4]) if row[4] is not None else None,
+            'doors': row[5],
+            'height': row[6],
+            'width': row[7],
+            'length': row[8],
+            'fuel': row[9],
+            'type': row[10],
+            'average_rating': round(float(row[11]), 2) if row[11] is not None else 0
+        }
+        for row in rows
+    ]
+
+    feature_matrix.build(version, cars)
+
+
+def get_cover_images(cursor, ids):
+    covers = {}
+    if not ids:
+        return covers
+
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f"SELECT id_auto, url FROM auto_image WHERE id_auto IN ({placeholders})", ids)
+    for id_auto, url in cursor.fetchall():
+        covers.setdefault(id_auto, url)
+
+    return covers
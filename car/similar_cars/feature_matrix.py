@@ -0,0 +1,74 @@
+import os
+import time
+
+import numpy as np
+
+CATALOG_VERSION_CHECK_SECONDS = int(os.environ.get('CATALOG_VERSION_CHECK_SECONDS', '5'))
+
+NUMERIC_FEATURES = ('price', 'year', 'doors', 'height', 'width', 'length', 'average_rating')
+CATEGORICAL_FEATURES = ('fuel', 'type')
+# A one-hot mismatch moves two columns; this weight makes it count as one standard deviation.
+CATEGORICAL_WEIGHT = np.float32(1 / np.sqrt(2))
+
+
+class FeatureMatrix:
+    def __init__(self, version_check_seconds):
+        self.version_check_seconds = version_check_seconds
+        self.version = None
+        self.version_checked_at = 0.0
+        self.build(None, [])
+
+    def build(self, version, cars):
+        self.cars = cars
+        self.positions = {car['id_auto']: position for position, car in enumerate(cars)}
+
+        columns = []
+        for feature in NUMERIC_FEATURES:
+            values = np.array([np.nan if car[feature] is None else float(car[feature]) for car in cars],
+                              dtype=np.float64)
+            present = values[~np.isnan(values)]
+            mean = present.mean() if present.size else 0.0
+            std = present.std() if present.size else 0.0
+            # Missing specs sit at the mean so they neither attract nor repel.
+            columns.append(np.nan_to_num((values - mean) / (std or 1.0), nan=0.0))
+
+        for feature in CATEGORICAL_FEATURES:
+            labels = sorted({car[feature] for car in cars if car[feature] is not None})
+            for label in labels:
+                columns.append(np.array([car[feature] == label for car in cars], dtype=np.float64) * CATEGORICAL_WEIGHT)
+
+        self.matrix = np.column_stack(columns).astype(np.float32) if cars else np.zeros((0, 0), dtype=np.float32)
+        self.norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+
+        self.version = version
+        self.version_checked_at = time.monotonic()
+
+    def needs_version_check(self):
+        if self.version is None:
+            return True
+        return time.monotonic() - self.version_checked_at >= self.version_check_seconds
+
+    def mark_checked(self):
+        self.version_checked_at = time.monotonic()
+
+    def nearest(self, id_auto, k):
+        position = self.positions.get(id_auto)
+        if position is None:
+            return None
+
+        k = min(k, len(self.cars) - 1)
+        if k < 1:
+            return []
+
+        # ||a - b||^2 = ||a||^2 - 2ab + ||b||^2, so one matrix-vector product covers the whole catalog.
+        row = self.matrix[position]
+        distances = self.norms - 2 * (self.matrix @ row) + self.norms[position]
+        distances[position] = np.inf
+
+        candidates = np.argpartition(distances, k - 1)[:k]
+        candidates = candidates[np.lexsort((candidates, distances[candidates]))]
+
+        return [(self.cars[index], float(np.sqrt(max(distances[index], 0.0)))) for index in candidates]
+
+
+feature_matrix = FeatureMatrix(CATALOG_VERSION_CHECK_SECONDS)
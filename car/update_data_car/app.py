@@ -1,8 +1,10 @@
 import json
 try:
-    from connection import get_connection, handle_response, handle_response_success, get_jwt_claims
+    from connection import get_connection, release_connection, handle_response, handle_response_success, get_jwt_claims, \
+        decode_body
 except ImportError:
-    from .connection import get_connection, handle_response, handle_response_success, get_jwt_claims
+    from .connection import get_connection, release_connection, handle_response, handle_response_success, get_jwt_claims, \
+        decode_body
 
 
 def lambda_handler(event, context):
@@ -22,7 +24,7 @@ def lambda_handler(event, context):
         return handle_response(e, 'Error al decodificar token.', 401)
 
     try:
-        body = json.loads(event['body'])
+        body = json.loads(decode_body(event, event['body']))
     except (TypeError, KeyError, json.JSONDecodeError):
         return handle_response(None, 'Cuerpo de la petición inválido.', 400)
 
@@ -104,7 +106,7 @@ def update_car(id_auto, model, brand, year, price, type, fuel, doors, engine, he
     try:
         with connection.cursor() as cursor:
             cursor.execute(
-                "UPDATE auto SET model=%s, brand=%s, year=%s, price=%s, type=%s, fuel=%s, doors=%s, engine=%s, height=%s, width=%s, length=%s, description=%s WHERE id_auto=%s",
+                "UPDATE auto SET model=%s, brand=%s, year=%s, price=%s, type=%s, fuel=%s, doors=%s, engine=%s, height=%s, width=%s, length=%s, description=%s, updated_at=CURRENT_TIMESTAMP(6) WHERE id_auto=%s",
                 (model, brand, year, price, type, fuel, doors, engine, height, width, length, description, id_auto)
             )
 
@@ -124,13 +126,14 @@ def update_car(id_auto, model, brand, year, price, type, fuel, doors, engine, he
                     (url, id_auto)
                 )
 
+            bump_catalog_version(cursor)
             connection.commit()
 
     except Exception as e:
         return handle_response(e, 'Ocurrió un error al actualizar el auto.', 500)
 
     finally:
-        connection.close()
+        release_connection(connection)
 
     return handle_response_success(200, 'Auto actualizado correctamente.', None)
 
@@ -138,3 +141,7 @@ def update_car(id_auto, model, brand, year, price, type, fuel, doors, engine, he
 def get_existing_image_urls(cursor, id_auto):
     cursor.execute("SELECT url FROM auto_image WHERE id_auto = %s", (id_auto,))
     return [row[0] for row in cursor.fetchall()]
+
+
+def bump_catalog_version(cursor):
+    cursor.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
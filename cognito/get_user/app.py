@@ -1,9 +1,9 @@
 import json
 import base64
 try:
-    from database import get_secret, calculate_secret_hash, handle_response, get_connection, close_connection
+    from database import get_secret, calculate_secret_hash, handle_response, get_connection, release_connection
 except ImportError:
-    from .database import get_secret, calculate_secret_hash, handle_response, get_connection, close_connection
+    from .database import get_secret, calculate_secret_hash, handle_response, get_connection, release_connection
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -85,4 +85,4 @@ def get_into_user(token):
         return handle_response(e, 'Ocurrió un error al obtener la información del usuario.', 500)
 
     finally:
-        close_connection(connection)
+        release_connection(connection)
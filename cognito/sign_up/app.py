@@ -1,9 +1,9 @@
 import json
 import boto3
 try:
-    from database import get_secret, calculate_secret_hash, get_connection, handle_response
+    from database import get_secret, calculate_secret_hash, get_connection, release_connection, handle_response
 except ImportError:
-    from .database import get_secret, calculate_secret_hash, get_connection, handle_response
+    from .database import get_secret, calculate_secret_hash, get_connection, release_connection, handle_response
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -139,4 +139,4 @@ def insert_into_user(email, id_cognito, name, lastname):
         return handle_response(e, 'Ocurrió un error al registrar el usuario.', 500)
 
     finally:
-        connection.close()
+        release_connection(connection)
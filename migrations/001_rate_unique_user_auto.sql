@@ -0,0 +1,8 @@
+-- One review per user and car. rate/insert_data_rate relies on this key to
+-- reject duplicates inside its single INSERT ... SELECT.
+--
+-- The ALTER fails if duplicated reviews already exist; list them with:
+--   SELECT id_user, id_auto, COUNT(*) FROM rate GROUP BY id_user, id_auto HAVING COUNT(*) > 1;
+
+ALTER TABLE rate
+    ADD UNIQUE KEY uq_rate_user_auto (id_user, id_auto);
@@ -0,0 +1,23 @@
+-- Per-car review aggregate maintained by rate/insert_data_rate and
+-- rate/delete_data_rate in the same transaction as the review change.
+-- Only active reviews (id_status = 5) are counted. If the table drifts,
+-- run the RebuildRateSummaryFunction lambda to recompute it from rate.
+
+CREATE TABLE rate_summary (
+    id_auto INT NOT NULL,
+    rate_count INT NOT NULL DEFAULT 0,
+    rate_sum INT NOT NULL DEFAULT 0,
+    star_1 INT NOT NULL DEFAULT 0,
+    star_2 INT NOT NULL DEFAULT 0,
+    star_3 INT NOT NULL DEFAULT 0,
+    star_4 INT NOT NULL DEFAULT 0,
+    star_5 INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (id_auto)
+);
+
+INSERT INTO rate_summary (id_auto, rate_count, rate_sum, star_1, star_2, star_3, star_4, star_5)
+SELECT id_auto, COUNT(*), SUM(value),
+       SUM(value = 1), SUM(value = 2), SUM(value = 3), SUM(value = 4), SUM(value = 5)
+FROM rate
+WHERE id_status = 5
+GROUP BY id_auto;
@@ -0,0 +1,9 @@
+-- Single-row counter bumped by every catalog write (cars, their images and
+-- reviews). Warm containers compare it against the version their in-process
+-- caches were built from and drop the cached data when it changes.
+CREATE TABLE catalog_version (
+    id TINYINT NOT NULL PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0
+);
+
+INSERT INTO catalog_version (id, version) VALUES (1, 0);
@@ -0,0 +1,12 @@
+-- Composite indexes for the filters compiled by car/search_car_by.
+-- Equality columns come first and the range/sort column last, so the
+-- common combinations resolve as index range scans:
+--   brand [+ model] [+ year range]
+--   fuel [+ type] + price range / sort by price
+--   year + price range
+--   price range / sort by price with LIMIT
+ALTER TABLE auto
+    ADD INDEX idx_auto_brand_model_year (brand, model, year),
+    ADD INDEX idx_auto_fuel_type_price (fuel, type, price),
+    ADD INDEX idx_auto_year_price (year, price),
+    ADD INDEX idx_auto_price (price);
@@ -0,0 +1,5 @@
+-- Full-text index used by car/search_text_car (MATCH ... AGAINST). The
+-- MATCH column list must be exactly (model, brand, description) for MySQL
+-- to use it.
+ALTER TABLE auto
+    ADD FULLTEXT INDEX ft_auto_model_brand_description (model, brand, description);
@@ -0,0 +1,13 @@
+-- Change timestamps read by car/get_changed_cars. auto.updated_at is set by
+-- insert_data_car (column default), update_data_car and delete_data_car;
+-- update_data_car also touches it when only the image list changes, so a
+-- changed car always carries its current images. rate_summary.updated_at
+-- moves whenever insert/delete_data_rate or rebuild_rate_summary change
+-- the counters. Both indexes serve the (updated_at, id_auto) keyset.
+ALTER TABLE auto
+    ADD COLUMN updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_auto_updated_at (updated_at, id_auto);
+
+ALTER TABLE rate_summary
+    ADD COLUMN updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_rate_summary_updated_at (updated_at, id_auto);
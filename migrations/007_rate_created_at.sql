@@ -0,0 +1,7 @@
+-- Review timestamps for rate/get_rates_by_car. Existing reviews get the
+-- migration time, so among them id_rate alone decides the order. The
+-- index matches the per-car keyset: active reviews of one car, newest
+-- first by (created_at, id_rate).
+ALTER TABLE rate
+    ADD COLUMN created_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_rate_auto_status_created (id_auto, id_status, created_at, id_rate);
@@ -0,0 +1,11 @@
+-- Indexes for rate/search_rate_by, which filters reviews by the brand,
+-- model or year of their car. The join runs from the matching auto rows
+-- into rate through an index on rate.id_auto, so rate is never scanned:
+--   marca  -> idx_auto_brand_model_year (brand, model, year), from 004
+--   año    -> idx_auto_year_price (year, price), from 004
+--   modelo -> idx_auto_model_year below; model is not a leftmost prefix
+--             of any existing index
+-- rate(id_auto, id_status) is already the leftmost prefix of
+-- idx_rate_auto_status_created from 007, so it is not added twice.
+ALTER TABLE auto
+    ADD INDEX idx_auto_model_year (model, year);
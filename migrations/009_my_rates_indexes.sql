@@ -0,0 +1,10 @@
+-- Indexes for rate/get_my_rates. The caller is resolved from the JWT
+-- through user.id_cognito, then their reviews are read newest first by
+-- (created_at, id_rate) straight from the index, without a filesort.
+-- uq_rate_user_auto (id_user, id_auto) from 001 already covers lookups
+-- by id_user alone, but not that order.
+ALTER TABLE user
+    ADD INDEX idx_user_id_cognito (id_cognito);
+
+ALTER TABLE rate
+    ADD INDEX idx_rate_user_created (id_user, created_at, id_rate);
@@ -0,0 +1,11 @@
+-- Single-row counter for changes that only the review listing shows: the
+-- author name and photo, bumped by user/update_data_user and
+-- user/update_photo_user. rate/get_data_rate builds its ETag from this and
+-- catalog_version, so profile edits no longer invalidate the car caches
+-- keyed on catalog_version.
+CREATE TABLE rate_listing_version (
+    id TINYINT NOT NULL PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0
+);
+
+INSERT INTO rate_listing_version (id, version) VALUES (1, 0);
@@ -1,8 +1,8 @@
 import json
 try:
-    from connection import get_connection, handle_response
+    from connection import get_connection, release_connection, handle_response, decode_body
 except ImportError:
-    from .connection import get_connection, handle_response
+    from .connection import get_connection, release_connection, handle_response, decode_body
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -10,10 +10,12 @@ headers_cors = {
     'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
 }
 
+ACTIVE_RATE_STATUS = 5
+
 
 def lambda_handler(event, context):
     try:
-        body = json.loads(event['body'])
+        body = json.loads(decode_body(event, event['body']))
     except (TypeError, KeyError, json.JSONDecodeError) as e:
         return handle_response(e, 'Cuerpo de la petición inválido.', 400)
 
@@ -39,13 +41,24 @@ def update_rate_status(id_rate, id_status):
             if not result:
                 return handle_response(None, 'El status no es válido para las reseñas.', 400)
 
+            cursor.execute("SELECT id_auto, value, id_status FROM rate WHERE id_rate=%s FOR UPDATE", (id_rate,))
+            rate = cursor.fetchone()
+
             cursor.execute("UPDATE rate SET id_status=%s WHERE id_rate=%s", (id_status, id_rate))
+
+            if rate:
+                was_active = rate[2] == ACTIVE_RATE_STATUS
+                is_active = int(id_status) == ACTIVE_RATE_STATUS
+                if was_active != is_active:
+                    update_rate_summary(cursor, rate[0], rate[1], 1 if is_active else -1)
+                    bump_catalog_version(cursor)
+
             connection.commit()
 
     except Exception as e:
         return handle_response(e, 'Error al actualizar las reseñas.', 500)
     finally:
-        connection.close()
+        release_connection(connection)
 
     return {
         'statusCode': 200,
@@ -55,3 +68,24 @@ def update_rate_status(id_rate, id_status):
             'message': 'Reseña actualizada correctamente.'
         }),
     }
+
+
+def update_rate_summary(cursor, id_auto, value, delta):
+    stars = [delta if value == star else 0 for star in range(1, 6)]
+    cursor.execute(
+        """INSERT INTO rate_summary (id_auto, rate_count, rate_sum, star_1, star_2, star_3, star_4, star_5)
+           VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+           ON DUPLICATE KEY UPDATE
+               rate_count = rate_count + VALUES(rate_count),
+               rate_sum = rate_sum + VALUES(rate_sum),
+               star_1 = star_1 + VALUES(star_1),
+               star_2 = star_2 + VALUES(star_2),
+               star_3 = star_3 + VALUES(star_3),
+               star_4 = star_4 + VALUES(star_4),
+               star_5 = star_5 + VALUES(star_5)""",
+        (id_auto, delta, value * delta, *stars)
+    )
+
+
+def bump_catalog_version(cursor):
+    cursor.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
@@ -1,9 +1,11 @@
+import io
 import json
+import pymysql
 
 try:
-    from database import get_connection, handle_response
+    from database import get_connection, release_connection, handle_response, encode_response, get_header
 except ImportError:
-    from .database import get_connection, handle_response
+    from .database import get_connection, release_connection, handle_response, encode_response, get_header
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -11,45 +13,103 @@ headers_cors = {
     'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
 }
 
+RATE_COLUMNS = {
+    'id_rate': 'r.id_rate',
+    'value': 'r.value',
+    'comment': 'r.comment',
+    'model': 'a.model',
+    'brand': 'a.brand',
+    'name': 'u.name',
+    'lastname': 'u.lastname',
+    'id_auto': 'a.id_auto',
+    'profile_image': 'u.profile_image',
+    'status': 's.value'
+}
+
 
 def lambda_handler(event, context):
-    connection = get_connection()
+    query_params = event.get('queryStringParameters') or {}
 
-    rates = []
+    try:
+        fields = get_fields(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro fields contiene campos no válidos: {e}.', 400)
+
+    connection = get_connection()
 
     try:
         with connection.cursor() as cursor:
-            cursor.execute(
-                "SELECT r.id_rate, r.value, comment, a.model, a.brand, u.name, u.lastname, a.id_auto, u.profile_image, s.value AS status FROM rate r INNER JOIN auto a ON r.id_auto=a.id_auto INNER JOIN user u ON r.id_user=u.id_user INNER JOIN status s ON r.id_status=s.id_status;")
-            result = cursor.fetchall()
-
-            for rate in result:
-                rate = {
-                    'id_rate': rate[0],
-                    'value': rate[1],
-                    'comment': rate[2],
-                    'model': rate[3],
-                    'brand': rate[4],
-                    'name': rate[5],
-                    'lastname': rate[6],
-                    'id_auto': rate[7],
-                    'profile_image': rate[8],
-                    'status': rate[9]
+            etag_parts = ['rates', *get_listing_versions(cursor)]
+            if query_params.get('fields'):
+                etag_parts.append('+'.join(fields))
+            etag = build_etag(*etag_parts)
+            etag_headers = {'ETag': etag, 'Access-Control-Expose-Headers': 'ETag'}
+            if etag_matches(get_header(event, 'If-None-Match'), etag):
+                return {
+                    'statusCode': 304,
+                    'headers': {**headers_cors, **etag_headers},
+                    'body': ''
                 }
-                rates.append(rate)
+
+        # Rows are read unbuffered and written straight into the response body,
+        # so neither the driver nor this function holds the whole result set.
+        with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+            cursor.execute(
+                f"SELECT {', '.join(RATE_COLUMNS[field] for field in fields)} FROM rate r INNER JOIN auto a ON r.id_auto=a.id_auto INNER JOIN user u ON r.id_user=u.id_user INNER JOIN status s ON r.id_status=s.id_status;")
+            body = encode_rates(cursor.fetchall_unbuffered(), fields)
 
     except Exception as e:
         return handle_response(e, 'Ocurrió un error al obtener la reseña', 500)
 
     finally:
-        connection.close()
-
-    return {
-        "statusCode": 200,
-        'headers': headers_cors,
-        "body": json.dumps({
-            'statusCode': 200,
-            "message": "Reseñas obtenidas correctamente.",
-            "data": rates
-        }),
-    }
+        release_connection(connection)
+
+    return encode_response(200, body, {**headers_cors, **etag_headers}, get_header(event, 'Accept-Encoding'))
+
+
+def encode_rates(rows, fields):
+    buffer = io.StringIO()
+    buffer.write('{"statusCode": 200, "message": ' + json.dumps("Reseñas obtenidas correctamente.") + ', "data": [')
+    for index, row in enumerate(rows):
+        if index:
+            buffer.write(', ')
+        buffer.write(json.dumps(dict(zip(fields, row))))
+    buffer.write(']}')
+
+    return buffer.getvalue()
+
+
+def get_fields(query_params):
+    fields = query_params.get('fields')
+    if not fields:
+        return list(RATE_COLUMNS)
+
+    fields = list(dict.fromkeys(field.strip() for field in fields.split(',') if field.strip()))
+    invalid = [field for field in fields if field not in RATE_COLUMNS]
+    if invalid or not fields:
+        raise ValueError(', '.join(invalid))
+
+    return fields
+
+
+def get_listing_versions(cursor):
+    # Reviews and cars move catalog_version; author profiles move
+    # rate_listing_version.
+    cursor.execute("""SELECT c.version, l.version
+                      FROM catalog_version c
+                      CROSS JOIN rate_listing_version l
+                      WHERE c.id = 1 AND l.id = 1""")
+    result = cursor.fetchone()
+    return result if result else (0, 0)
+
+
+def build_etag(*parts):
+    return '"' + '-'.join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or any(candidate.removeprefix('W/') == etag for candidate in candidates)
@@ -0,0 +1,139 @@
+import base64
+import json
+from datetime import datetime
+
+try:
+    from connection import get_connection, release_connection, handle_response, encode_response, get_header
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, encode_response, get_header
+
+headers_cors = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': '*',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
+}
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def lambda_handler(event, context):
+    headers = event.get('headers') or {}
+    token = headers.get('Authorization')
+
+    if not token:
+        return handle_response('Missing token.', 'Faltan parámetros.', 401)
+
+    try:
+        decoded_token = get_jwt_claims(token)
+        id_cognito = decoded_token.get('cognito:username')
+        if not id_cognito:
+            raise ValueError('Token sin cognito:username')
+    except Exception as e:
+        return handle_response(e, 'Error al decodificar token.', 401)
+
+    query_params = event.get('queryStringParameters') or {}
+
+    try:
+        limit = get_page_size(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro limit debe ser un entero entre 1 y {MAX_PAGE_SIZE}.', 400)
+
+    after = query_params.get('after')
+    try:
+        position = decode_cursor(after) if after else None
+    except (ValueError, KeyError, TypeError) as e:
+        return handle_response(e, 'El parámetro after no es un cursor válido.', 400)
+
+    query = """SELECT r.id_rate, r.value, r.comment, r.created_at, a.id_auto, a.brand, a.model, a.year, s.value
+               FROM user u
+               INNER JOIN rate r ON r.id_user = u.id_user
+               INNER JOIN auto a ON a.id_auto = r.id_auto
+               INNER JOIN status s ON s.id_status = r.id_status
+               WHERE u.id_cognito = %s"""
+    params = [id_cognito]
+    if position is not None:
+        query += " AND (r.created_at < %s OR (r.created_at = %s AND r.id_rate < %s))"
+        params.extend([position[0], position[0], position[1]])
+    query += " ORDER BY r.created_at DESC, r.id_rate DESC LIMIT %s"
+    params.append(limit + 1)
+
+    connection = get_connection()
+
+    rates = []
+    next_cursor = None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            result = cursor.fetchall()
+
+            if len(result) > limit:
+                result = result[:limit]
+                next_cursor = encode_cursor(result[-1][3], result[-1][0])
+
+            for row in result:
+                rates.append({
+                    'id_rate': row[0],
+                    'value': row[1],
+                    'comment': row[2],
+                    'created_at': row[3].isoformat(),
+                    'id_auto': row[4],
+                    'brand': row[5],
+                    'model': row[6],
+                    'year': row[7],
+                    'status': row[8]
+                })
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener las reseñas', 500)
+
+    finally:
+        release_connection(connection)
+
+    body = json.dumps({
+        'statusCode': 200,
+        'message': 'Reseñas obtenidas correctamente.',
+        'data': rates,
+        'next_cursor': next_cursor
+    })
+
+    return encode_response(200, body, headers_cors, get_header(event, 'Accept-Encoding'))
+
+
+def get_page_size(query_params):
+    limit = query_params.get('limit')
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+
+    limit = int(limit)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(limit)
+
+    return limit
+
+
+def encode_cursor(created_at, id_rate):
+    token = json.dumps({'created_at': created_at.isoformat(), 'id_rate': id_rate}).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('utf-8').rstrip('=')
+
+
+def decode_cursor(token):
+    payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    return datetime.fromisoformat(payload['created_at']), int(payload['id_rate'])
+
+
+def get_jwt_claims(token):
+    try:
+        parts = token.split(".")
+        if len(parts) != 3:
+            raise ValueError("Token inválido")
+
+        payload_encoded = parts[1]
+        payload_decoded = base64.b64decode(payload_encoded + "==")
+        claims = json.loads(payload_decoded)
+
+        return claims
+
+    except ValueError as e:
+        raise e
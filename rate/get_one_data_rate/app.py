@@ -1,9 +1,9 @@
 from dotenv import load_dotenv
 import json
 try:
-    from database import get_connection, close_connection, execute_query, handle_response
+    from database import get_connection, release_connection, execute_query, handle_response, decode_body
 except ImportError:
-    from .database import get_connection, close_connection, execute_query, handle_response
+    from .database import get_connection, release_connection, execute_query, handle_response, decode_body
 
 load_dotenv()
 headers_cors = {
@@ -17,7 +17,7 @@ def lambda_handler(event, context):
     if 'queryStringParameters' in event:
         id_auto = event['queryStringParameters'].get('id_auto')
     else:
-        body = json.loads(event.get('body', '{}'))
+        body = json.loads(decode_body(event, event.get('body', '{}')))
         id_auto = body.get('id_auto')
 
     if not id_auto:
@@ -49,7 +49,7 @@ def lambda_handler(event, context):
         return handle_response(e, 'Ocurrió un error al obtener la reseña.', 500)
 
     finally:
-        close_connection(connection)
+        release_connection(connection)
 
     return {
         'statusCode': 200,
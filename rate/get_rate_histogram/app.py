@@ -0,0 +1,52 @@
+import json
+
+try:
+    from connection import get_connection, release_connection, handle_response, encode_response, get_header
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, encode_response, get_header
+
+headers_cors = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': '*',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
+}
+
+
+def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
+
+    try:
+        id_auto = int(query_params.get('id_auto'))
+    except (TypeError, ValueError):
+        return handle_response("Falta un parámetro de búsqueda", 'Debe proporcionar el parámetro id_auto', 400)
+
+    connection = get_connection()
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT rate_count, rate_sum, star_1, star_2, star_3, star_4, star_5 FROM rate_summary WHERE id_auto = %s",
+                (id_auto,))
+            result = cursor.fetchone()
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener las calificaciones', 500)
+
+    finally:
+        release_connection(connection)
+
+    # A car without reviews has no rate_summary row yet.
+    rate_count, rate_sum, *stars = result or (0, 0, 0, 0, 0, 0, 0)
+
+    body = json.dumps({
+        'statusCode': 200,
+        'message': 'Calificaciones obtenidas correctamente.',
+        'data': {
+            'id_auto': id_auto,
+            'rate_count': rate_count,
+            'average_rating': round(rate_sum / rate_count, 2) if rate_count else 0,
+            'histogram': {str(star): count for star, count in enumerate(stars, start=1)}
+        }
+    })
+
+    return encode_response(200, body, headers_cors, get_header(event, 'Accept-Encoding'))
@@ -0,0 +1,111 @@
+import base64
+import json
+from datetime import datetime
+
+try:
+    from connection import get_connection, release_connection, handle_response, encode_response, get_header
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, encode_response, get_header
+
+headers_cors = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': '*',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
+}
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+ACTIVE_RATE_STATUS = 5
+
+
+def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
+
+    try:
+        id_auto = int(query_params.get('id_auto'))
+    except (TypeError, ValueError):
+        return handle_response("Falta un parámetro de búsqueda", 'Debe proporcionar el parámetro id_auto', 400)
+
+    try:
+        limit = get_page_size(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro limit debe ser un entero entre 1 y {MAX_PAGE_SIZE}.', 400)
+
+    after = query_params.get('after')
+    try:
+        position = decode_cursor(after) if after else None
+    except (ValueError, KeyError, TypeError) as e:
+        return handle_response(e, 'El parámetro after no es un cursor válido.', 400)
+
+    query = """SELECT r.id_rate, r.value, r.comment, r.created_at, u.name, u.lastname, u.profile_image
+               FROM rate r
+               INNER JOIN user u ON r.id_user = u.id_user
+               WHERE r.id_auto = %s AND r.id_status = %s"""
+    params = [id_auto, ACTIVE_RATE_STATUS]
+    if position is not None:
+        query += " AND (r.created_at < %s OR (r.created_at = %s AND r.id_rate < %s))"
+        params.extend([position[0], position[0], position[1]])
+    query += " ORDER BY r.created_at DESC, r.id_rate DESC LIMIT %s"
+    params.append(limit + 1)
+
+    connection = get_connection()
+
+    rates = []
+    next_cursor = None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            result = cursor.fetchall()
+
+            if len(result) > limit:
+                result = result[:limit]
+                next_cursor = encode_cursor(result[-1][3], result[-1][0])
+
+            for row in result:
+                rates.append({
+                    'id_rate': row[0],
+                    'value': row[1],
+                    'comment': row[2],
+                    'created_at': row[3].isoformat(),
+                    'name': row[4],
+                    'lastname': row[5],
+                    'profile_image': row[6]
+                })
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener las reseñas', 500)
+
+    finally:
+        release_connection(connection)
+
+    body = json.dumps({
+        'statusCode': 200,
+        'message': 'Reseñas obtenidas correctamente.',
+        'data': rates,
+        'next_cursor': next_cursor
+    })
+
+    return encode_response(200, body, headers_cors, get_header(event, 'Accept-Encoding'))
+
+
+def get_page_size(query_params):
+    limit = query_params.get('limit')
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+
+    limit = int(limit)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(limit)
+
+    return limit
+
+
+def encode_cursor(created_at, id_rate):
+    token = json.dumps({'created_at': created_at.isoformat(), 'id_rate': id_rate}).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('utf-8').rstrip('=')
+
+
+def decode_cursor(token):
+    payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    return datetime.fromisoformat(payload['created_at']), int(payload['id_rate'])
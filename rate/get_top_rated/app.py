@@ -0,0 +1,75 @@
+import json
+import os
+
+try:
+    from connection import get_connection, release_connection, handle_response, encode_response, get_header
+except ImportError:
+    from .connection import get_connection, release_connection, handle_response, encode_response, get_header
+
+headers_cors = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': '*',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
+}
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# Weight of the global mean, in reviews: a car needs about this many reviews
+# before its own average outweighs the catalog-wide one.
+BAYESIAN_PRIOR_WEIGHT = float(os.environ.get('BAYESIAN_PRIOR_WEIGHT', '5'))
+# Cars in any other status were withdrawn through delete_data_car.
+ACTIVE_CAR_STATUS = 3
+
+TOP_RATED_QUERY = """SELECT a.id_auto, a.brand, a.model, a.year, rs.rate_count, rs.rate_sum / rs.rate_count,
+                            (%s * g.mean + rs.rate_sum) / (%s + rs.rate_count) AS score
+                     FROM rate_summary rs
+                     CROSS JOIN (SELECT SUM(rate_sum) / SUM(rate_count) AS mean FROM rate_summary) g
+                     INNER JOIN auto a ON a.id_auto = rs.id_auto
+                     WHERE rs.rate_count > 0 AND a.id_status = %s
+                     ORDER BY score DESC, rs.rate_count DESC, a.id_auto
+                     LIMIT %s"""
+
+
+def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
+
+    try:
+        limit = int(query_params.get('limit') or DEFAULT_LIMIT)
+        if limit < 1 or limit > MAX_LIMIT:
+            raise ValueError(limit)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro limit debe ser un entero entre 1 y {MAX_LIMIT}.', 400)
+
+    connection = get_connection()
+
+    cars = []
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(TOP_RATED_QUERY, (BAYESIAN_PRIOR_WEIGHT, BAYESIAN_PRIOR_WEIGHT, ACTIVE_CAR_STATUS, limit))
+            result = cursor.fetchall()
+
+            for row in result:
+                cars.append({
+                    'id_auto': row[0],
+                    'brand': row[1],
+                    'model': row[2],
+                    'year': row[3],
+                    'rate_count': row[4],
+                    'average_rating': round(float(row[5]), 2),
+                    'score': round(float(row[6]), 4)
+                })
+
+    except Exception as e:
+        return handle_response(e, 'Ocurrió un error al obtener los autos mejor calificados', 500)
+
+    finally:
+        release_connection(connection)
+
+    body = json.dumps({
+        'statusCode': 200,
+        'message': 'Autos mejor calificados obtenidos correctamente.',
+        'data': cars
+    })
+
+    return encode_response(200, body, headers_cors, get_header(event, 'Accept-Encoding'))
@@ -0,0 +1,238 @@
+import json
+import base64
+import os
+
+try:
+    from database import UnitOfWork, handle_response, decode_body
+except ImportError:
+    from .database import UnitOfWork, handle_response, decode_body
+
+headers_cors = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': '*',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
+}
+
+MAX_LINES = int(os.environ.get('IMPORT_MAX_LINES', '10000'))
+CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', '500'))
+ACTIVE_RATE_STATUS = 5
+
+INSERT_RATE_QUERY = "INSERT INTO rate (value, comment, id_auto, id_user, id_status) VALUES (%s, %s, %s, %s, %s)"
+UPDATE_SUMMARY_QUERY = """INSERT INTO rate_summary (id_auto, rate_count, rate_sum, star_1, star_2, star_3, star_4, star_5)
+                          VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                          ON DUPLICATE KEY UPDATE
+                              rate_count = rate_count + VALUES(rate_count),
+                              rate_sum = rate_sum + VALUES(rate_sum),
+                              star_1 = star_1 + VALUES(star_1),
+                              star_2 = star_2 + VALUES(star_2),
+                              star_3 = star_3 + VALUES(star_3),
+                              star_4 = star_4 + VALUES(star_4),
+                              star_5 = star_5 + VALUES(star_5)"""
+
+
+def lambda_handler(event, context):
+    headers = event.get('headers', {})
+    token = headers.get('Authorization')
+
+    if not token:
+        return handle_response('Missing token.', 'Faltan parámetros.', 401)
+
+    try:
+        decoded_token = get_jwt_claims(token)
+        role = decoded_token.get('cognito:groups')
+        if 'ClientUserGroup' in role:
+            return handle_response('Acceso denegado. El rol no puede ser cliente.', 'Acceso denegado.', 401)
+
+    except Exception as e:
+        return handle_response(e, 'Error al decodificar token.', 401)
+
+    body = decode_body(event, event.get('body'))
+    if not body:
+        return handle_response(None, 'Cuerpo de la petición inválido.', 400)
+
+    lines = body.splitlines()
+    if len(lines) > MAX_LINES:
+        return handle_response(None, f'No se pueden importar más de {MAX_LINES} reseñas a la vez.', 400)
+
+    reviews, errors = parse_lines(lines)
+
+    try:
+        with UnitOfWork() as uow:
+            imported = import_rates(uow, reviews, errors)
+            uow.commit()
+    except Exception as e:
+        return handle_response(e, 'Error al importar las reseñas.', 500)
+
+    errors.sort(key=lambda error: error['line'])
+
+    return {
+        'statusCode': 200,
+        'headers': headers_cors,
+        'body': json.dumps({
+            'statusCode': 200,
+            'message': 'Importación completada.',
+            'imported': imported,
+            'errors': errors
+        })
+    }
+
+
+def parse_lines(lines):
+    reviews = []
+    errors = []
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            review = json.loads(line)
+        except json.JSONDecodeError:
+            errors.append({'line': number, 'error': 'JSON inválido.'})
+            continue
+
+        if not isinstance(review, dict) or not review.get('id_cognito') or not review.get('id_auto') \
+                or not review.get('value'):
+            errors.append({'line': number, 'error': 'Faltan parámetros.'})
+            continue
+
+        try:
+            value = parse_integer(review['value'])
+            id_auto = parse_integer(review['id_auto'])
+        except ValueError:
+            errors.append({'line': number, 'error': 'El valor de la reseña y el auto deben ser números enteros.'})
+            continue
+
+        if value < 1 or value > 5:
+            errors.append({'line': number, 'error': 'El valor de la reseña debe estar entre 1 y 5.'})
+            continue
+
+        comment = review.get('comment') or ''
+        if not isinstance(comment, str):
+            errors.append({'line': number, 'error': 'El comentario debe ser texto.'})
+            continue
+
+        if len(comment) > 100:
+            errors.append({'line': number, 'error': 'El comentario no debe exceder los 100 caracteres.'})
+            continue
+
+        reviews.append({
+            'line': number,
+            'id_cognito': str(review['id_cognito']),
+            'id_auto': id_auto,
+            'value': value,
+            'comment': comment
+        })
+
+    return reviews, errors
+
+
+def parse_integer(value):
+    # JSON floats and booleans would be silently truncated by int().
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(value)
+
+    return int(value)
+
+
+def import_rates(uow, reviews, errors):
+    if not reviews:
+        return 0
+
+    with uow.cursor() as cursor:
+        users = find_users(cursor, {review['id_cognito'] for review in reviews})
+        autos = find_autos(cursor, {review['id_auto'] for review in reviews})
+        existing = find_existing_rates(cursor, set(users.values()), autos)
+
+        rows = []
+        summaries = {}
+        for review in reviews:
+            id_user = users.get(review['id_cognito'])
+            if id_user is None:
+                errors.append({'line': review['line'], 'error': 'El usuario no fue encontrado.'})
+                continue
+            if review['id_auto'] not in autos:
+                errors.append({'line': review['line'], 'error': 'El auto no fue encontrado.'})
+                continue
+            if (id_user, review['id_auto']) in existing:
+                errors.append({'line': review['line'], 'error': 'El usuario ya ha reseñado este auto.'})
+                continue
+
+            # Later lines for the same pair are duplicates of this one.
+            existing.add((id_user, review['id_auto']))
+            rows.append((review['value'], review['comment'], review['id_auto'], id_user, ACTIVE_RATE_STATUS))
+
+            summary = summaries.setdefault(review['id_auto'], [0, 0, 0, 0, 0, 0, 0])
+            summary[0] += 1
+            summary[1] += review['value']
+            summary[1 + review['value']] += 1
+
+        for chunk in chunks(rows):
+            cursor.executemany(INSERT_RATE_QUERY, chunk)
+
+        summary_rows = [(id_auto, *summary) for id_auto, summary in summaries.items()]
+        for chunk in chunks(summary_rows):
+            cursor.executemany(UPDATE_SUMMARY_QUERY, chunk)
+
+        if rows:
+            bump_catalog_version(cursor)
+
+    return len(rows)
+
+
+def chunks(rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        yield rows[start:start + CHUNK_SIZE]
+
+
+def find_users(cursor, id_cognitos):
+    users = {}
+    for chunk in chunks(sorted(id_cognitos)):
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(f"SELECT id_cognito, id_user FROM user WHERE id_cognito IN ({placeholders})", chunk)
+        users.update(cursor.fetchall())
+    return users
+
+
+def find_autos(cursor, ids):
+    autos = set()
+    for chunk in chunks(sorted(ids)):
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(f"SELECT id_auto FROM auto WHERE id_auto IN ({placeholders})", chunk)
+        autos.update(row[0] for row in cursor.fetchall())
+    return autos
+
+
+def find_existing_rates(cursor, user_ids, auto_ids):
+    existing = set()
+    if not user_ids or not auto_ids:
+        return existing
+
+    auto_placeholders = ', '.join(['%s'] * len(auto_ids))
+    for chunk in chunks(sorted(user_ids)):
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(
+            f"SELECT id_user, id_auto FROM rate WHERE id_user IN ({placeholders}) AND id_auto IN ({auto_placeholders})",
+            [*chunk, *sorted(auto_ids)])
+        existing.update(cursor.fetchall())
+    return existing
+
+
+def get_jwt_claims(token):
+    try:
+        parts = token.split(".")
+        if len(parts) != 3:
+            raise ValueError("Token inválido")
+
+        payload_encoded = parts[1]
+        payload_decoded = base64.b64decode(payload_encoded + "==")
+        claims = json.loads(payload_decoded)
+
+        return claims
+
+    except ValueError as e:
+        raise e
+
+
+def bump_catalog_version(cursor):
+    cursor.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
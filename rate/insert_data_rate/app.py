@@ -1,10 +1,12 @@
 import json
 import base64
+import pymysql
+from pymysql.constants import ER
 
 try:
-    from database import get_connection, handle_response
+    from database import UnitOfWork, handle_response, decode_body
 except ImportError:
-    from .database import get_connection, handle_response
+    from .database import UnitOfWork, handle_response, decode_body
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -24,14 +26,13 @@ def lambda_handler(event, context):
         return handle_response(e, 'Error al decodificar token.', 401)
 
     try:
-        body = json.loads(event['body'])
+        body = json.loads(decode_body(event, event['body']))
     except (TypeError, KeyError, json.JSONDecodeError) as e:
         return handle_response(e, 'Cuerpo de la petición inválido.', 400)
 
     value = body.get('value')
     comment = body.get('comment')
     id_auto = body.get('id_auto')
-    id_user = ''
 
     if not value or not id_auto:
         return handle_response(None, 'Faltan parámetros.', 400)
@@ -42,47 +43,44 @@ def lambda_handler(event, context):
     except ValueError:
         return handle_response(None, 'El valor de la reseña debe ser un número entero.', 400)
 
-    if value_n < 0 or value_n > 6:
+    if not 1 <= value_n <= 5:
         return handle_response(None, 'El valor de la reseña debe estar entre 1 y 5.', 400)
 
     if len(comment) > 100:
         return handle_response(None, 'El comentario no debe exceder los 100 caracteres.', 400)
 
-    if not (verify_user(id_cognito)):
-        return handle_response(None, 'El usuario no fue encontrado.', 400)
-    else:
-        connection = get_connection()
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT id_user FROM user WHERE id_cognito = %s", id_cognito)
-                id_user = cursor.fetchone()[0]
-        except Exception as e:
-            return handle_response(e, 'Error al obtener el id del usuario.', 500)
-        finally:
-            connection.close()
-
-    if not (verify_auto(id_auto)):
-        return handle_response(None, 'El auto no fue encontrado.', 400)
-
-    if check_existing_review(id_user, id_auto):
-        return handle_response(None, 'El usuario ya ha reseñado este auto.', 400)
-
-    response = insert_into_rate(value_n, comment, id_auto, id_user)
+    with UnitOfWork() as uow:
+        response = insert_into_rate(uow, value_n, comment, id_auto, id_cognito)
 
     return response
 
 
-def insert_into_rate(value, comment, id_auto, id_user):
-    connection = get_connection()
+def insert_into_rate(uow, value, comment, id_auto, id_cognito):
     try:
-        with connection.cursor() as cursor:
-            insert_query = "INSERT INTO rate (value, comment, id_auto, id_user, id_status) VALUES (%s, %s, %s, %s, 5)"
-            cursor.execute(insert_query, (value, comment, id_auto, id_user))
-            connection.commit()
+        with uow.cursor() as cursor:
+            insert_query = """INSERT INTO rate (value, comment, id_auto, id_user, id_status)
+                              SELECT %s, %s, a.id_auto, u.id_user, 5
+                              FROM user u
+                              INNER JOIN auto a ON a.id_auto = %s
+                              WHERE u.id_cognito = %s"""
+            cursor.execute(insert_query, (value, comment, id_auto, id_cognito))
+            inserted = cursor.rowcount
+            if inserted:
+                update_rate_summary(cursor, id_auto, value, 1)
+                bump_catalog_version(cursor)
+    except pymysql.err.IntegrityError as e:
+        if e.args[0] == ER.DUP_ENTRY:
+            return handle_response(None, 'El usuario ya ha reseñado este auto.', 400)
+        return handle_response(e, 'Error al insertar la reseña.', 500)
     except Exception as e:
         return handle_response(e, 'Error al insertar la reseña.', 500)
-    finally:
-        connection.close()
+
+    if not inserted:
+        if not verify_user(uow, id_cognito):
+            return handle_response(None, 'El usuario no fue encontrado.', 400)
+        return handle_response(None, 'El auto no fue encontrado.', 400)
+
+    uow.commit()
 
     return {
         'statusCode': 200,
@@ -94,44 +92,31 @@ def insert_into_rate(value, comment, id_auto, id_user):
     }
 
 
-def verify_user(id_user):
-    connection = get_connection()
+def verify_user(uow, id_cognito):
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT id_user FROM user WHERE id_cognito = %s", id_user)
+        with uow.cursor() as cursor:
+            cursor.execute("SELECT id_user FROM user WHERE id_cognito = %s", (id_cognito,))
             result = cursor.fetchone()
             return result is not None
     except Exception:
         return False
-    finally:
-        connection.close()
 
 
-def verify_auto(id_auto):
-    connection = get_connection()
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT id_auto FROM auto WHERE id_auto = %s", id_auto)
-            result = cursor.fetchone()
-            return result is not None
-    except Exception:
-        return False
-    finally:
-        connection.close()
-
-
-def check_existing_review(id_user, id_auto):
-    connection = get_connection()
-    try:
-        with connection.cursor() as cursor:
-            check_query = "SELECT 1 FROM rate WHERE id_user = %s AND id_auto = %s"
-            cursor.execute(check_query, (id_user, id_auto))
-            result = cursor.fetchone()
-            return result is not None
-    except Exception:
-        return False
-    finally:
-        connection.close()
+def update_rate_summary(cursor, id_auto, value, delta):
+    stars = [delta if value == star else 0 for star in range(1, 6)]
+    cursor.execute(
+        """INSERT INTO rate_summary (id_auto, rate_count, rate_sum, star_1, star_2, star_3, star_4, star_5)
+           VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+           ON DUPLICATE KEY UPDATE
+               rate_count = rate_count + VALUES(rate_count),
+               rate_sum = rate_sum + VALUES(rate_sum),
+               star_1 = star_1 + VALUES(star_1),
+               star_2 = star_2 + VALUES(star_2),
+               star_3 = star_3 + VALUES(star_3),
+               star_4 = star_4 + VALUES(star_4),
+               star_5 = star_5 + VALUES(star_5)""",
+        (id_auto, delta, value * delta, *stars)
+    )
 
 
 def get_jwt_claims(token):
@@ -148,3 +133,7 @@ def get_jwt_claims(token):
 
     except ValueError as e:
         raise e
+
+
+def bump_catalog_version(cursor):
+    cursor.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
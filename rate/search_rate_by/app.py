@@ -1,9 +1,11 @@
+import base64
 import json
+from datetime import datetime
 
 try:
-    from connection import get_connection, handle_response
+    from connection import get_connection, release_connection, handle_response, encode_response, get_header
 except ImportError:
-    from .connection import get_connection, handle_response
+    from .connection import get_connection, release_connection, handle_response, encode_response, get_header
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -11,13 +13,21 @@ headers_cors = {
     'Access-Control-Allow-Methods': 'OPTIONS,POST,GET,PUT,DELETE'
 }
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
-def lambda_handler(event, context):
-    connection = get_connection()
+# Every sort ends on (created_at, id_rate) so the keyset is unique. The
+# operator compares r.value against the cursor for the rating sorts.
+SORTS = {
+    'newest': (None, 'r.created_at DESC, r.id_rate DESC'),
+    'highest': ('<', 'r.value DESC, r.created_at DESC, r.id_rate DESC'),
+    'lowest': ('>', 'r.value ASC, r.created_at DESC, r.id_rate DESC')
+}
+DEFAULT_SORT = 'newest'
 
-    rates = []
 
-    query_params = event.get('queryStringParameters', {})
+def lambda_handler(event, context):
+    query_params = event.get('queryStringParameters') or {}
     type_param = query_params.get('type')
     value = query_params.get('value')
 
@@ -36,20 +46,64 @@ def lambda_handler(event, context):
 
     column = column_map[type_param]
 
+    if column == 'a.year':
+        try:
+            value = int(value)
+        except ValueError as e:
+            return handle_response(e, 'El año debe ser un número entero.', 400)
+
+    sort = query_params.get('sort') or DEFAULT_SORT
+    if sort not in SORTS:
+        return handle_response("Orden no válido",
+                               'El parámetro sort debe ser uno de los siguientes: newest, highest, lowest', 400)
+
+    try:
+        limit = get_page_size(query_params)
+    except ValueError as e:
+        return handle_response(e, f'El parámetro limit debe ser un entero entre 1 y {MAX_PAGE_SIZE}.', 400)
+
+    after = query_params.get('after')
+    try:
+        position = decode_cursor(after, sort) if after else None
+    except (ValueError, KeyError, TypeError) as e:
+        return handle_response(e, 'El parámetro after no es un cursor válido.', 400)
+
+    operator, order_by = SORTS[sort]
+    sql = f"""
+        SELECT r.id_rate, r.value, comment, a.model, a.brand, u.name, u.lastname, a.id_auto, u.profile_image, s.value, a.year, u.email AS status, r.created_at
+        FROM auto a
+        INNER JOIN rate r ON r.id_auto=a.id_auto
+        INNER JOIN user u ON r.id_user=u.id_user
+        INNER JOIN status s ON r.id_status=s.id_status
+        WHERE {column} = %s
+    """
+    params = [value]
+    if position is not None:
+        rating, created_at, id_rate = position
+        keyset = "(r.created_at < %s OR (r.created_at = %s AND r.id_rate < %s))"
+        keyset_params = [created_at, created_at, id_rate]
+        if operator is not None:
+            keyset = f"(r.value {operator} %s OR (r.value = %s AND {keyset}))"
+            keyset_params = [rating, rating, *keyset_params]
+        sql += f" AND {keyset}"
+        params.extend(keyset_params)
+    sql += f" ORDER BY {order_by} LIMIT %s"
+    params.append(limit + 1)
+
+    connection = get_connection()
+
+    rates = []
+    next_cursor = None
+
     try:
         with connection.cursor() as cursor:
-            sql = f"""
-                SELECT r.id_rate, r.value, comment, a.model, a.brand, u.name, u.lastname, a.id_auto, u.profile_image, s.value, a.year, u.email AS status
-                FROM rate r
-                INNER JOIN auto a ON r.id_auto=a.id_auto
-                INNER JOIN user u ON r.id_user=u.id_user
-                INNER JOIN status s ON r.id_status=s.id_status
-                WHERE {column} = %s
-            """
-
-            cursor.execute(sql, (value,))
+            cursor.execute(sql, params)
             result = cursor.fetchall()
 
+            if len(result) > limit:
+                result = result[:limit]
+                next_cursor = encode_cursor(sort, result[-1][1], result[-1][12], result[-1][0])
+
             for rate in result:
                 rate = {
                     'id_rate': rate[0],
@@ -63,7 +117,8 @@ def lambda_handler(event, context):
                     'profile_image': rate[8],
                     'status': rate[9],
                     'year': rate[10],
-                    'email': rate[11]
+                    'email': rate[11],
+                    'created_at': rate[12].isoformat()
                 }
                 rates.append(rate)
 
@@ -71,14 +126,43 @@ def lambda_handler(event, context):
         return handle_response(e, 'Ocurrió un error al obtener la reseña', 500)
 
     finally:
-        connection.close()
-
-    return {
-        "statusCode": 200,
-        'headers': headers_cors,
-        "body": json.dumps({
-            'statusCode': 200,
-            "message": "Reseñas obtenidas correctamente.",
-            "data": rates
-        }),
-    }
+        release_connection(connection)
+
+    body = json.dumps({
+        'statusCode': 200,
+        "message": "Reseñas obtenidas correctamente.",
+        "data": rates,
+        "next_cursor": next_cursor
+    })
+
+    return encode_response(200, body, headers_cors, get_header(event, 'Accept-Encoding'))
+
+
+def get_page_size(query_params):
+    limit = query_params.get('limit')
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+
+    limit = int(limit)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(limit)
+
+    return limit
+
+
+def encode_cursor(sort, value, created_at, id_rate):
+    token = json.dumps({
+        'sort': sort,
+        'value': value,
+        'created_at': created_at.isoformat(),
+        'id_rate': id_rate
+    }).encode('utf-8')
+    return base64.urlsafe_b64encode(token).decode('utf-8').rstrip('=')
+
+
+def decode_cursor(token, sort):
+    payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    # A cursor only makes sense for the order it was issued for.
+    if payload['sort'] != sort:
+        raise ValueError(payload['sort'])
+    return int(payload['value']), datetime.fromisoformat(payload['created_at']), int(payload['id_rate'])
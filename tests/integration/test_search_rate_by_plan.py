@@ -0,0 +1,54 @@
+import os
+import unittest
+from unittest.mock import patch
+
+import pymysql
+
+from rate.search_rate_by.app import lambda_handler
+
+# Point these at a database with every migration applied to check the plan:
+# TEST_DB_HOST, TEST_DB_USER, TEST_DB_PASSWORD, TEST_DB_NAME.
+TEST_DB_HOST = os.environ.get('TEST_DB_HOST')
+
+
+@unittest.skipUnless(TEST_DB_HOST, 'TEST_DB_HOST is not set')
+class TestSearchRateByPlan(unittest.TestCase):
+    def setUp(self):
+        self.connection = pymysql.connect(
+            host=TEST_DB_HOST,
+            user=os.environ.get('TEST_DB_USER'),
+            password=os.environ.get('TEST_DB_PASSWORD'),
+            database=os.environ.get('TEST_DB_NAME'),
+            cursorclass=pymysql.cursors.DictCursor
+        )
+
+    def tearDown(self):
+        self.connection.close()
+
+    def explain(self, type_param, value, sort):
+        with patch('rate.search_rate_by.app.get_connection') as mock_get_connection:
+            mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+            mock_cursor.fetchall.return_value = []
+            lambda_handler({'queryStringParameters': {'type': type_param, 'value': value, 'sort': sort}}, None)
+            sql, params = mock_cursor.execute.call_args[0]
+
+        with self.connection.cursor() as cursor:
+            cursor.execute('EXPLAIN ' + sql, params)
+            return cursor.fetchall()
+
+    def test_join_is_driven_from_auto(self):
+        for type_param, value in [('marca', 'Honda'), ('modelo', 'Civic'), ('año', '2020')]:
+            for sort in ['newest', 'highest', 'lowest']:
+                with self.subTest(type=type_param, sort=sort):
+                    plan = self.explain(type_param, value, sort)
+                    tables = [row['table'] for row in plan]
+                    rate = plan[tables.index('r')]
+
+                    self.assertLess(tables.index('a'), tables.index('r'))
+                    self.assertNotEqual(plan[tables.index('a')]['type'], 'ALL')
+                    self.assertNotEqual(rate['type'], 'ALL')
+                    self.assertIsNotNone(rate['key'])
+
+
+if __name__ == '__main__':
+    unittest.main()
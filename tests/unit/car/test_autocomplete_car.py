@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import patch
+import json
+from decimal import Decimal
+from car.autocomplete_car.app import lambda_handler
+from car.autocomplete_car.prefix_index import prefix_index, PrefixIndex
+from car.autocomplete_car.connection import clear_secret_cache, discard_connection, handle_response_success, headers_cors
+
+ROWS = [
+    ('Toyota', 'Corolla', 5, Decimal('10'), Decimal('42')),
+    ('Toyota', 'Camry', 2, Decimal('4'), Decimal('20')),
+    ('Tesla', 'Model 3', 3, None, None),
+    ('Mazda', 'CX-5', 4, Decimal('2'), Decimal('6')),
+    ('Citroën', 'C3', 1, Decimal('1'), Decimal('5'))
+]
+
+
+class TestAutocompleteCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+        prefix_index.build(None, [])
+
+    def test_prefix_index_complete_by_count(self):
+        index = PrefixIndex(5)
+        index.build(1, ROWS)
+
+        completions = index.complete('T', 10)
+
+        self.assertEqual([entry['text'] for entry in completions],
+                         ['Toyota', 'Toyota Corolla', 'Tesla', 'Tesla Model 3', 'Toyota Camry'])
+        self.assertEqual(completions[0], {
+            'type': 'brand', 'text': 'Toyota', 'brand': 'Toyota', 'model': None, 'count': 7, 'average_rating': 4.43
+        })
+
+    def test_prefix_index_complete_by_rating_and_limit(self):
+        index = PrefixIndex(5)
+        index.build(1, ROWS)
+
+        completions = index.complete('toyota', 2, 'rating')
+
+        self.assertEqual([entry['text'] for entry in completions], ['Toyota Camry', 'Toyota'])
+
+    def test_prefix_index_matches_model_names_and_accents(self):
+        index = PrefixIndex(5)
+        index.build(1, ROWS)
+
+        self.assertEqual([entry['text'] for entry in index.complete('cor', 10)], ['Toyota Corolla'])
+        self.assertEqual([entry['text'] for entry in index.complete('CX', 10)], ['Mazda CX-5'])
+        self.assertEqual([entry['text'] for entry in index.complete('citroe', 10)], ['Citroën', 'Citroën C3'])
+        self.assertEqual([entry['text'] for entry in index.complete('toyota  co', 10)], ['Toyota Corolla'])
+        self.assertEqual(index.complete('x', 10), [])
+        self.assertEqual(index.complete('   ', 10), [])
+
+    @patch('car.autocomplete_car.app.handle_response')
+    def test_lambda_handler_invalid_parameters(self, mock_handle_response):
+        cases = [
+            ({}, 'Falta el parámetro q.'),
+            ({'q': 'a' * 51}, 'El parámetro q no debe exceder los 50 caracteres.'),
+            ({'q': 'to', 'rank': 'price'}, 'El parámetro rank debe ser count o rating.'),
+            ({'q': 'to', 'limit': '26'}, 'El parámetro limit debe ser un entero entre 1 y 25.'),
+            ({'q': 'to', 'limit': 'abc'}, 'El parámetro limit debe ser un entero entre 1 y 25.')
+        ]
+        for query_params, message in cases:
+            lambda_handler({'queryStringParameters': query_params}, None)
+
+            self.assertEqual(mock_handle_response.call_args[0][1:], (message, 400))
+
+    @patch('car.autocomplete_car.app.get_connection')
+    @patch('car.autocomplete_car.app.release_connection')
+    @patch('car.autocomplete_car.app.handle_response_success')
+    def test_lambda_handler_loads_index_once(self, mock_handle_response_success, mock_release_connection,
+                                             mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (7,)
+        mock_cursor.fetchall.return_value = ROWS
+
+        lambda_handler({'queryStringParameters': {'q': 'to', 'limit': '1'}}, None)
+        lambda_handler({'queryStringParameters': {'q': 'maz'}}, None)
+
+        self.assertEqual(mock_get_connection.call_count, 1)
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('WHERE a.id_status = %s', query)
+        self.assertEqual(params, (3,))
+        mock_release_connection.assert_called_once_with(mock_get_connection.return_value)
+        first, second = mock_handle_response_success.call_args_list
+        self.assertEqual([entry['text'] for entry in first[0][2]], ['Toyota'])
+        self.assertEqual([entry['text'] for entry in second[0][2]], ['Mazda', 'Mazda CX-5'])
+        self.assertEqual(prefix_index.version, 7)
+
+    @patch('car.autocomplete_car.app.get_connection')
+    @patch('car.autocomplete_car.app.release_connection')
+    @patch('car.autocomplete_car.app.handle_response_success')
+    def test_lambda_handler_rebuilds_on_version_change(self, mock_handle_response_success, mock_release_connection,
+                                                       mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.side_effect = [(1,), (1,), (2,)]
+        mock_cursor.fetchall.side_effect = [ROWS[:1], ROWS]
+
+        lambda_handler({'queryStringParameters': {'q': 'maz'}}, None)
+        prefix_index.version_checked_at = 0.0
+        lambda_handler({'queryStringParameters': {'q': 'maz'}}, None)
+        prefix_index.version_checked_at = 0.0
+        lambda_handler({'queryStringParameters': {'q': 'maz'}}, None)
+
+        self.assertEqual(mock_cursor.fetchall.call_count, 2)
+        results = [call[0][2] for call in mock_handle_response_success.call_args_list]
+        self.assertEqual([len(result) for result in results], [0, 0, 2])
+
+    @patch('car.autocomplete_car.app.get_connection')
+    @patch('car.autocomplete_car.app.handle_response')
+    @patch('car.autocomplete_car.app.handle_response_success')
+    def test_lambda_handler_database_error(self, mock_handle_response_success, mock_handle_response,
+                                           mock_get_connection):
+        error = Exception('DB error')
+        mock_get_connection.side_effect = error
+
+        lambda_handler({'queryStringParameters': {'q': 'to'}}, None)
+
+        mock_handle_response.assert_called_once_with(error, 'Ocurrió un error al obtener las sugerencias.', 500)
+
+        prefix_index.build(3, ROWS)
+        prefix_index.version_checked_at = 0.0
+        lambda_handler({'queryStringParameters': {'q': 'maz'}}, None)
+
+        self.assertEqual(len(mock_handle_response_success.call_args[0][2]), 2)
+
+    # Test for connection.py
+
+    def test_handle_response_success(self):
+        response = handle_response_success(200, 'Sugerencias obtenidas correctamente.', [])
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers'], headers_cors)
+        self.assertEqual(json.loads(response['body'])['data'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
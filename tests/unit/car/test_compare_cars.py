@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import patch
+import json
+from decimal import Decimal
+from car.compare_cars.app import lambda_handler, compare
+from car.compare_cars.connection import clear_secret_cache, discard_connection
+
+ROWS = [
+    (2, 'Jetta', 'Volkswagen', 2022, Decimal('380000.00'), '2.0L', 4, Decimal('1.45'), Decimal('1.80'), Decimal('4.70')),
+    (1, 'Corolla', 'Toyota', 2020, Decimal('250000.00'), '1.8L', 4, Decimal('1.40'), Decimal('1.70'), Decimal('4.60')),
+    (3, 'RAV4', 'Toyota', 2022, Decimal('300000.00'), None, 5, None, Decimal('1.85'), Decimal('4.60'))
+]
+
+
+class TestCompareCars(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    def test_compare(self):
+        cars = [
+            {'id_auto': 1, 'brand': 'Toyota', 'model': 'Corolla', 'price': 250000.0, 'year': 2020, 'engine': '1.8L',
+             'doors': 4, 'height': 1.4, 'width': 1.7, 'length': 4.6, 'images': ['a.jpg', 'b.jpg'],
+             'average_rating': 4.5},
+            {'id_auto': 3, 'brand': 'Toyota', 'model': 'RAV4', 'price': 300000.0, 'year': 2022, 'engine': None,
+             'doors': 5, 'height': None, 'width': 1.85, 'length': 4.6, 'images': [], 'average_rating': 0}
+        ]
+
+        comparison = compare(cars)
+
+        self.assertEqual(comparison['cars'], [
+            {'id_auto': 1, 'brand': 'Toyota', 'model': 'Corolla', 'cover_image': 'a.jpg'},
+            {'id_auto': 3, 'brand': 'Toyota', 'model': 'RAV4', 'cover_image': None}
+        ])
+        self.assertEqual(comparison['specs']['price'], [250000.0, 300000.0])
+        self.assertEqual(comparison['specs']['engine'], ['1.8L', None])
+        self.assertEqual(comparison['summary']['price'],
+                         {'min': 250000.0, 'max': 300000.0, 'min_ids': [1], 'max_ids': [3], 'delta': 50000.0})
+        self.assertEqual(comparison['summary']['length'],
+                         {'min': 4.6, 'max': 4.6, 'min_ids': [1, 3], 'max_ids': [1, 3], 'delta': 0})
+        self.assertEqual(comparison['summary']['height'],
+                         {'min': 1.4, 'max': 1.4, 'min_ids': [1], 'max_ids': [1], 'delta': 0})
+        self.assertNotIn('engine', comparison['summary'])
+
+    @patch('car.compare_cars.app.get_connection')
+    @patch('car.compare_cars.app.handle_response')
+    def test_lambda_handler_invalid_ids(self, mock_handle_response, mock_get_connection):
+        cases = [
+            ({'queryStringParameters': None, 'body': json.dumps({})}, 'Falta un parametro.'),
+            ({'queryStringParameters': {'ids': '1,b'}}, 'El parámetro ids debe ser una lista de enteros.'),
+            ({'queryStringParameters': {'ids': '1,1'}}, 'Se deben comparar entre 2 y 5 autos distintos.'),
+            ({'queryStringParameters': {'ids': '1,2,3,4,5,6'}}, 'Se deben comparar entre 2 y 5 autos distintos.')
+        ]
+        for event, message in cases:
+            lambda_handler(event, None)
+
+            self.assertEqual(mock_handle_response.call_args[0][1:], (message, 400))
+
+        mock_get_connection.assert_not_called()
+
+    @patch('car.compare_cars.app.get_connection')
+    def test_lambda_handler_invalid_body(self, mock_get_connection):
+        for body in ['{ids: [1, 2', json.dumps([1, 2])]:
+            response = lambda_handler({'queryStringParameters': None, 'body': body}, None)
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])['message'], 'Parametros inválidos')
+
+        mock_get_connection.assert_not_called()
+
+    @patch('car.compare_cars.app.get_connection')
+    @patch('car.compare_cars.app.release_connection')
+    @patch('car.compare_cars.app.handle_response_success')
+    def test_lambda_handler_success(self, mock_handle_response_success, mock_release_connection, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [
+            ROWS,
+            [(1, 'http://example.com/1.jpg')],
+            [(1, Decimal('4.3333')), (2, Decimal('3.0000'))]
+        ]
+
+        lambda_handler({'queryStringParameters': None, 'body': json.dumps({'ids': [3, 1, 2]})}, None)
+
+        self.assertEqual(mock_cursor.execute.call_count, 3)
+        status_code, message, comparison, extra, accept_encoding = mock_handle_response_success.call_args[0]
+        self.assertEqual((status_code, message, extra), (200, 'Comparación obtenida correctamente.', None))
+        self.assertEqual([car['id_auto'] for car in comparison['cars']], [3, 1, 2])
+        self.assertEqual(comparison['specs']['year'], [2022, 2020, 2022])
+        self.assertEqual(comparison['specs']['average_rating'], [0, 4.33, 3.0])
+        self.assertEqual(comparison['summary']['year'],
+                         {'min': 2020, 'max': 2022, 'min_ids': [1], 'max_ids': [3, 2], 'delta': 2})
+        self.assertEqual(comparison['summary']['average_rating']['delta'], 4.33)
+        self.assertEqual(comparison['summary']['price']['delta'], 130000.0)
+        json.dumps(comparison)
+
+    @patch('car.compare_cars.app.get_connection')
+    @patch('car.compare_cars.app.release_connection')
+    @patch('car.compare_cars.app.handle_response')
+    def test_lambda_handler_missing_cars(self, mock_handle_response, mock_release_connection, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [ROWS[1:2], [], []]
+
+        lambda_handler({'queryStringParameters': {'ids': '1,7,8'}}, None)
+
+        mock_handle_response.assert_called_once_with(None, 'No se encontraron los autos: 7, 8.', 404)
+
+    @patch('car.compare_cars.app.get_connection')
+    @patch('car.compare_cars.app.handle_response')
+    def test_lambda_handler_database_error(self, mock_handle_response, mock_get_connection):
+        error = Exception('DB error')
+        mock_get_connection.side_effect = error
+
+        lambda_handler({'queryStringParameters': {'ids': '1,2'}}, None)
+
+        mock_handle_response.assert_called_once_with(
+            error, 'Ocurrió un error al obtener la información de los autos.', 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
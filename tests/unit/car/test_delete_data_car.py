@@ -7,10 +7,13 @@ import base64
 import pymysql
 
 from car.delete_data_car.app import lambda_handler, delete_car
-from car.delete_data_car.connection import get_connection, handle_response, handle_response_success, get_jwt_claims, get_secret, headers_cors
+from car.delete_data_car.connection import get_connection, handle_response, handle_response_success, get_jwt_claims, get_secret, clear_secret_cache, discard_connection, headers_cors
 
 
 class TestDeleteCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
 
     @patch('car.delete_data_car.app.get_jwt_claims')
     @patch('car.delete_data_car.app.handle_response')
@@ -67,7 +70,8 @@ class TestDeleteCar(unittest.TestCase):
 
         delete_car(1, 1)
         mock_cursor.execute.assert_any_call("SELECT * FROM status WHERE id_status=%s AND name='to_auto'", (1,))
-        mock_cursor.execute.assert_any_call("UPDATE auto SET id_status=%s WHERE id_auto=%s", (1, 1))
+        mock_cursor.execute.assert_any_call("UPDATE auto SET id_status=%s, updated_at=CURRENT_TIMESTAMP(6) WHERE id_auto=%s", (1, 1))
+        mock_cursor.execute.assert_called_with("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
         mock_connection.commit.assert_called_once()
         mock_handle_response_success.assert_called_with(200, 'Auto actualizado correctamente.', None)
 
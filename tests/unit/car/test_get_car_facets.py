@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch
+import json
+from decimal import Decimal
+from car.get_car_facets.app import lambda_handler, build_query, parse_filters
+from car.get_car_facets.cache import facet_cache
+from car.get_car_facets.connection import clear_secret_cache, discard_connection, handle_response_success, headers_cors
+
+
+class TestGetCarFacets(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+        facet_cache.clear()
+
+    def test_build_query_without_filters(self):
+        query, params = build_query(parse_filters({}))
+
+        self.assertEqual(query.count('SELECT'), 7)
+        self.assertEqual(query.count('UNION ALL'), 6)
+        self.assertIn("SELECT 'brand', a.brand, COUNT(*) FROM auto a INNER JOIN status s ON a.id_status = s.id_status GROUP BY a.brand", query)
+        self.assertIn("SELECT 'price', FLOOR(a.price / %s), COUNT(*) FROM auto a INNER JOIN status s ON a.id_status = s.id_status GROUP BY FLOOR(a.price / %s)", query)
+        self.assertNotIn('WHERE', query)
+        self.assertEqual(params, [100000, 100000])
+
+    def test_build_query_with_filters(self):
+        query, params = build_query(parse_filters({'fuel': 'Gasolina,Diésel', 'min_year': '2018', 'price_bucket': '50000'}))
+
+        self.assertIn(" WHERE a.fuel IN (%s, %s) AND a.year >= %s GROUP BY a.model", query)
+        self.assertEqual(params, ['Gasolina', 'Diésel', 2018] * 6 + [50000, 'Gasolina', 'Diésel', 2018, 50000])
+
+    @patch('car.get_car_facets.app.handle_response')
+    def test_lambda_handler_invalid_price_bucket(self, mock_handle_response):
+        for value in ('0', 'abc'):
+            lambda_handler({'queryStringParameters': {'price_bucket': value}}, None)
+
+            args = mock_handle_response.call_args[0]
+            self.assertEqual(args[1:], ('El filtro price_bucket no es válido.', 400))
+
+    @patch('car.get_car_facets.app.get_connection')
+    @patch('car.get_car_facets.app.handle_response_success')
+    def test_lambda_handler_success(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (3,)
+        mock_cursor.fetchall.return_value = [
+            ('brand', 'Toyota', 2),
+            ('brand', 'Nissan', 1),
+            ('model', 'Corolla', 2),
+            ('year', '2020', 3),
+            ('fuel', None, 1),
+            ('type', 'SUV', 3),
+            ('doors', '4', 3),
+            ('price', '3', 1),
+            ('price', Decimal('2'), 2),
+            ('price', None, 1)
+        ]
+
+        lambda_handler({'queryStringParameters': None}, None)
+
+        mock_handle_response_success.assert_called_once_with(200, 'Facetas obtenidas correctamente.', {
+            'brand': {'Toyota': 2, 'Nissan': 1},
+            'model': {'Corolla': 2},
+            'year': {'2020': 3},
+            'fuel': {},
+            'type': {'SUV': 3},
+            'doors': {'4': 3},
+            'price': [
+                {'min': 200000, 'max': 300000, 'count': 2},
+                {'min': 300000, 'max': 400000, 'count': 1}
+            ]
+        }, None, None)
+
+    @patch('car.get_car_facets.app.get_connection')
+    @patch('car.get_car_facets.app.release_connection')
+    @patch('car.get_car_facets.app.handle_response_success')
+    def test_lambda_handler_uses_cache_until_version_changes(self, mock_handle_response_success,
+                                                             mock_release_connection, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.side_effect = [(1,), (2,)]
+        mock_cursor.fetchall.side_effect = [[('brand', 'Toyota', 2)], [('brand', 'Toyota', 3)]]
+        event = {'queryStringParameters': {'brand': 'Toyota'}}
+
+        lambda_handler(event, None)
+        lambda_handler(event, None)
+
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        self.assertEqual(mock_handle_response_success.call_args[0][2]['brand'], {'Toyota': 2})
+
+        facet_cache.version_checked_at = 0.0
+        lambda_handler(event, None)
+
+        self.assertEqual(mock_cursor.execute.call_count, 4)
+        self.assertEqual(mock_handle_response_success.call_args[0][2]['brand'], {'Toyota': 3})
+        self.assertEqual(facet_cache.stats()['version'], 2)
+
+    @patch('car.get_car_facets.app.get_connection')
+    @patch('car.get_car_facets.app.handle_response')
+    def test_lambda_handler_database_error(self, mock_handle_response, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        error = Exception('DB error')
+        mock_cursor.execute.side_effect = error
+
+        lambda_handler({'queryStringParameters': None}, None)
+
+        mock_handle_response.assert_called_once_with(error, 'Ocurrió un error al obtener las facetas.', 500)
+
+    # Test for connection.py
+
+    def test_handle_response_success(self):
+        response = handle_response_success(200, 'Facetas obtenidas correctamente.', {'brand': {}})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers'], headers_cors)
+        self.assertEqual(json.loads(response['body'])['data'], {'brand': {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch
+import json
+from decimal import Decimal
+from car.get_cars_by_ids.app import lambda_handler, parse_ids
+from car.get_cars_by_ids.connection import clear_secret_cache, discard_connection, handle_response_success, headers_cors
+
+ROWS = [
+    (3, 'Model 3', 'Tesla', 2021, 900000, 'Sedán', 'Eléctrico', 4, None, 1.4, 1.8, 4.7, 'Eléctrico', 'Activo'),
+    (1, 'Corolla', 'Toyota', 2020, 250000, 'Sedán', 'Gasolina', 4, '1.8L', 1.4, 1.7, 4.6, 'Familiar', 'Activo')
+]
+
+
+class TestGetCarsByIds(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    def test_parse_ids(self):
+        self.assertEqual(parse_ids('3, 1,3,,2'), [3, 1, 2])
+        self.assertEqual(parse_ids([5, '4', 5]), [5, 4])
+        self.assertRaises(ValueError, parse_ids, '1,a')
+        self.assertRaises(TypeError, parse_ids, {'id': 1})
+
+    @patch('car.get_cars_by_ids.app.get_connection')
+    @patch('car.get_cars_by_ids.app.handle_response')
+    def test_lambda_handler_invalid_ids(self, mock_handle_response, mock_get_connection):
+        cases = [
+            ({'queryStringParameters': None, 'body': json.dumps({})}, 'Falta un parametro.'),
+            ({'queryStringParameters': {'ids': '1,x'}}, 'El parámetro ids debe ser una lista de enteros.'),
+            ({'queryStringParameters': None, 'body': json.dumps({'ids': 7})},
+             'El parámetro ids debe ser una lista de enteros.'),
+            ({'queryStringParameters': {'ids': ','.join(str(n) for n in range(101))}},
+             'No se pueden solicitar más de 100 autos a la vez.')
+        ]
+        for event, message in cases:
+            lambda_handler(event, None)
+
+            self.assertEqual(mock_handle_response.call_args[0][1:], (message, 400))
+
+        mock_get_connection.assert_not_called()
+
+    @patch('car.get_cars_by_ids.app.get_connection')
+    def test_lambda_handler_invalid_body(self, mock_get_connection):
+        for body in ['{ids: [1', json.dumps([1, 2])]:
+            response = lambda_handler({'queryStringParameters': None, 'body': body}, None)
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])['message'], 'Parametros inválidos')
+
+        mock_get_connection.assert_not_called()
+
+    @patch('car.get_cars_by_ids.app.get_connection')
+    @patch('car.get_cars_by_ids.app.release_connection')
+    @patch('car.get_cars_by_ids.app.handle_response_success')
+    def test_lambda_handler_success(self, mock_handle_response_success, mock_release_connection, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [
+            ROWS,
+            [(1, 'http://example.com/1.jpg'), (3, 'http://example.com/3a.jpg'), (3, 'http://example.com/3b.jpg')],
+            [(3, Decimal('4.5000'))]
+        ]
+
+        lambda_handler({'queryStringParameters': {'ids': '1,2,3'}}, None)
+
+        self.assertEqual(mock_cursor.execute.call_count, 3)
+        mock_cursor.execute.assert_any_call(
+            "SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status WHERE id_auto IN (%s, %s, %s)",
+            [1, 2, 3])
+        mock_cursor.execute.assert_any_call("SELECT id_auto, url FROM auto_image WHERE id_auto IN (%s, %s)", [3, 1])
+        mock_release_connection.assert_called_once_with(mock_get_connection.return_value)
+
+        status_code, message, cars, extra, accept_encoding = mock_handle_response_success.call_args[0]
+        self.assertEqual((status_code, message), (200, 'Informacion de los autos obtenida correctamente.'))
+        self.assertEqual([car['id_auto'] for car in cars], [1, 3])
+        self.assertEqual(cars[0]['price'], '$250,000.00')
+        self.assertEqual(cars[0]['average_rating'], 0)
+        self.assertEqual(cars[1]['images'], ['http://example.com/3a.jpg', 'http://example.com/3b.jpg'])
+        self.assertEqual(cars[1]['average_rating'], 4.5)
+        self.assertEqual(extra, {'missing': [2]})
+
+    @patch('car.get_cars_by_ids.app.get_connection')
+    @patch('car.get_cars_by_ids.app.release_connection')
+    @patch('car.get_cars_by_ids.app.handle_response_success')
+    def test_lambda_handler_body_all_missing(self, mock_handle_response_success, mock_release_connection,
+                                            mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = []
+
+        lambda_handler({'queryStringParameters': None, 'body': json.dumps({'ids': [9, 8]})}, None)
+
+        self.assertEqual(mock_cursor.execute.call_count, 1)
+        mock_handle_response_success.assert_called_once_with(
+            200, 'Informacion de los autos obtenida correctamente.', [], {'missing': [9, 8]}, None)
+
+    @patch('car.get_cars_by_ids.app.get_connection')
+    @patch('car.get_cars_by_ids.app.handle_response')
+    def test_lambda_handler_database_error(self, mock_handle_response, mock_get_connection):
+        error = Exception('DB error')
+        mock_get_connection.return_value.cursor.return_value.__enter__.return_value.execute.side_effect = error
+
+        lambda_handler({'queryStringParameters': {'ids': '1'}}, None)
+
+        mock_handle_response.assert_called_once_with(
+            error, 'Ocurrió un error al obtener la información de los autos.', 500)
+
+    # Test for connection.py
+
+    def test_handle_response_success(self):
+        response = handle_response_success(200, 'TestMessage', [], {'missing': [1]})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers'], headers_cors)
+        self.assertEqual(json.loads(response['body'])['missing'], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
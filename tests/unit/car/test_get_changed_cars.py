@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import patch
+from datetime import datetime
+from car.get_changed_cars.app import lambda_handler, encode_watermark, decode_watermark, EPOCH
+from car.get_changed_cars.connection import clear_secret_cache, discard_connection
+
+T1 = datetime(2026, 10, 1, 12, 0, 0, 123456)
+T2 = datetime(2026, 10, 1, 12, 0, 5)
+
+CAR_ROWS = [
+    (4, 'Corolla', 'Toyota', 2020, 250000, 'Sedán', 'Gasolina', 4, '1.8L', 1.4, 1.7, 4.6, 'Familiar', 3, 'Activo', T1),
+    (2, 'Jetta', 'Volkswagen', 2021, 380000, 'Sedán', 'Diésel', 4, '2.0L', 1.4, 1.8, 4.7, 'Eficiente', 4, 'Eliminado',
+     T2)
+]
+
+
+class TestGetChangedCars(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    def test_watermark_round_trip(self):
+        watermark = {'cars': (T1, 4), 'ratings': (EPOCH, 0)}
+
+        self.assertEqual(decode_watermark(encode_watermark(watermark)), watermark)
+        self.assertNotIn('=', encode_watermark(watermark))
+
+    @patch('car.get_changed_cars.app.get_connection')
+    @patch('car.get_changed_cars.app.handle_response')
+    def test_lambda_handler_invalid_parameters(self, mock_handle_response, mock_get_connection):
+        cases = [
+            ({'limit': '0'}, 'El parámetro limit debe ser un entero entre 1 y 500.'),
+            ({'limit': 'abc'}, 'El parámetro limit debe ser un entero entre 1 y 500.'),
+            ({'since': 'not-a-cursor'}, 'El parámetro since no es un cursor válido.')
+        ]
+        for query_params, message in cases:
+            lambda_handler({'queryStringParameters': query_params}, None)
+
+            self.assertEqual(mock_handle_response.call_args[0][1:], (message, 400))
+
+        mock_get_connection.assert_not_called()
+
+    @patch('car.get_changed_cars.app.get_connection')
+    @patch('car.get_changed_cars.app.release_connection')
+    @patch('car.get_changed_cars.app.handle_response_success')
+    def test_lambda_handler_changes_and_tombstones(self, mock_handle_response_success, mock_release_connection,
+                                                   mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [
+            CAR_ROWS,
+            [(4, 3, 13, T1), (9, 0, 0, T2), (7, 1, 5, T2)],
+            [(4, 'http://example.com/4.jpg')]
+        ]
+        since = encode_watermark({'cars': (T1, 1), 'ratings': (EPOCH, 0)})
+
+        lambda_handler({'queryStringParameters': {'since': since, 'limit': '2'}}, None)
+
+        cars_call, ratings_call, images_call = mock_cursor.execute.call_args_list
+        self.assertIn('FROM auto a', cars_call[0][0])
+        self.assertEqual(cars_call[0][1], (T1, T1, 1, 2.0, 3))
+        self.assertIn('FROM rate_summary', ratings_call[0][0])
+        self.assertEqual(ratings_call[0][1], (EPOCH, EPOCH, 0, 2.0, 3))
+        self.assertEqual(images_call[0][1], [4])
+
+        status_code, message, data, extra, accept_encoding = mock_handle_response_success.call_args[0]
+        self.assertEqual((status_code, message), (200, 'Cambios del catálogo obtenidos correctamente.'))
+        self.assertEqual([car['id_auto'] for car in data['cars']], [4])
+        self.assertEqual(data['cars'][0]['price'], '$250,000.00')
+        self.assertEqual(data['cars'][0]['images'], ['http://example.com/4.jpg'])
+        self.assertEqual(data['deleted'], [{'id_auto': 2, 'status': 'Eliminado'}])
+        self.assertEqual(data['ratings'], [
+            {'id_auto': 4, 'rate_count': 3, 'average_rating': 13 / 3},
+            {'id_auto': 9, 'rate_count': 0, 'average_rating': 0}
+        ])
+        self.assertTrue(extra['has_more'])
+        self.assertEqual(decode_watermark(extra['next_since']), {'cars': (T2, 2), 'ratings': (T2, 9)})
+
+    @patch('car.get_changed_cars.app.get_connection')
+    @patch('car.get_changed_cars.app.release_connection')
+    @patch('car.get_changed_cars.app.handle_response_success')
+    def test_lambda_handler_no_changes_keeps_watermark(self, mock_handle_response_success, mock_release_connection,
+                                                       mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = []
+        since = encode_watermark({'cars': (T2, 2), 'ratings': (T1, 4)})
+
+        lambda_handler({'queryStringParameters': {'since': since}}, None)
+
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        data, extra = mock_handle_response_success.call_args[0][2:4]
+        self.assertEqual(data, {'cars': [], 'deleted': [], 'ratings': []})
+        self.assertEqual(extra, {'next_since': since, 'has_more': False})
+
+    @patch('car.get_changed_cars.app.get_connection')
+    @patch('car.get_changed_cars.app.handle_response')
+    def test_lambda_handler_database_error(self, mock_handle_response, mock_get_connection):
+        error = Exception('DB error')
+        mock_get_connection.side_effect = error
+
+        lambda_handler({'queryStringParameters': None}, None)
+
+        mock_handle_response.assert_called_once_with(error, 'Ocurrió un error al obtener los cambios del catálogo.', 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,18 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 import json
 import pymysql
-from car.get_data_car.app import lambda_handler
-from car.get_data_car.connection import get_connection, get_secret, handle_response, headers_cors, \
+from car.get_data_car.app import lambda_handler, encode_cursor, decode_cursor
+from car.get_data_car.connection import get_connection, get_secret, clear_secret_cache, discard_connection, handle_response, headers_cors, \
     handle_response_success
 from botocore.exceptions import ClientError
 
 
 class TestGetCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
     @patch("car.get_data_car.app.get_connection")
     @patch("car.get_data_car.app.handle_response_success")
     def test_lambda_handler_success(self, mock_handle_response_success, mock_get_connection):
@@ -23,11 +27,9 @@ class TestGetCar(unittest.TestCase):
                  'Sold')
             ],
             [
-                ('http://example.com/image1.jpg',),
-                ('http://example.com/image2.jpg',)
-            ],
-            [
-                ('http://example.com/image3.jpg',)
+                (1, 'http://example.com/image1.jpg'),
+                (1, 'http://example.com/image2.jpg'),
+                (2, 'http://example.com/image3.jpg')
             ]
         ]
 
@@ -73,7 +75,7 @@ class TestGetCar(unittest.TestCase):
         ]
 
         mock_handle_response_success.assert_called_once_with(200, 'Todos los autos obtenidos correctamente.',
-                                                             expected_cars)
+                                                             expected_cars, {'next_cursor': None}, None)
         self.assertEqual(response, mock_handle_response_success.return_value)
 
     @patch("car.get_data_car.app.get_connection")
@@ -88,7 +90,8 @@ class TestGetCar(unittest.TestCase):
         context = {}
         response = lambda_handler(event, context)
 
-        mock_handle_response_success.assert_called_once_with(200, 'Todos los autos obtenidos correctamente.', [])
+        mock_handle_response_success.assert_called_once_with(200, 'Todos los autos obtenidos correctamente.', [],
+                                                             {'next_cursor': None}, None)
         self.assertEqual(response, mock_handle_response_success.return_value)
 
     @patch("car.get_data_car.app.get_connection")
@@ -194,3 +197,80 @@ class TestGetCar(unittest.TestCase):
 
         with self.assertRaises(ClientError):
             get_secret()
+
+    @patch("car.get_data_car.app.get_connection")
+    @patch("car.get_data_car.app.handle_response_success")
+    def test_lambda_handler_next_page(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        rows = [
+            (id_auto, 'Model', 'Brand', 2020, 1000, 'SUV', 'Gasoline', 4, 'V8', 1, 2, 3, 'Desc', 'Available')
+            for id_auto in (11, 12, 13)
+        ]
+        mock_cursor.fetchall.side_effect = [rows, []]
+
+        event = {'queryStringParameters': {'limit': '2', 'after': encode_cursor(10)}}
+        lambda_handler(event, {})
+
+        query, params = mock_cursor.execute.call_args_list[0][0]
+        self.assertIn('WHERE a.id_auto > %s ORDER BY a.id_auto LIMIT %s', query)
+        self.assertEqual(params, [10, 3])
+
+        args = mock_handle_response_success.call_args[0]
+        self.assertEqual([car['id_auto'] for car in args[2]], [11, 12])
+        self.assertEqual(decode_cursor(args[3]['next_cursor']), 12)
+
+    @patch("car.get_data_car.app.get_connection")
+    @patch("car.get_data_car.app.handle_response")
+    def test_lambda_handler_invalid_limit(self, mock_handle_response, mock_get_connection):
+        for limit in ('0', '201', 'abc'):
+            lambda_handler({'queryStringParameters': {'limit': limit}}, {})
+            self.assertEqual(mock_handle_response.call_args[0][2], 400)
+
+        mock_get_connection.assert_not_called()
+
+    @patch("car.get_data_car.app.get_connection")
+    @patch("car.get_data_car.app.handle_response")
+    def test_lambda_handler_invalid_cursor(self, mock_handle_response, mock_get_connection):
+        lambda_handler({'queryStringParameters': {'after': 'not-a-cursor'}}, {})
+
+        mock_handle_response.assert_called_once_with(ANY, 'El parámetro after no es un cursor válido.', 400)
+        mock_get_connection.assert_not_called()
+
+    def test_cursor_round_trip(self):
+        token = encode_cursor(1234)
+
+        self.assertNotIn('=', token)
+        self.assertEqual(decode_cursor(token), 1234)
+
+    @patch("car.get_data_car.app.get_connection")
+    @patch("car.get_data_car.app.handle_response_success")
+    def test_lambda_handler_sparse_fields(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [[(1, 'Brand', 1000)], [(1, 'http://example.com/1.jpg')]]
+
+        lambda_handler({'queryStringParameters': {'fields': 'brand,price,cover_image'}}, {})
+
+        query = mock_cursor.execute.call_args_list[0][0][0]
+        self.assertTrue(query.startswith('SELECT a.id_auto, a.brand, a.price FROM auto a'))
+        cars = mock_handle_response_success.call_args[0][2]
+        self.assertEqual(cars, [{'id_auto': 1, 'brand': 'Brand', 'price': 1000,
+                                 'cover_image': 'http://example.com/1.jpg'}])
+
+    @patch("car.get_data_car.app.get_connection")
+    @patch("car.get_data_car.app.handle_response_success")
+    def test_lambda_handler_fields_skip_images(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [[(1, 'Model')]]
+
+        lambda_handler({'queryStringParameters': {'fields': 'id_auto,model'}}, {})
+
+        self.assertEqual(mock_cursor.execute.call_count, 1)
+        self.assertEqual(mock_handle_response_success.call_args[0][2], [{'id_auto': 1, 'model': 'Model'}])
+
+    @patch("car.get_data_car.app.get_connection")
+    @patch("car.get_data_car.app.handle_response")
+    def test_lambda_handler_invalid_fields(self, mock_handle_response, mock_get_connection):
+        lambda_handler({'queryStringParameters': {'fields': 'model,password'}}, {})
+
+        mock_handle_response.assert_called_once_with(ANY, 'El parámetro fields contiene campos no válidos: password.', 400)
+        mock_get_connection.assert_not_called()
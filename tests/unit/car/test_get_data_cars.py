@@ -1,19 +1,28 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import json
+import gzip
+import base64
+from decimal import Decimal
 import pymysql
-from car.get_data_cars.app import lambda_handler
-from car.get_data_cars.connection import get_secret, get_connection, handle_response, handle_response_success, headers_cors
+from car.get_data_cars.app import lambda_handler, etag_matches
+from car.get_data_cars.connection import get_secret, clear_secret_cache, discard_connection, get_connection, handle_response, handle_response_success, headers_cors, \
+    release_connection, handle_response_not_modified, encode_response, choose_encoding
 from botocore.exceptions import ClientError
 
 
 class TestGetDataCars(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
     @patch('car.get_data_cars.app.get_connection')
     @patch('car.get_data_cars.app.handle_response_success')
     def test_lambda_handler(self, mock_handle_response_success, mock_get_connection):
         # Simulación de la conexión
         mock_connection = mock_get_connection.return_value
         mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (7,)
 
         # Simulación de los resultados de las consultas
         mock_cursor.fetchall.side_effect = [
@@ -21,13 +30,11 @@ class TestGetDataCars(unittest.TestCase):
                 (1, 'Model X', 'Brand Y', 2021, 35000, 'SUV', 'Gasoline', 4, 'V6', 1700, 2000, 4500, 'A great car', 'Available'),
             ],
             [
-                ('http://example.com/image1.jpg',),
-                ('http://example.com/image2.jpg',),
+                (1, 'http://example.com/image1.jpg'),
+                (1, 'http://example.com/image2.jpg'),
             ],
             [
-                (5,),
-                (4,),
-                (3,),
+                (1, Decimal('4.0000')),
             ]
         ]
 
@@ -61,7 +68,10 @@ class TestGetDataCars(unittest.TestCase):
             ],
             'average_rating': 4.0
         }]
-        mock_handle_response_success.assert_called_once_with(200, 'Autos obtenidos correctamente', expected_cars)
+        mock_handle_response_success.assert_called_once_with(200, 'Autos obtenidos correctamente', expected_cars,
+                                                             {'next_cursor': None},
+                                                             {'ETag': '"cars-7-0-50"',
+                                                              'Access-Control-Expose-Headers': 'ETag'}, None)
 
 
     @patch("car.get_data_cars.app.get_connection")
@@ -70,6 +80,7 @@ class TestGetDataCars(unittest.TestCase):
         # Simulación de la conexión y el cursor de la base de datos
         mock_conn = mock_get_connection.return_value
         mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = None
 
         # Simulación de resultados vacíos de las consultas
         mock_cursor.fetchall.side_effect = [[], [], [], []]
@@ -80,9 +91,42 @@ class TestGetDataCars(unittest.TestCase):
         response = lambda_handler(event, context)
 
         # Verificación de los resultados esperados
-        mock_handle_response_success.assert_called_once_with(200, 'Autos obtenidos correctamente', [])
+        mock_handle_response_success.assert_called_once_with(200, 'Autos obtenidos correctamente', [], {'next_cursor': None},
+                                                             {'ETag': '"cars-0-0-50"',
+                                                              'Access-Control-Expose-Headers': 'ETag'}, None)
         self.assertEqual(response, mock_handle_response_success.return_value)
 
+    @patch('car.get_data_cars.app.get_connection')
+    @patch('car.get_data_cars.app.handle_response_success')
+    def test_lambda_handler_batches_related_queries(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [
+            [
+                (1, 'Model X', 'Brand Y', 2021, 35000, 'SUV', 'Gasoline', 4, 'V6', 1700, 2000, 4500, 'A', 'Available'),
+                (2, 'Model Z', 'Brand Y', 2022, 30000, 'Sedan', 'Diesel', 4, 'V4', 1500, 1900, 4400, 'B', 'Available'),
+                (3, 'Model W', 'Brand Q', 2023, 20000, 'Hatch', 'Gasoline', 2, 'I3', 1400, 1800, 4000, 'C', 'Available'),
+            ],
+            [
+                (3, 'http://example.com/w.jpg'),
+                (1, 'http://example.com/x.jpg'),
+            ],
+            [
+                (1, Decimal('5.0000')),
+                (3, Decimal('2.5000')),
+            ]
+        ]
+
+        lambda_handler({}, {})
+
+        self.assertEqual(mock_cursor.execute.call_count, 4)
+        image_query, image_params = mock_cursor.execute.call_args_list[2][0]
+        self.assertIn('IN (%s, %s, %s)', image_query)
+        self.assertEqual(image_params, [1, 2, 3])
+
+        cars = mock_handle_response_success.call_args[0][2]
+        self.assertEqual([car['images'] for car in cars], [['http://example.com/x.jpg'], [], ['http://example.com/w.jpg']])
+        self.assertEqual([car['average_rating'] for car in cars], [5.0, 0, 2.5])
+
     @patch("car.get_data_cars.app.get_connection")
     def test_lambda_handler_connection_fail(self, mock_get_connection):
         # Simulación de un error en la conexión a la base de datos
@@ -187,3 +231,246 @@ class TestGetDataCars(unittest.TestCase):
 
         with self.assertRaises(ClientError):
             get_secret()
+
+    @patch('car.get_data_cars.connection.boto3.session.Session.client')
+    def test_get_secret_cached(self, mock_boto_client):
+        mock_client = mock_boto_client.return_value
+        mock_client.get_secret_value.return_value = {
+            'SecretString': json.dumps({'HOST': 'test_host'})
+        }
+
+        first = get_secret()
+        second = get_secret()
+
+        self.assertEqual(first, second)
+        mock_client.get_secret_value.assert_called_once_with(SecretId='COAUTO')
+
+        get_secret(force_refresh=True)
+        self.assertEqual(mock_client.get_secret_value.call_count, 2)
+
+    @patch('car.get_data_cars.connection.time.monotonic')
+    @patch('car.get_data_cars.connection.boto3.session.Session.client')
+    def test_get_secret_expired(self, mock_boto_client, mock_monotonic):
+        mock_client = mock_boto_client.return_value
+        mock_client.get_secret_value.return_value = {
+            'SecretString': json.dumps({'HOST': 'test_host'})
+        }
+        mock_monotonic.side_effect = [0.0, 10.0, 10_000.0]
+
+        get_secret()
+        get_secret()
+        get_secret()
+
+        self.assertEqual(mock_client.get_secret_value.call_count, 2)
+
+    @patch('car.get_data_cars.connection.pymysql.connect')
+    @patch('car.get_data_cars.connection.get_secret')
+    def test_get_connection_refreshes_rotated_secret(self, mock_get_secret, mock_connect):
+        stale = {'HOST': 'test_host', 'USERNAME': 'test_user', 'PASSWORD': 'old', 'DB_NAME': 'test_db'}
+        fresh = {'HOST': 'test_host', 'USERNAME': 'test_user', 'PASSWORD': 'new', 'DB_NAME': 'test_db'}
+        mock_get_secret.side_effect = [stale, fresh]
+        mock_connection = MagicMock()
+        mock_connect.side_effect = [pymysql.err.OperationalError(1045, 'Access denied'), mock_connection]
+
+        connection = get_connection()
+
+        self.assertEqual(connection, mock_connection)
+        mock_get_secret.assert_called_with(force_refresh=True)
+        mock_connect.assert_called_with(host='test_host', user='test_user', password='new', database='test_db')
+
+    @patch('car.get_data_cars.connection.pymysql.connect')
+    @patch('car.get_data_cars.connection.get_secret')
+    def test_get_connection_operational_error(self, mock_get_secret, mock_connect):
+        mock_get_secret.return_value = {'HOST': 'test_host', 'USERNAME': 'test_user', 'PASSWORD': 'p', 'DB_NAME': 'db'}
+        mock_connect.side_effect = pymysql.err.OperationalError(2003, "Can't connect")
+
+        with self.assertRaises(pymysql.err.OperationalError):
+            get_connection()
+
+        mock_get_secret.assert_called_once_with()
+
+    @patch('car.get_data_cars.connection.pymysql.connect')
+    @patch('car.get_data_cars.connection.get_secret')
+    def test_get_connection_reused(self, mock_get_secret, mock_connect):
+        mock_get_secret.return_value = {'HOST': 'h', 'USERNAME': 'u', 'PASSWORD': 'p', 'DB_NAME': 'd'}
+
+        first = get_connection()
+        release_connection(first)
+        second = get_connection()
+
+        self.assertIs(first, second)
+        mock_connect.assert_called_once()
+        first.ping.assert_called_once_with(reconnect=True)
+        first.rollback.assert_called_once()
+        first.close.assert_not_called()
+
+    @patch('car.get_data_cars.connection.pymysql.connect')
+    @patch('car.get_data_cars.connection.get_secret')
+    def test_get_connection_ping_failure(self, mock_get_secret, mock_connect):
+        mock_get_secret.return_value = {'HOST': 'h', 'USERNAME': 'u', 'PASSWORD': 'p', 'DB_NAME': 'd'}
+        stale, fresh = MagicMock(), MagicMock()
+        stale.ping.side_effect = pymysql.err.OperationalError(2013, 'Lost connection')
+        mock_connect.side_effect = [stale, fresh]
+
+        get_connection()
+        connection = get_connection()
+
+        self.assertIs(connection, fresh)
+        stale.close.assert_called_once()
+
+    @patch('car.get_data_cars.connection.DB_MAX_LIFETIME_SECONDS', 60)
+    @patch('car.get_data_cars.connection.time.monotonic')
+    @patch('car.get_data_cars.connection.pymysql.connect')
+    @patch('car.get_data_cars.connection.get_secret')
+    def test_get_connection_max_lifetime(self, mock_get_secret, mock_connect, mock_monotonic):
+        mock_get_secret.return_value = {'HOST': 'h', 'USERNAME': 'u', 'PASSWORD': 'p', 'DB_NAME': 'd'}
+        old, new = MagicMock(), MagicMock()
+        mock_connect.side_effect = [old, new]
+        mock_monotonic.side_effect = [0.0, 120.0, 120.0]
+
+        get_connection()
+        connection = get_connection()
+
+        self.assertIs(connection, new)
+        old.ping.assert_not_called()
+        old.close.assert_called_once()
+
+    def test_release_connection_not_managed(self):
+        connection = MagicMock()
+
+        release_connection(connection)
+
+        connection.close.assert_called_once()
+
+    def test_handle_response_success_extra(self):
+        response = handle_response_success(200, 'TestMessage', [], {'next_cursor': 'abc'})
+
+        body = json.loads(response['body'])
+        self.assertEqual(body['data'], [])
+        self.assertEqual(body['next_cursor'], 'abc')
+
+    @patch('car.get_data_cars.app.get_connection')
+    @patch('car.get_data_cars.app.handle_response_success')
+    def test_lambda_handler_default_page_size(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [[]]
+
+        lambda_handler({'queryStringParameters': None}, {})
+
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertNotIn('WHERE', query)
+        self.assertEqual(params, [51])
+
+    @patch('car.get_data_cars.app.get_connection')
+    def test_lambda_handler_not_modified(self, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (7,)
+
+        response = lambda_handler({'headers': {'if-none-match': '"cars-7-0-50"'}}, {})
+
+        self.assertEqual(response['statusCode'], 304)
+        self.assertEqual(response['body'], '')
+        self.assertEqual(response['headers']['ETag'], '"cars-7-0-50"')
+        self.assertEqual(mock_cursor.execute.call_count, 1)
+        mock_connection.close.assert_called_once()
+
+    @patch('car.get_data_cars.app.get_connection')
+    def test_lambda_handler_stale_etag(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (8,)
+        mock_cursor.fetchall.side_effect = [[]]
+
+        response = lambda_handler({'headers': {'If-None-Match': '"cars-7-0-50"'}}, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers']['ETag'], '"cars-8-0-50"')
+        self.assertEqual(response['headers']['Access-Control-Allow-Origin'], '*')
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('W/"cars-1-0-50", "cars-2-0-50"', '"cars-2-0-50"'))
+        self.assertTrue(etag_matches('*', '"cars-2-0-50"'))
+        self.assertFalse(etag_matches('"cars-1-0-50"', '"cars-2-0-50"'))
+        self.assertFalse(etag_matches(None, '"cars-2-0-50"'))
+
+    def test_handle_response_not_modified(self):
+        response = handle_response_not_modified({'ETag': '"x"'})
+
+        self.assertEqual(response, {'statusCode': 304, 'headers': {**headers_cors, 'ETag': '"x"'}, 'body': ''})
+
+    def test_encode_response_gzip(self):
+        body = json.dumps({'data': ['x' * 2000]})
+
+        response = encode_response(200, body, headers_cors, 'gzip, deflate')
+
+        self.assertTrue(response['isBase64Encoded'])
+        self.assertEqual(response['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(response['headers']['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(base64.b64decode(response['body'])).decode('utf-8'), body)
+
+    def test_encode_response_below_threshold(self):
+        response = encode_response(200, '{"data": []}', headers_cors, 'gzip')
+
+        self.assertEqual(response, {'statusCode': 200, 'headers': headers_cors, 'body': '{"data": []}'})
+
+    @patch('car.get_data_cars.connection.brotli')
+    def test_encode_response_brotli(self, mock_brotli):
+        mock_brotli.compress.return_value = b'compressed'
+
+        response = encode_response(200, 'x' * 2000, headers_cors, 'gzip;q=0.8, br')
+
+        self.assertEqual(response['headers']['Content-Encoding'], 'br')
+        self.assertEqual(base64.b64decode(response['body']), b'compressed')
+
+    @patch('car.get_data_cars.connection.brotli', None)
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding('br, gzip'), 'gzip')
+        self.assertEqual(choose_encoding('*'), 'gzip')
+        self.assertIsNone(choose_encoding('gzip;q=0, identity'))
+        self.assertIsNone(choose_encoding(None))
+
+    @patch('car.get_data_cars.app.get_connection')
+    def test_lambda_handler_compressed(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (1,)
+        mock_cursor.fetchall.side_effect = [
+            [(i, 'Model X', 'Brand Y', 2021, 35000, 'SUV', 'Gasoline', 4, 'V6', 1700, 2000, 4500, 'A great car',
+              'Available') for i in range(1, 21)],
+            [],
+            []
+        ]
+
+        response = lambda_handler({'headers': {'Accept-Encoding': 'gzip'}}, {})
+
+        self.assertEqual(response['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(response['headers']['ETag'], '"cars-1-0-50"')
+        body = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+        self.assertEqual(len(body['data']), 20)
+
+    @patch('car.get_data_cars.app.get_connection')
+    @patch('car.get_data_cars.app.handle_response_success')
+    def test_lambda_handler_sparse_fields(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (2,)
+        mock_cursor.fetchall.side_effect = [[(1, 'Model X', 'Brand Y', 35000)]]
+
+        lambda_handler({'queryStringParameters': {'fields': 'model,brand,price'}}, {})
+
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        query = mock_cursor.execute.call_args_list[1][0][0]
+        self.assertTrue(query.startswith('SELECT a.id_auto, a.model, a.brand, a.price FROM auto a'))
+        args = mock_handle_response_success.call_args[0]
+        self.assertEqual(args[2], [{'id_auto': 1, 'model': 'Model X', 'brand': 'Brand Y', 'price': '$35,000.00'}])
+        self.assertEqual(args[4]['ETag'], '"cars-2-0-50-model+brand+price"')
+
+    @patch('car.get_data_cars.app.get_connection')
+    @patch('car.get_data_cars.app.handle_response_success')
+    def test_lambda_handler_rating_field_only(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (2,)
+        mock_cursor.fetchall.side_effect = [[(1,)], [(1, Decimal('3.5000'))]]
+
+        lambda_handler({'queryStringParameters': {'fields': 'average_rating'}}, {})
+
+        self.assertIn('rate_summary', mock_cursor.execute.call_args[0][0])
+        self.assertEqual(mock_handle_response_success.call_args[0][2], [{'id_auto': 1, 'average_rating': 3.5}])
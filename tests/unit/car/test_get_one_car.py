@@ -1,13 +1,20 @@
 import unittest
 from unittest.mock import patch
 import json
+from decimal import Decimal
 import pymysql
 from car.get_one_car.app import lambda_handler
-from car.get_one_car.connection import get_connection, handle_response, get_secret, handle_response_success, headers_cors
+from car.get_one_car.cache import car_cache, CarCache
+from car.get_one_car.connection import get_connection, handle_response, get_secret, clear_secret_cache, discard_connection, handle_response_success, headers_cors
 from botocore.exceptions import ClientError
 
 
 class TestGetOneCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+        car_cache.clear()
+
     @patch('car.get_one_car.app.get_connection')
     @patch('car.get_one_car.app.handle_response')
     @patch('car.get_one_car.app.handle_response_success')
@@ -36,6 +43,7 @@ class TestGetOneCar(unittest.TestCase):
         mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
 
         mock_cursor.execute.side_effect = [
+            None,  # para la version del catalogo
             None,  # para la consulta de autos
             None,  # para la consulta de imagenes
             None  # para la consulta de calificaciones
@@ -46,10 +54,10 @@ class TestGetOneCar(unittest.TestCase):
                  'Available')
             ],  # resultado para la consulta de autos
             [
-                ('http://example.com/image1.jpg',)
+                (1, 'http://example.com/image1.jpg')
             ],  # resultado para la consulta de imagenes
             [
-                (4,), (5,)
+                (1, Decimal('4.5000'))
             ]  # resultado para la consulta de calificaciones
         ]
 
@@ -77,7 +85,7 @@ class TestGetOneCar(unittest.TestCase):
         ]
 
         mock_handle_response_success.assert_called_with(200, 'Informacion del auto obtenida correctamente.',
-                                                        expected_response_data)
+                                                        expected_response_data, None)
 
     @patch('car.get_one_car.app.get_connection')
     @patch('car.get_one_car.app.handle_response')
@@ -114,6 +122,7 @@ class TestGetOneCar(unittest.TestCase):
         mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
 
         mock_cursor.execute.side_effect = [
+            None,  # For the catalog version
             None,  # For the first query
             None,  # For the images query
             None  # For the rate query
@@ -132,6 +141,63 @@ class TestGetOneCar(unittest.TestCase):
         self.assertIn('Informacion del auto obtenida correctamente.', response['body'])
         self.assertEqual(json.loads(response['body'])['data'], expected_response_data)
 
+    @patch('car.get_one_car.app.get_connection')
+    def test_lambda_handler_served_from_cache(self, mock_get_connection):
+        event = {'queryStringParameters': {'id_auto': '1'}, 'body': None}
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (3,)
+        mock_cursor.fetchall.side_effect = [
+            [(1, 'Model X', 'Brand Y', 2020, 50000, 'Sedan', 'Gasoline', 4, 'V8', 150, 200, 450, 'A great car',
+              'Available')],
+            [],
+            []
+        ]
+
+        first = lambda_handler(event, {})
+        second = lambda_handler(event, {})
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get_connection.call_count, 1)
+        self.assertEqual(car_cache.stats(), {'hits': 1, 'misses': 1, 'size': 1, 'version': 3})
+
+    @patch('car.get_one_car.app.get_connection')
+    def test_lambda_handler_version_change_invalidates(self, mock_get_connection):
+        event = {'queryStringParameters': {'id_auto': '1'}, 'body': None}
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.side_effect = [(3,), (4,)]
+        mock_cursor.fetchall.return_value = []
+
+        lambda_handler(event, {})
+        car_cache.version_checked_at = 0.0
+        lambda_handler(event, {})
+
+        self.assertEqual(car_cache.stats(), {'hits': 0, 'misses': 2, 'size': 1, 'version': 4})
+
+    def test_car_cache_evicts_least_recently_used(self):
+        cache = CarCache(2, 60, 5)
+        cache.sync_version(1)
+        cache.put('1', 'a')
+        cache.put('2', 'b')
+        cache.get('1')
+        cache.put('3', 'c')
+
+        self.assertIsNone(cache.get('2'))
+        self.assertEqual(cache.get('1'), 'a')
+        self.assertEqual(cache.get('3'), 'c')
+
+    @patch('car.get_one_car.cache.time.monotonic')
+    def test_car_cache_expires_entries(self, mock_monotonic):
+        cache = CarCache(2, 60, 5)
+        mock_monotonic.return_value = 100.0
+        cache.sync_version(1)
+        cache.put('1', 'a')
+
+        mock_monotonic.return_value = 161.0
+
+        self.assertIsNone(cache.get('1'))
+        self.assertTrue(cache.needs_version_check())
+        self.assertEqual(cache.stats()['size'], 0)
+
     # Test for connection.py
 
     @patch('car.get_one_car.connection.boto3.session.Session.client')
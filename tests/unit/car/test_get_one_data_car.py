@@ -3,7 +3,8 @@ from unittest.mock import patch
 import json
 import pymysql
 from car.get_one_data_car.app import lambda_handler
-from car.get_one_data_car.connection import get_connection, get_secret, handle_response, headers_cors, handle_response_success
+from car.get_one_data_car.cache import car_cache
+from car.get_one_data_car.connection import get_connection, get_secret, clear_secret_cache, discard_connection, handle_response, headers_cors, handle_response_success
 from botocore.exceptions import ClientError
 mock_body = {
     'body': json.dumps({'id_auto': 1})
@@ -23,6 +24,11 @@ mock_query_string_params_no_id = {
 
 
 class TestGetOneCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+        car_cache.clear()
+
     @patch('car.get_one_data_car.app.get_connection')
     @patch('car.get_one_data_car.app.handle_response')
     @patch('car.get_one_data_car.app.handle_response_success')
@@ -75,7 +81,7 @@ class TestGetOneCar(unittest.TestCase):
         }
 
         mock_handle_response_success.assert_called_once_with(200, 'Informacion del auto obtenida correctamente.',
-                                                             [expected_car])
+                                                             [expected_car], None)
 
     @patch('car.get_one_data_car.app.get_connection')
     @patch('car.get_one_data_car.app.handle_response')
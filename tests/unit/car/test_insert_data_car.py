@@ -4,12 +4,16 @@ import json
 import pymysql
 import base64
 from car.insert_data_car.app import lambda_handler, insert_into_car
-from car.insert_data_car.connection import get_connection, handle_response, headers_cors, get_secret, \
-    handle_response_success, get_jwt_claims
+from car.insert_data_car.connection import get_connection, handle_response, headers_cors, get_secret, clear_secret_cache, discard_connection, \
+    handle_response_success, get_jwt_claims, decode_body
 from botocore.exceptions import ClientError
 
 
 class TestInsertCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
     @patch('car.insert_data_car.app.get_jwt_claims')
     def test_client_user_group(self, mock_get_jwt_claims):
         event = {'headers': {'Authorization': 'fake_token'}}
@@ -150,6 +154,7 @@ class TestInsertCar(unittest.TestCase):
             "INSERT INTO auto_image (id_auto, url) VALUES (%s, %s)",
             (1, 'http://example.com/image2.jpg')
         )
+        mock_cursor.execute.assert_called_with("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
         self.assertEqual(response['statusCode'], 200)
         self.assertEqual(response['body'], 'Auto guardado correctamente.')
 
@@ -629,3 +634,10 @@ class TestInsertCar(unittest.TestCase):
 
         with self.assertRaises(AttributeError):
             get_jwt_claims(token)
+
+    def test_decode_body_base64(self):
+        body = json.dumps({'model': 'Model X'})
+        event = {'body': base64.b64encode(body.encode('utf-8')).decode('ascii'), 'isBase64Encoded': True}
+
+        self.assertEqual(decode_body(event, event['body']), body)
+        self.assertEqual(decode_body({'body': body}, body), body)
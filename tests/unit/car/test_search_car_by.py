@@ -2,12 +2,36 @@ import unittest
 from unittest.mock import patch
 import json
 import pymysql
-from car.search_car_by.app import build_query, lambda_handler
-from car.search_car_by.connection import headers_cors, get_connection, get_secret, handle_response, handle_response_success
+from datetime import datetime
+from car.search_car_by.app import build_query, lambda_handler, parse_filters
+from car.search_car_by.search_index import CatalogIndex, search_index, tokenize
+from car.search_car_by.connection import headers_cors, get_connection, get_secret, clear_secret_cache, discard_connection, handle_response, handle_response_success
 from botocore.exceptions import ClientError
 
+FIELDS = ('id_auto', 'model', 'brand', 'year', 'price', 'type', 'fuel', 'doors', 'engine', 'height', 'width',
+          'length', 'description', 'status')
+CARS = [
+    dict(zip(FIELDS, (1, 'Corolla', 'Toyota', 2020, 250000, 'Sedán', 'Gasolina', 4, '1.8L', 1.4, 1.7, 4.6,
+                      'Sedán familiar', 'Activo'))),
+    dict(zip(FIELDS, (2, 'Jetta', 'Volkswagen', 2022, 380000, 'Sedán', 'Diésel', 4, '2.0L', 1.4, 1.8, 4.7,
+                      'Familiar y eficiente', 'Activo'))),
+    dict(zip(FIELDS, (3, 'RAV4', 'Toyota', 2021, 300000, 'SUV', 'Gasolina', 5, '2.5L', 1.7, 1.8, 4.6,
+                      'Camioneta amplia', 'Activo'))),
+    dict(zip(FIELDS, (4, 'Model 3', 'Tesla', 2019, 900000, 'Sedán', 'Eléctrico', 4, None, 1.4, 1.8, 4.7,
+                      'Eléctrico deportivo', 'Vendido'))),
+]
+
+
+T1 = datetime(2026, 10, 1, 9, 0)
+T2 = datetime(2026, 10, 1, 9, 5)
+
 
 class TestSearchCarBy(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+        search_index.build(None, [])
+
     def test_build_query_with_filters(self):
         filters = {
             'year': 2020,
@@ -17,10 +41,11 @@ class TestSearchCarBy(unittest.TestCase):
             'doors': 4
         }
         expected_query = (
-            "SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status"
-            " WHERE year = %s AND price <= %s AND model = %s AND brand = %s AND doors = %s"
+            "SELECT a.id_auto, a.model, a.brand, a.year, a.price, a.type, a.fuel, a.doors, a.engine, a.height, a.width, a.length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status"
+            " WHERE a.model = %s AND a.brand = %s AND a.year = %s AND a.doors = %s AND a.price <= %s"
+            " ORDER BY a.id_auto ASC LIMIT %s"
         )
-        expected_params = [2020, 15000, 'Model X', 'Brand Y', 4]
+        expected_params = ['Model X', 'Brand Y', 2020, 4, 15000.0, 50]
 
         query, params = build_query(filters)
 
@@ -29,14 +54,54 @@ class TestSearchCarBy(unittest.TestCase):
 
     def test_build_query_no_filters(self):
         filters = {}
-        expected_query = "SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status"
-        expected_params = []
+        expected_query = "SELECT a.id_auto, a.model, a.brand, a.year, a.price, a.type, a.fuel, a.doors, a.engine, a.height, a.width, a.length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status ORDER BY a.id_auto ASC LIMIT %s"
+        expected_params = [50]
 
         query, params = build_query(filters)
 
         self.assertEqual(query, expected_query)
         self.assertEqual(params, expected_params)
 
+    def test_build_query_ranges_and_sort(self):
+        filters = {
+            'min_price': '10000',
+            'max_price': '20000.50',
+            'min_year': '2018',
+            'max_length': '4500',
+            'fuel': 'Gasolina,Híbrido',
+            'type': 'SUV',
+            'sort': '-price',
+            'limit': '10'
+        }
+
+        query, params = build_query(filters)
+
+        self.assertIn(
+            " WHERE a.fuel IN (%s, %s) AND a.type = %s AND a.price >= %s AND a.price <= %s AND a.year >= %s"
+            " AND a.length <= %s ORDER BY a.price DESC, a.id_auto ASC LIMIT %s", query)
+        self.assertEqual(params, ['Gasolina', 'Híbrido', 'SUV', 10000.0, 20000.5, 2018, 4500.0, 10])
+
+    def test_build_query_max_price_overrides_price(self):
+        query, params = build_query({'price': '5000', 'max_price': '9000'})
+
+        self.assertEqual(query.count('a.price <= %s'), 1)
+        self.assertEqual(params, [9000.0, 50])
+
+    def test_build_query_invalid_values(self):
+        for filters, name in (({'min_year': 'abc'}, 'min_year'), ({'sort': 'description'}, 'sort'),
+                              ({'limit': '500'}, 'limit'), ({'doors': 'four'}, 'doors')):
+            with self.assertRaises(ValueError) as context:
+                build_query(filters)
+            self.assertEqual(str(context.exception), name)
+
+    @patch('car.search_car_by.app.get_connection')
+    @patch('car.search_car_by.app.handle_response')
+    def test_lambda_handler_invalid_filter(self, mock_handle_response, mock_get_connection):
+        lambda_handler({'queryStringParameters': {'sort': 'password'}}, None)
+
+        mock_handle_response.assert_called_once_with(unittest.mock.ANY, 'El filtro sort no es válido.', 400)
+        mock_get_connection.assert_not_called()
+
     @patch('car.search_car_by.app.get_connection')
     @patch('car.search_car_by.app.handle_response_success')
     def test_lambda_handler(self, mock_handle_response_success, mock_get_connection):
@@ -49,8 +114,8 @@ class TestSearchCarBy(unittest.TestCase):
                  'Available')
             ],
             [
-                ('http://example.com/image1.jpg',),
-                ('http://example.com/image2.jpg',)
+                (1, 'http://example.com/image1.jpg'),
+                (1, 'http://example.com/image2.jpg')
             ]
         ]
 
@@ -93,7 +158,7 @@ class TestSearchCarBy(unittest.TestCase):
 
         self.assertEqual(response, expected_response)
         mock_handle_response_success.assert_called_once_with(200, 'Carros encontrados',
-                                                             json.loads(expected_response['body'])['data'])
+                                                             json.loads(expected_response['body'])['data'], None, None)
 
     @patch('car.search_car_by.app.get_connection')
     @patch('car.search_car_by.app.handle_response_success')
@@ -126,7 +191,136 @@ class TestSearchCarBy(unittest.TestCase):
         response = lambda_handler(event, None)
 
         self.assertEqual(response, expected_response)
-        mock_handle_response_success.assert_called_once_with(200, 'Carros encontrados', [])
+        mock_handle_response_success.assert_called_once_with(200, 'Carros encontrados', [], None, None)
+
+    def test_build_query_text(self):
+        query, params = build_query({'q': 'Sedán  Familiar'})
+
+        self.assertIn(" WHERE MATCH(a.model, a.brand, a.description) AGAINST (%s IN BOOLEAN MODE)", query)
+        self.assertEqual(params, ['+sedan +familiar', 50])
+
+    def test_catalog_index_search(self):
+        index = CatalogIndex(5)
+        index.build(1, CARS)
+
+        def ids(filters):
+            return [car['id_auto'] for car in index.search(parse_filters(filters))]
+
+        self.assertEqual(ids({}), [1, 2, 3, 4])
+        self.assertEqual(ids({'brand': 'toyota'}), [1, 3])
+        self.assertEqual(ids({'fuel': 'Diésel,Eléctrico'}), [2, 4])
+        self.assertEqual(ids({'min_price': '260000', 'max_price': '400000'}), [2, 3])
+        self.assertEqual(ids({'q': 'familiar'}), [1, 2])
+        self.assertEqual(ids({'q': 'familiar toyota'}), [1])
+        self.assertEqual(ids({'sort': '-price', 'limit': '2'}), [4, 2])
+        self.assertEqual(ids({'sort': 'year'}), [4, 1, 3, 2])
+        self.assertEqual(ids({'sort': '-year'}), [2, 3, 1, 4])
+        self.assertEqual(ids({'sort': '-brand'}), [2, 1, 3, 4])
+        self.assertEqual(ids({'doors': '2'}), [])
+
+    @patch('car.search_car_by.app.SEARCH_INDEX_ENABLED', True)
+    @patch('car.search_car_by.app.get_connection')
+    @patch('car.search_car_by.app.handle_response_success')
+    def test_lambda_handler_with_search_index(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (T1,)
+        mock_cursor.fetchall.side_effect = [
+            [tuple(car[field] for field in FIELDS) for car in CARS],
+            [(1, 'http://example.com/1.jpg')]
+        ]
+
+        lambda_handler({'queryStringParameters': {'brand': 'Toyota'}}, None)
+        lambda_handler({'queryStringParameters': {'fuel': 'Diésel'}}, None)
+
+        self.assertEqual(mock_get_connection.call_count, 1)
+        first, second = mock_handle_response_success.call_args_list
+        self.assertEqual([car['id_auto'] for car in first[0][2]], [1, 3])
+        self.assertEqual(first[0][2][0]['images'], ['http://example.com/1.jpg'])
+        self.assertEqual([car['id_auto'] for car in second[0][2]], [2])
+        self.assertIsNone(second[0][3])
+        self.assertEqual(search_index.watermark, T1)
+
+    @patch('car.search_car_by.app.SEARCH_INDEX_ENABLED', True)
+    @patch('car.search_car_by.app.get_connection')
+    @patch('car.search_car_by.app.handle_response_success')
+    def test_lambda_handler_applies_changed_cars(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.side_effect = [(T1,), (T2,)]
+        changed = dict(CARS[2], brand='Honda', model='CR-V')
+        mock_cursor.fetchall.side_effect = [
+            [tuple(car[field] for field in FIELDS) for car in CARS],
+            [],
+            [tuple(changed[field] for field in FIELDS)],
+            [(3, 'http://example.com/3.jpg')]
+        ]
+
+        lambda_handler({'queryStringParameters': {'brand': 'Toyota'}}, None)
+        search_index.refreshed_at -= 3600
+        lambda_handler({'queryStringParameters': {'brand': 'Toyota'}}, None)
+        lambda_handler({'queryStringParameters': {'brand': 'Honda'}}, None)
+
+        query, params = mock_cursor.execute.call_args_list[4][0]
+        self.assertIn('WHERE a.updated_at > %s ORDER BY a.id_auto LIMIT %s', query)
+        self.assertEqual(params, (T1, 50001))
+        self.assertEqual(mock_cursor.execute.call_count, 6)
+        first, second, third = mock_handle_response_success.call_args_list
+        self.assertEqual([car['id_auto'] for car in first[0][2]], [1, 3])
+        self.assertEqual([car['id_auto'] for car in second[0][2]], [1])
+        self.assertEqual(third[0][2][0]['images'], ['http://example.com/3.jpg'])
+        self.assertEqual(search_index.watermark, T2)
+
+    def test_catalog_index_apply_matches_build(self):
+        base = [dict(car, id_auto=car['id_auto'] * 10 + copy) for copy in range(5) for car in CARS]
+        changed = [
+            dict(base[0], brand='Honda', price=None, description='Compacto urbano'),
+            dict(CARS[1], id_auto=5, year=None),
+            dict(CARS[3], id_auto=99, brand='Toyota', status='Activo')
+        ]
+        index = CatalogIndex(5)
+        index.build(1, base)
+        index.apply(2, changed)
+        expected = CatalogIndex(5)
+        expected.build(2, {car['id_auto']: car for car in base + changed}.values())
+
+        queries = [{}, {'brand': 'toyota'}, {'q': 'familiar'}, {'q': 'compacto'}, {'fuel': 'Diésel', 'doors': '4'},
+                   {'min_price': '260000', 'max_price': '400000'}, {'status': 'Vendido'}]
+        queries += [{'sort': sort, 'limit': '200'} for field in ('id_auto', 'price', 'year', 'brand', 'model')
+                    for sort in (field, '-' + field)]
+        for filters in queries:
+            criteria = parse_filters(filters)
+            self.assertEqual([car['id_auto'] for car in index.search(criteria)],
+                             [car['id_auto'] for car in expected.search(criteria)], filters)
+        self.assertEqual(index.watermark, 2)
+
+    @patch('car.search_car_by.app.SEARCH_INDEX_ENABLED', True)
+    @patch('car.search_car_by.app.SEARCH_INDEX_MAX_CARS', 2)
+    @patch('car.search_car_by.app.get_connection')
+    @patch('car.search_car_by.app.handle_response_success')
+    def test_lambda_handler_search_index_over_limit(self, mock_handle_response_success, mock_get_connection):
+        search_index.build(None, [])
+        self.addCleanup(search_index.build, None, [])
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (T2,)
+        mock_cursor.fetchall.side_effect = [
+            [tuple(car[field] for field in FIELDS) for car in CARS],
+            [tuple(car[field] for field in FIELDS) for car in CARS if car['brand'] == 'Toyota'],
+            []
+        ]
+
+        lambda_handler({'queryStringParameters': {'brand': 'Toyota'}}, None)
+
+        self.assertFalse(search_index.complete)
+        self.assertEqual(search_index.watermark, T2)
+        self.assertFalse(search_index.needs_refresh())
+        self.assertEqual(mock_get_connection.call_count, 1)
+        queries = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        self.assertEqual(mock_cursor.execute.call_args_list[1][0][1], (3,))
+        self.assertIn('WHERE a.brand = %s', queries[2])
+        self.assertEqual([car['id_auto'] for car in mock_handle_response_success.call_args[0][2]], [1, 3])
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('Híbrido, 4x4!'), ['hibrido', '4x4'])
+        self.assertEqual(tokenize(None), [])
 
     # Test for connection.py
 
@@ -3,11 +3,17 @@ from unittest.mock import patch
 import json
 import pymysql
 from car.search_one_by.app import handle_response, lambda_handler
+from car.search_one_by.trigram_index import trigram_index, TrigramIndex, trigrams
 from botocore.exceptions import ClientError
-from car.search_one_by.connection import headers_cors, get_secret, get_connection, handle_response_success
+from car.search_one_by.connection import headers_cors, get_secret, clear_secret_cache, discard_connection, get_connection, handle_response_success
 
 
 class TestSearchOneBy(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+        trigram_index.build(None, {})
+
     @patch('car.search_one_by.app.get_connection')
     @patch('car.search_one_by.app.handle_response')
     @patch('car.search_one_by.app.handle_response_success')
@@ -64,8 +70,8 @@ class TestSearchOneBy(unittest.TestCase):
                 (1, 'Model X', 'Brand Y', 2020, 15000, 'SUV', 'Gasoline', 4, 'V8', 1.5, 2.0, 3.0, 'A nice car', 'Available')
             ],
             [
-                ('http://example.com/image1.jpg',),
-                ('http://example.com/image2.jpg',)
+                (1, 'http://example.com/image1.jpg'),
+                (1, 'http://example.com/image2.jpg')
             ]
         ]
 
@@ -107,7 +113,7 @@ class TestSearchOneBy(unittest.TestCase):
         response = lambda_handler(event, None)
 
         self.assertEqual(response, expected_response)
-        mock_handle_response_success.assert_called_once_with(200, 'Consulta exitosa.', json.loads(expected_response['body'])['data'])
+        mock_handle_response_success.assert_called_once_with(200, 'Consulta exitosa.', json.loads(expected_response['body'])['data'], None, None)
 
     @patch('car.search_one_by.app.get_connection')
     @patch('car.search_one_by.app.handle_response')
@@ -142,6 +148,57 @@ class TestSearchOneBy(unittest.TestCase):
         self.assertEqual(called_args[1], 'Ocurrió un error al obtener la información del auto.')
         self.assertEqual(called_args[2], 500)
 
+    @patch('car.search_one_by.app.get_connection')
+    @patch('car.search_one_by.app.handle_response_success')
+    def test_lambda_handler_fuzzy_fallback(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (4,)
+        mock_cursor.fetchall.side_effect = [
+            [],  # busqueda exacta
+            [('Toyota',), ('Tesla',), ('Nissan',)],  # marcas
+            [('Corolla',), ('Model 3',), ('Versa',)],  # modelos
+            [(1, 'Corolla', 'Toyota', 2020, 250000, 'Sedán', 'Gasolina', 4, '1.8L', 1.4, 1.7, 4.6, 'Familiar',
+              'Activo')],
+            []  # imagenes
+        ]
+
+        lambda_handler({'queryStringParameters': {'type': 'marca', 'value': 'Toyta'}}, None)
+
+        mock_cursor.execute.assert_any_call(
+            "SELECT id_auto, model, brand, year, price, type, fuel, doors, engine, height, width, length, a.description, s.value FROM auto a INNER JOIN status s ON a.id_status = s.id_status WHERE brand IN (%s)",
+            ['Toyota'])
+        args = mock_handle_response_success.call_args[0]
+        self.assertEqual([car['id_auto'] for car in args[2]], [1])
+        self.assertEqual(args[3], {'fuzzy': True, 'matches': [{'value': 'Toyota', 'similarity': 0.4444}]})
+        self.assertEqual(trigram_index.version, 4)
+
+    @patch('car.search_one_by.app.get_connection')
+    @patch('car.search_one_by.app.handle_response_success')
+    def test_lambda_handler_no_fuzzy_for_year(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = []
+
+        lambda_handler({'queryStringParameters': {'type': 'año', 'value': '1999'}}, None)
+
+        self.assertEqual(mock_cursor.execute.call_count, 1)
+        mock_handle_response_success.assert_called_once_with(200, 'Consulta exitosa.', [], None, None)
+
+    def test_trigram_index_search(self):
+        index = TrigramIndex(5)
+        index.build(1, {'model': ['Corolla', 'Camry', 'Civic', 'Cívic Type R', None], 'brand': ['Toyota']})
+
+        self.assertEqual(index.search('model', 'Corola'), [('Corolla', 0.6667)])
+        self.assertEqual([term for term, _ in index.search('model', 'civc')], ['Civic'])
+        self.assertEqual([term for term, _ in index.search('model', 'civic type')], ['Cívic Type R', 'Civic'])
+        self.assertEqual(index.search('model', 'zzz'), [])
+        self.assertEqual(index.search('model', ''), [])
+        self.assertEqual(index.search('year', 'Corola'), [])
+        self.assertEqual(index.search('model', 'Corola', min_similarity=0.9), [])
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams('Ñu'), {'  n', ' nu', 'nu '})
+        self.assertEqual(trigrams(None), set())
+
     # Test for connection.py
 
     @patch('car.search_one_by.connection.boto3.session.Session.client')
@@ -0,0 +1,158 @@
+import unittest
+from unittest.mock import patch, ANY
+import json
+import pymysql
+from car.search_text_car.app import lambda_handler, encode_cursor, decode_cursor
+from car.search_text_car.connection import get_connection, get_secret, clear_secret_cache, discard_connection, \
+    handle_response, handle_response_success, headers_cors
+from botocore.exceptions import ClientError
+
+ROW = (1, 'Corolla', 'Toyota', 2020, 250000, 'Sedan', 'Gasolina', 4, '1.8L', 1450, 1780, 4630, 'Sedán familiar',
+       'Activo', 7.123456)
+
+
+class TestSearchTextCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    @patch('car.search_text_car.app.get_connection')
+    @patch('car.search_text_car.app.handle_response_success')
+    def test_lambda_handler_natural_mode(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [[ROW], [(1, 'http://example.com/1.jpg')]]
+
+        lambda_handler({'queryStringParameters': {'q': ' toyota familiar '}}, {})
+
+        query, params = mock_cursor.execute.call_args_list[0][0]
+        self.assertEqual(query.count('AGAINST (%s IN NATURAL LANGUAGE MODE)'), 2)
+        self.assertIn('ORDER BY score DESC, a.id_auto ASC', query)
+        self.assertEqual(params, ('toyota familiar', 'toyota familiar', 21, 0))
+
+        args = mock_handle_response_success.call_args[0]
+        self.assertEqual(args[2][0]['score'], 7.1235)
+        self.assertEqual(args[2][0]['images'], ['http://example.com/1.jpg'])
+        self.assertEqual(args[3], {'next_cursor': None})
+
+    @patch('car.search_text_car.app.get_connection')
+    @patch('car.search_text_car.app.handle_response_success')
+    def test_lambda_handler_boolean_mode_next_page(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        rows = [(id_auto,) + ROW[1:] for id_auto in (1, 2, 3)]
+        mock_cursor.fetchall.side_effect = [rows, []]
+
+        event = {'queryStringParameters': {'q': '+toyota -diesel', 'mode': 'boolean', 'limit': '2',
+                                           'after': encode_cursor(4)}}
+        lambda_handler(event, {})
+
+        query, params = mock_cursor.execute.call_args_list[0][0]
+        self.assertIn('IN BOOLEAN MODE', query)
+        self.assertEqual(params, ('+toyota -diesel', '+toyota -diesel', 3, 4))
+
+        args = mock_handle_response_success.call_args[0]
+        self.assertEqual([car['id_auto'] for car in args[2]], [1, 2])
+        self.assertEqual(decode_cursor(args[3]['next_cursor']), 6)
+
+    @patch('car.search_text_car.app.get_connection')
+    @patch('car.search_text_car.app.handle_response')
+    def test_lambda_handler_invalid_parameters(self, mock_handle_response, mock_get_connection):
+        cases = (
+            ({}, 'Falta el parámetro q.'),
+            ({'q': 'x' * 201}, 'El parámetro q no debe exceder los 200 caracteres.'),
+            ({'q': 'toyota', 'mode': 'regex'}, 'El parámetro mode debe ser natural o boolean.'),
+            ({'q': 'toyota', 'limit': '101'}, 'El parámetro limit debe ser un entero entre 1 y 100.'),
+            ({'q': 'toyota', 'after': 'nope'}, 'El parámetro after no es un cursor válido.'),
+        )
+        for params, message in cases:
+            lambda_handler({'queryStringParameters': params}, {})
+            mock_handle_response.assert_called_with(ANY, message, 400)
+
+        mock_get_connection.assert_not_called()
+
+    @patch('car.search_text_car.app.get_connection')
+    @patch('car.search_text_car.app.handle_response')
+    def test_lambda_handler_query_error(self, mock_handle_response, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_connection.cursor.return_value.__enter__.return_value.execute.side_effect = Exception('DB error')
+
+        lambda_handler({'queryStringParameters': {'q': 'toyota'}}, {})
+
+        mock_handle_response.assert_called_once_with(ANY, 'Ocurrió un error al buscar autos.', 500)
+        mock_connection.close.assert_called_once()
+
+    @patch('car.search_text_car.app.get_connection')
+    def test_lambda_handler_boolean_syntax_error(self, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_connection.cursor.return_value.__enter__.return_value.execute.side_effect = \
+            pymysql.err.ProgrammingError(1064, 'syntax error, unexpected $end')
+
+        response = lambda_handler({'queryStringParameters': {'q': '"toyota +', 'mode': 'boolean'}}, {})
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(json.loads(response['body'])['message'], 'La búsqueda contiene operadores no válidos.')
+
+        response = lambda_handler({'queryStringParameters': {'q': 'toyota'}}, {})
+
+        self.assertEqual(response['statusCode'], 500)
+
+    @patch('car.search_text_car.app.get_connection')
+    @patch('car.search_text_car.app.handle_response_success')
+    def test_lambda_handler_last_page_at_max_offset(self, mock_handle_response_success, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [[ROW] * 21, []]
+
+        lambda_handler({'queryStringParameters': {'q': 'toyota', 'after': encode_cursor(990)}}, {})
+
+        self.assertEqual(mock_cursor.execute.call_args_list[0][0][1][-1], 990)
+        self.assertEqual(mock_handle_response_success.call_args[0][3], {'next_cursor': None})
+
+    def test_decode_cursor_offset_bounds(self):
+        for offset in (-1, 1001):
+            with self.assertRaises(ValueError):
+                decode_cursor(encode_cursor(offset))
+
+        self.assertEqual(decode_cursor(encode_cursor(1000)), 1000)
+
+    # Test for connection.py
+
+    @patch('car.search_text_car.connection.boto3.session.Session.client')
+    def test_get_secret(self, mock_boto_client):
+        mock_client = mock_boto_client.return_value
+        mock_client.get_secret_value.return_value = {
+            'SecretString': json.dumps({'HOST': 'test_host', 'USERNAME': 'test_user'})
+        }
+
+        secret = get_secret()
+
+        self.assertEqual(secret['HOST'], 'test_host')
+        self.assertEqual(secret['USERNAME'], 'test_user')
+
+    @patch('car.search_text_car.connection.boto3.session.Session.client')
+    def test_get_secret_client_error(self, mock_client):
+        mock_client.return_value.get_secret_value.side_effect = ClientError(
+            {'Error': {'Code': 'ResourceNotFoundException', 'Message': 'Secret not found'}}, 'GetSecretValue')
+
+        with self.assertRaises(ClientError):
+            get_secret()
+
+    @patch('car.search_text_car.connection.pymysql.connect')
+    @patch('car.search_text_car.connection.get_secret')
+    def test_get_connection_exception(self, mock_get_secret, mock_connect):
+        mock_get_secret.return_value = {'HOST': 'h', 'USERNAME': 'u', 'PASSWORD': 'p', 'DB_NAME': 'd'}
+        mock_connect.side_effect = pymysql.MySQLError('Connection error')
+
+        with self.assertRaises(pymysql.MySQLError):
+            get_connection()
+
+    def test_handle_response(self):
+        response = handle_response('TestError', 'TestMessage', 400)
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(response['headers'], headers_cors)
+        self.assertEqual(json.loads(response['body'])['error'], 'TestError')
+
+    def test_handle_response_success_extra(self):
+        response = handle_response_success(200, 'TestMessage', [], {'next_cursor': 'abc'})
+
+        self.assertEqual(json.loads(response['body']), {'statusCode': 200, 'message': 'TestMessage', 'data': [],
+                                                        'next_cursor': 'abc'})
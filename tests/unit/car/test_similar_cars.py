@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+from decimal import Decimal
+from car.similar_cars.app import lambda_handler, FEATURES_QUERY
+from car.similar_cars.feature_matrix import feature_matrix, FeatureMatrix
+from car.similar_cars.connection import clear_secret_cache, discard_connection
+
+ROWS = [
+    (1, 'Toyota', 'Corolla', 2020, Decimal('250000.00'), 4, Decimal('1.40'), Decimal('1.70'), Decimal('4.60'),
+     'Gasolina', 'Sedán', Decimal('4.5000')),
+    (2, 'Honda', 'Civic', 2021, Decimal('270000.00'), 4, Decimal('1.40'), Decimal('1.75'), Decimal('4.60'),
+     'Gasolina', 'Sedán', Decimal('4.2000')),
+    (3, 'Toyota', 'RAV4', 2022, Decimal('450000.00'), 5, Decimal('1.70'), Decimal('1.85'), Decimal('4.60'),
+     'Híbrido', 'SUV', None),
+    (4, 'Nissan', 'Sentra', 2020, Decimal('250000.00'), 4, Decimal('1.40'), Decimal('1.70'), Decimal('4.60'),
+     'Gasolina', 'Sedán', Decimal('4.5000')),
+    (5, 'BMW', 'X5', 2023, Decimal('1500000.00'), 5, None, Decimal('2.00'), Decimal('4.90'), 'Diésel', 'SUV', None)
+]
+
+
+def build_cars(rows):
+    fields = ('id_auto', 'brand', 'model', 'year', 'price', 'doors', 'height', 'width', 'length', 'fuel', 'type',
+              'average_rating')
+    return [dict(zip(fields, row)) for row in rows]
+
+
+class TestSimilarCars(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+        feature_matrix.build(None, [])
+
+    def test_feature_matrix_nearest(self):
+        matrix = FeatureMatrix(5)
+        matrix.build(1, build_cars(ROWS))
+
+        neighbours = matrix.nearest(1, 3)
+
+        self.assertEqual([car['id_auto'] for car, _ in neighbours], [4, 2, 3])
+        self.assertEqual(neighbours[0][1], 0.0)
+        self.assertLess(neighbours[1][1], neighbours[2][1])
+        self.assertEqual(matrix.matrix.shape, (5, 7 + 3 + 2))
+
+    def test_feature_matrix_edge_cases(self):
+        matrix = FeatureMatrix(5)
+        matrix.build(1, build_cars(ROWS))
+
+        self.assertIsNone(matrix.nearest(99, 3))
+        self.assertEqual(len(matrix.nearest(5, 20)), 4)
+        self.assertNotIn(5, [car['id_auto'] for car, _ in matrix.nearest(5, 20)])
+
+        matrix.build(2, build_cars(ROWS[:1]))
+        self.assertEqual(matrix.nearest(1, 3), [])
+
+        matrix.build(3, [])
+        self.assertIsNone(matrix.nearest(1, 3))
+
+    @patch('car.similar_cars.app.get_connection')
+    @patch('car.similar_cars.app.handle_response')
+    def test_lambda_handler_invalid_parameters(self, mock_handle_response, mock_get_connection):
+        cases = [
+            ({}, 'Falta un parametro.'),
+            ({'id_auto': 'x'}, 'Falta un parametro.'),
+            ({'id_auto': '1', 'k': '0'}, 'El parámetro k debe ser un entero entre 1 y 20.'),
+            ({'id_auto': '1', 'k': '21'}, 'El parámetro k debe ser un entero entre 1 y 20.')
+        ]
+        for query_params, message in cases:
+            lambda_handler({'queryStringParameters': query_params}, None)
+
+            self.assertEqual(mock_handle_response.call_args[0][1:], (message, 400))
+
+        mock_get_connection.assert_not_called()
+
+    @patch('car.similar_cars.app.get_connection')
+    @patch('car.similar_cars.app.release_connection')
+    @patch('car.similar_cars.app.handle_response_success')
+    def test_lambda_handler_success(self, mock_handle_response_success, mock_release_connection, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (8,)
+        mock_cursor.fetchall.side_effect = [
+            ROWS,
+            [(4, 'http://example.com/4a.jpg'), (4, 'http://example.com/4b.jpg')],
+            []
+        ]
+
+        lambda_handler({'queryStringParameters': {'id_auto': '1', 'k': '2'}}, None)
+        lambda_handler({'queryStringParameters': {'id_auto': '3', 'k': '1'}}, None)
+
+        self.assertEqual(mock_cursor.fetchone.call_count, 1)
+        mock_cursor.execute.assert_any_call(FEATURES_QUERY, (3,))
+        self.assertIn('WHERE a.id_status = %s', FEATURES_QUERY)
+        first, second = mock_handle_response_success.call_args_list
+        self.assertEqual(first[0][1], 'Autos similares obtenidos correctamente.')
+        self.assertEqual(first[0][2][0], {
+            'id_auto': 4, 'brand': 'Nissan', 'model': 'Sentra', 'year': 2020, 'price': 250000.0, 'fuel': 'Gasolina',
+            'type': 'Sedán', 'average_rating': 4.5, 'cover_image': 'http://example.com/4a.jpg', 'distance': 0.0
+        })
+        self.assertEqual(first[0][2][1]['id_auto'], 2)
+        self.assertEqual(first[0][2][1]['cover_image'], None)
+        self.assertEqual(len(second[0][2]), 1)
+        self.assertEqual(feature_matrix.version, 8)
+
+    @patch('car.similar_cars.app.get_connection')
+    @patch('car.similar_cars.app.release_connection')
+    @patch('car.similar_cars.app.handle_response')
+    def test_lambda_handler_unknown_car(self, mock_handle_response, mock_release_connection, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (1,)
+        mock_cursor.fetchall.return_value = ROWS
+
+        lambda_handler({'queryStringParameters': {'id_auto': '99'}}, None)
+
+        mock_handle_response.assert_called_once_with(None, 'El auto no existe.', 404)
+        mock_release_connection.assert_called_once_with(mock_get_connection.return_value)
+
+    @patch('car.similar_cars.app.get_connection')
+    @patch('car.similar_cars.app.handle_response')
+    def test_lambda_handler_database_error(self, mock_handle_response, mock_get_connection):
+        error = Exception('DB error')
+        mock_get_connection.side_effect = error
+
+        lambda_handler({'queryStringParameters': {'id_auto': '1'}}, None)
+
+        mock_handle_response.assert_called_once_with(error, 'Ocurrió un error al obtener los autos similares.', 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
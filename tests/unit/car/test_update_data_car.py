@@ -4,12 +4,16 @@ import pymysql
 import base64
 import json
 from car.update_data_car.app import lambda_handler, update_car, get_existing_image_urls
-from car.update_data_car.connection import get_connection, handle_response, headers_cors, get_secret, \
+from car.update_data_car.connection import get_connection, handle_response, headers_cors, get_secret, clear_secret_cache, discard_connection, \
     handle_response_success, get_jwt_claims
 from botocore.exceptions import ClientError
 
 
 class TestUpdateCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
     @patch('car.update_data_car.app.get_connection')
     def test_update_car_db_error(self, mock_get_connection):
         # Setup mocks
@@ -71,7 +75,7 @@ class TestUpdateCar(unittest.TestCase):
 
         # Check that the update query was executed
         mock_cursor.execute.assert_any_call(
-            "UPDATE auto SET model=%s, brand=%s, year=%s, price=%s, type=%s, fuel=%s, doors=%s, engine=%s, height=%s, width=%s, length=%s, description=%s WHERE id_auto=%s",
+            "UPDATE auto SET model=%s, brand=%s, year=%s, price=%s, type=%s, fuel=%s, doors=%s, engine=%s, height=%s, width=%s, length=%s, description=%s, updated_at=CURRENT_TIMESTAMP(6) WHERE id_auto=%s",
             (
             'Test Model', 'Test Brand', 2022, 25000.0, 'SUV', 'Gasoline', 4, 'V6', 1.5, 2.0, 4.5, 'Test Description', 1)
         )
@@ -88,6 +92,9 @@ class TestUpdateCar(unittest.TestCase):
             ('existing_image2.jpg', 1)
         )
 
+        # Check that the catalog version was bumped
+        mock_cursor.execute.assert_called_with("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+
         # Ensure that the connection commit was called
         mock_connection.commit.assert_called_once()
     @patch('car.update_data_car.app.get_jwt_claims', return_value={"cognito:groups": ["AdminGroup"]})
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import patch, Mock, MagicMock
 from cognito.confirm_forgot_password.app import lambda_handler, confirm_password
-from cognito.confirm_forgot_password.database import get_secret, calculate_secret_hash, handle_response
+from cognito.confirm_forgot_password.database import get_secret, clear_secret_cache, calculate_secret_hash, handle_response
 from botocore.exceptions import ClientError
 import hmac
 import hashlib
@@ -12,6 +12,9 @@ from botocore.stub import Stubber
 
 
 class TestConfirmForgotPassword(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+
     @patch('cognito.confirm_forgot_password.app.get_secret')
     def test_confirm_password_generic_exception(self, mock_get_secret):
         email = 'test@example.com'
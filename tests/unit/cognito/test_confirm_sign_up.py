@@ -3,12 +3,14 @@ from unittest.mock import patch, MagicMock
 import json
 import boto3
 from cognito.confirm_sign_up.app import lambda_handler, confirmation_registration, handle_response
-from cognito.confirm_sign_up.database import get_secret
+from cognito.confirm_sign_up.database import get_secret, clear_secret_cache
 from botocore.stub import Stubber
 from botocore.exceptions import ClientError
 
 
 class TestConfirmSignUp(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
 
     @patch('cognito.confirm_sign_up.app.get_secret')
     @patch('cognito.confirm_sign_up.app.calculate_secret_hash')
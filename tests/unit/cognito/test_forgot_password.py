@@ -2,13 +2,15 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 from cognito.forgot_password.app import lambda_handler, forgot_pass, headers_cors
-from cognito.forgot_password.database import get_secret
+from cognito.forgot_password.database import get_secret, clear_secret_cache
 from botocore.exceptions import ClientError
 from botocore.stub import Stubber
 import boto3
 
 
 class TestForgotPassword(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
 
     @patch('cognito.forgot_password.app.get_secret')
     @patch('cognito.forgot_password.app.forgot_pass')
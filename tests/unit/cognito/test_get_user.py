@@ -3,13 +3,16 @@ from unittest.mock import patch, MagicMock, ANY
 import json
 import base64
 from cognito.get_user.app import lambda_handler, get_jwt_claims, get_into_user
-from cognito.get_user.database import get_connection, close_connection, handle_response, get_secret, calculate_secret_hash
+from cognito.get_user.database import get_connection, close_connection, handle_response, get_secret, clear_secret_cache, discard_connection, calculate_secret_hash
 from botocore.exceptions import ClientError
 import hmac
 import hashlib
 
 
 class TestGetUser(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
 
     @patch('cognito.get_user.app.get_jwt_claims')
     @patch('cognito.get_user.app.get_into_user')
@@ -84,7 +87,7 @@ class TestGetUser(unittest.TestCase):
         self.assertIsNone(claims)
 
     @patch('cognito.get_user.app.get_connection')
-    @patch('cognito.get_user.app.close_connection')
+    @patch('cognito.get_user.app.release_connection')
     @patch('cognito.get_user.app.handle_response')
     def test_get_into_user_success(self, mock_handle_response, mock_close_connection, mock_get_connection):
         mock_connection = MagicMock()
@@ -114,7 +117,7 @@ class TestGetUser(unittest.TestCase):
         })
 
     @patch('cognito.get_user.app.get_connection')
-    @patch('cognito.get_user.app.close_connection')
+    @patch('cognito.get_user.app.release_connection')
     @patch('cognito.get_user.app.handle_response')
     def test_get_into_user_exception(self, mock_handle_response, mock_close_connection, mock_get_connection):
         # Simulación de conexión y cursor de la base de datos
@@ -133,7 +136,7 @@ class TestGetUser(unittest.TestCase):
                                                      500)
 
     @patch('cognito.get_user.app.get_connection')
-    @patch('cognito.get_user.app.close_connection')
+    @patch('cognito.get_user.app.release_connection')
     @patch('cognito.get_user.app.handle_response')
     def test_get_into_user_no_user(self, mock_handle_response, mock_close_connection, mock_get_connection):
         # Simulación de conexión y cursor de la base de datos
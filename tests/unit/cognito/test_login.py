@@ -2,13 +2,15 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 from cognito.login.app import lambda_handler, login_auth
-from cognito.login.database import get_secret
+from cognito.login.database import get_secret, clear_secret_cache
 import boto3
 from botocore.stub import Stubber
 from botocore.exceptions import ClientError
 
 
 class TestLogin(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
 
     @patch('cognito.login.app.get_secret')
     @patch('cognito.login.app.json.loads')
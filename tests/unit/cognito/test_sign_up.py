@@ -2,13 +2,17 @@ import unittest
 from unittest.mock import patch, MagicMock, Mock
 import json
 from cognito.sign_up.app import lambda_handler, register_user, insert_into_user
-from cognito.sign_up.database import get_secret, get_connection, handle_response
+from cognito.sign_up.database import get_secret, clear_secret_cache, discard_connection, get_connection, handle_response
 from botocore.exceptions import ClientError
 from botocore.stub import Stubber
 import boto3
 
 
 class TestSignUp(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
     @patch('cognito.sign_up.app.get_connection')
     @patch('cognito.sign_up.app.handle_response')
     def test_lambda_handler_missing_parameters(self, mock_handle_response, mock_get_connection):
@@ -2,11 +2,14 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 from rate.delete_data_rate.app import lambda_handler, update_rate_status
-from rate.delete_data_rate.connection import get_connection, handle_response, headers_cors, get_secret
+from rate.delete_data_rate.connection import get_connection, handle_response, headers_cors, get_secret, clear_secret_cache, discard_connection
 from botocore.exceptions import ClientError
 
 
 class TestLambdaHandler(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
 
     @patch('rate.delete_data_rate.app.get_connection')
     @patch('rate.delete_data_rate.app.handle_response')
@@ -72,12 +75,14 @@ class TestLambdaHandler(unittest.TestCase):
         mock_connection = MagicMock()
         mock_get_connection.return_value = mock_connection
         cursor = mock_connection.cursor.return_value.__enter__.return_value
-        cursor.fetchone.return_value = {'id_status': 2}
+        cursor.fetchone.side_effect = [{'id_status': 2}, (7, 4, 5)]
 
         response = update_rate_status(1, 2)
 
         cursor.execute.assert_any_call("SELECT * FROM status WHERE id_status=%s AND description='to_rate'", (2,))
         cursor.execute.assert_any_call("UPDATE rate SET id_status=%s WHERE id_rate=%s", (2, 1))
+        cursor.execute.assert_any_call(unittest.mock.ANY, (7, -1, -4, 0, 0, 0, -1, 0))
+        cursor.execute.assert_called_with("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
         mock_connection.commit.assert_called_once()
         mock_connection.close.assert_called_once()
 
@@ -95,6 +100,33 @@ class TestLambdaHandler(unittest.TestCase):
         }
         self.assertEqual(response, expected_response)
 
+    @patch('rate.delete_data_rate.app.get_connection')
+    def test_update_rate_status_reactivates_review(self, mock_get_connection):
+        mock_connection = MagicMock()
+        mock_get_connection.return_value = mock_connection
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [{'id_status': 5}, (7, 2, 6)]
+
+        response = update_rate_status(1, 5)
+
+        self.assertEqual(response['statusCode'], 200)
+        summary_query, summary_params = cursor.execute.call_args_list[-2][0]
+        self.assertIn('INSERT INTO rate_summary', summary_query)
+        self.assertEqual(summary_params, (7, 1, 2, 0, 1, 0, 0, 0))
+        mock_connection.commit.assert_called_once()
+
+    @patch('rate.delete_data_rate.app.get_connection')
+    def test_update_rate_status_same_state(self, mock_get_connection):
+        mock_connection = MagicMock()
+        mock_get_connection.return_value = mock_connection
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [{'id_status': 6}, (7, 2, 6)]
+
+        update_rate_status(1, 6)
+
+        self.assertEqual(cursor.execute.call_count, 3)
+        mock_connection.commit.assert_called_once()
+
     @patch('rate.delete_data_rate.app.get_connection')
     @patch('rate.delete_data_rate.app.handle_response')
     def test_update_rate_status_exception(self, mock_handle_response, mock_get_connection):
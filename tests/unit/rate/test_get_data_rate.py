@@ -1,12 +1,18 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import json
-from rate.get_data_rate.app import lambda_handler, get_connection, handle_response, headers_cors
-from rate.get_data_rate.database import get_secret
+import gzip
+import base64
+import pymysql
+from rate.get_data_rate.app import lambda_handler, get_connection, handle_response, headers_cors, encode_rates
+from rate.get_data_rate.database import get_secret, clear_secret_cache, discard_connection
 from botocore.exceptions import ClientError
 
 
 class TestGetRate(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
 
     @patch('rate.get_data_rate.app.get_connection')
     @patch('rate.get_data_rate.app.handle_response')
@@ -14,9 +20,9 @@ class TestGetRate(unittest.TestCase):
         mock_connection = MagicMock()
         mock_cursor = MagicMock()
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_cursor.fetchall.return_value = [
+        mock_cursor.fetchall_unbuffered.return_value = iter([
             (1, 5, 'Great car!', 'Model S', 'Tesla', 'John', 'Doe', 101, 'profile.jpg', 'active')
-        ]
+        ])
         mock_get_connection.return_value = mock_connection
 
         event = {}
@@ -47,6 +53,91 @@ class TestGetRate(unittest.TestCase):
         self.assertEqual(response['headers']['Access-Control-Allow-Origin'], '*')
         self.assertEqual(json.loads(response['body']), expected_body)
 
+    @patch('rate.get_data_rate.app.get_connection')
+    def test_lambda_handler_not_modified(self, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (12, 4)
+
+        response = lambda_handler({'headers': {'If-None-Match': '"rates-12-4"'}}, {})
+
+        self.assertEqual(response['statusCode'], 304)
+        self.assertEqual(response['body'], '')
+        self.assertEqual(response['headers']['ETag'], '"rates-12-4"')
+        mock_cursor.fetchall_unbuffered.assert_not_called()
+
+    @patch('rate.get_data_rate.app.get_connection')
+    def test_lambda_handler_returns_etag(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (13, 4)
+        mock_cursor.fetchall_unbuffered.return_value = iter([])
+
+        response = lambda_handler({'headers': {'If-None-Match': '"rates-12-4"'}}, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers']['ETag'], '"rates-13-4"')
+        self.assertEqual(response['headers']['Access-Control-Expose-Headers'], 'ETag')
+
+    @patch('rate.get_data_rate.app.get_connection')
+    def test_lambda_handler_compressed(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (13, 4)
+        mock_cursor.fetchall_unbuffered.return_value = (
+            (i, 5, 'Great car!', 'Model S', 'Tesla', 'John', 'Doe', 101, 'profile.jpg', 'active') for i in range(50)
+        )
+
+        response = lambda_handler({'headers': {'accept-encoding': 'gzip'}}, {})
+
+        self.assertTrue(response['isBase64Encoded'])
+        self.assertEqual(response['headers']['ETag'], '"rates-13-4"')
+        body = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+        self.assertEqual(len(body['data']), 50)
+
+    @patch('rate.get_data_rate.app.get_connection')
+    def test_lambda_handler_sparse_fields(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (13, 4)
+        mock_cursor.fetchall_unbuffered.return_value = iter([(1, 5, 101)])
+
+        response = lambda_handler({'queryStringParameters': {'fields': 'id_rate,value,id_auto'}}, {})
+
+        query = mock_cursor.execute.call_args[0][0]
+        self.assertTrue(query.startswith('SELECT r.id_rate, r.value, a.id_auto FROM rate r'))
+        self.assertEqual(json.loads(response['body'])['data'], [{'id_rate': 1, 'value': 5, 'id_auto': 101}])
+        self.assertEqual(response['headers']['ETag'], '"rates-13-4-id_rate+value+id_auto"')
+
+    @patch('rate.get_data_rate.app.get_connection')
+    def test_lambda_handler_streams_with_unbuffered_cursor(self, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (13, 4)
+        mock_cursor.fetchall_unbuffered.return_value = iter([(1, 5), (2, 4)])
+
+        response = lambda_handler({'queryStringParameters': {'fields': 'id_rate,value'}}, {})
+
+        mock_connection.cursor.assert_called_with(pymysql.cursors.SSCursor)
+        mock_cursor.fetchall.assert_not_called()
+        self.assertEqual(json.loads(response['body'])['data'], [{'id_rate': 1, 'value': 5}, {'id_rate': 2, 'value': 4}])
+
+    def test_encode_rates_matches_json_dumps(self):
+        rows = [(1, 'Excelente ñ "auto"'), (2, None)]
+        expected = json.dumps({
+            'statusCode': 200,
+            "message": "Reseñas obtenidas correctamente.",
+            "data": [{'id_rate': 1, 'comment': 'Excelente ñ "auto"'}, {'id_rate': 2, 'comment': None}]
+        })
+
+        self.assertEqual(encode_rates(iter(rows), ['id_rate', 'comment']), expected)
+        self.assertEqual(json.loads(encode_rates(iter([]), ['id_rate']))['data'], [])
+
+    @patch('rate.get_data_rate.app.get_connection')
+    def test_lambda_handler_invalid_fields(self, mock_get_connection):
+        response = lambda_handler({'queryStringParameters': {'fields': 'email'}}, {})
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertIn('email', json.loads(response['body'])['message'])
+        mock_get_connection.assert_not_called()
+
     @patch('rate.get_data_rate.app.get_connection')
     @patch('rate.get_data_rate.app.handle_response')
     def test_lambda_handler_exception(self, mock_handle_response, mock_get_connection):
@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import patch
+import json
+import base64
+from datetime import datetime
+from rate.get_my_rates.app import lambda_handler, encode_cursor, decode_cursor, get_jwt_claims
+from rate.get_my_rates.connection import clear_secret_cache, discard_connection
+
+T1 = datetime(2026, 10, 2, 9, 30)
+T2 = datetime(2026, 10, 1, 18, 0)
+
+ROWS = [
+    (12, 5, 'Excelente', T1, 7, 'Honda', 'Civic', 2020, 'Activo'),
+    (11, 2, 'Malo', T2, 3, 'Ford', 'Focus', 2018, 'Inactivo'),
+    (10, 4, 'Bueno', T2, 4, 'Mazda', '3', 2019, 'Activo')
+]
+
+EVENT = {'headers': {'Authorization': 'token'}}
+
+
+class TestGetMyRates(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    def test_get_jwt_claims(self):
+        payload = base64.b64encode(json.dumps({'cognito:username': 'user-1'}).encode('utf-8')).decode('utf-8')
+
+        self.assertEqual(get_jwt_claims(f'header.{payload}.signature'), {'cognito:username': 'user-1'})
+
+        with self.assertRaises(ValueError):
+            get_jwt_claims('token')
+
+    @patch('rate.get_my_rates.app.get_connection')
+    def test_lambda_handler_invalid_token(self, mock_get_connection):
+        response = lambda_handler({'headers': {}}, None)
+        self.assertEqual(response['statusCode'], 401)
+
+        response = lambda_handler({'headers': {'Authorization': 'token'}}, None)
+        self.assertEqual(response['statusCode'], 401)
+        self.assertEqual(json.loads(response['body'])['message'], 'Error al decodificar token.')
+
+        mock_get_connection.assert_not_called()
+
+    @patch('rate.get_my_rates.app.get_jwt_claims')
+    @patch('rate.get_my_rates.app.get_connection')
+    def test_lambda_handler_invalid_parameters(self, mock_get_connection, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = {'cognito:username': 'user-1'}
+        cases = [
+            ({'limit': '101'}, 'El parámetro limit debe ser un entero entre 1 y 100.'),
+            ({'after': '%%%'}, 'El parámetro after no es un cursor válido.')
+        ]
+        for query_params, message in cases:
+            response = lambda_handler({**EVENT, 'queryStringParameters': query_params}, None)
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])['message'], message)
+
+        mock_get_connection.assert_not_called()
+
+    @patch('rate.get_my_rates.app.get_jwt_claims')
+    @patch('rate.get_my_rates.app.get_connection')
+    def test_lambda_handler_first_page(self, mock_get_connection, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = {'cognito:username': 'user-1'}
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = ROWS
+
+        response = lambda_handler({**EVENT, 'queryStringParameters': {'limit': '2'}}, None)
+
+        mock_cursor.execute.assert_called_once()
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('WHERE u.id_cognito = %s ORDER BY r.created_at DESC, r.id_rate DESC LIMIT %s',
+                      ' '.join(query.split()))
+        self.assertEqual(params, ['user-1', 3])
+
+        body = json.loads(response['body'])
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(body['data'], [
+            {'id_rate': 12, 'value': 5, 'comment': 'Excelente', 'created_at': '2026-10-02T09:30:00',
+             'id_auto': 7, 'brand': 'Honda', 'model': 'Civic', 'year': 2020, 'status': 'Activo'},
+            {'id_rate': 11, 'value': 2, 'comment': 'Malo', 'created_at': '2026-10-01T18:00:00',
+             'id_auto': 3, 'brand': 'Ford', 'model': 'Focus', 'year': 2018, 'status': 'Inactivo'}
+        ])
+        self.assertEqual(decode_cursor(body['next_cursor']), (T2, 11))
+
+    @patch('rate.get_my_rates.app.get_jwt_claims')
+    @patch('rate.get_my_rates.app.get_connection')
+    def test_lambda_handler_next_page(self, mock_get_connection, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = {'cognito:username': 'user-1'}
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = ROWS[2:]
+
+        response = lambda_handler({**EVENT, 'queryStringParameters': {'after': encode_cursor(T2, 11)}}, None)
+
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('AND (r.created_at < %s OR (r.created_at = %s AND r.id_rate < %s))', query)
+        self.assertEqual(params, ['user-1', T2, T2, 11, 21])
+
+        body = json.loads(response['body'])
+        self.assertEqual([rate['id_rate'] for rate in body['data']], [10])
+        self.assertIsNone(body['next_cursor'])
+
+    @patch('rate.get_my_rates.app.get_jwt_claims')
+    @patch('rate.get_my_rates.app.get_connection')
+    def test_lambda_handler_database_error(self, mock_get_connection, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = {'cognito:username': 'user-1'}
+        mock_get_connection.return_value.cursor.return_value.__enter__.return_value.execute.side_effect = \
+            Exception('DB error')
+
+        response = lambda_handler(EVENT, None)
+
+        self.assertEqual(response['statusCode'], 500)
+        self.assertEqual(json.loads(response['body'])['message'], 'Ocurrió un error al obtener las reseñas')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,14 +2,17 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 from rate.get_one_data_rate.app import lambda_handler, get_connection, handle_response
-from rate.get_one_data_rate.database import headers_cors, get_secret, execute_query, close_connection
+from rate.get_one_data_rate.database import headers_cors, get_secret, clear_secret_cache, discard_connection, execute_query, close_connection
 from botocore.exceptions import ClientError
 
 
 class TestGetOneRate(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
 
     @patch('rate.get_one_data_rate.app.get_connection')
-    @patch('rate.get_one_data_rate.app.close_connection')
+    @patch('rate.get_one_data_rate.app.release_connection')
     @patch('rate.get_one_data_rate.app.execute_query')
     @patch('rate.get_one_data_rate.app.handle_response')
     def test_lambda_handler_success(self, mock_handle_response, mock_execute_query, mock_close_connection,
@@ -38,7 +41,7 @@ class TestGetOneRate(unittest.TestCase):
         self.assertEqual(response_body['data'][0]['id_rate'], 1)
 
     @patch('rate.get_one_data_rate.app.get_connection')
-    @patch('rate.get_one_data_rate.app.close_connection')
+    @patch('rate.get_one_data_rate.app.release_connection')
     @patch('rate.get_one_data_rate.app.execute_query')
     @patch('rate.get_one_data_rate.app.handle_response')
     def test_lambda_handler_no_id_auto(self, mock_handle_response, mock_execute_query, mock_close_connection,
@@ -62,7 +65,7 @@ class TestGetOneRate(unittest.TestCase):
         self.assertEqual(response_body['message'], 'Faltan parámetros.')
 
     @patch('rate.get_one_data_rate.app.get_connection')
-    @patch('rate.get_one_data_rate.app.close_connection')
+    @patch('rate.get_one_data_rate.app.release_connection')
     @patch('rate.get_one_data_rate.app.execute_query')
     @patch('rate.get_one_data_rate.app.handle_response')
     def test_lambda_handler_exception(self, mock_handle_response, mock_execute_query, mock_close_connection,
@@ -92,7 +95,7 @@ class TestGetOneRate(unittest.TestCase):
         self.assertEqual(response_body['message'], 'Ocurrió un error al obtener la reseña.')
 
     @patch('rate.get_one_data_rate.app.get_connection')
-    @patch('rate.get_one_data_rate.app.close_connection')
+    @patch('rate.get_one_data_rate.app.release_connection')
     @patch('rate.get_one_data_rate.app.execute_query')
     @patch('rate.get_one_data_rate.app.handle_response')
     def test_lambda_handler_body(self, mock_handle_response, mock_execute_query, mock_close_connection,
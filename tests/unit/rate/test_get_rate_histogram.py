@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+import json
+from rate.get_rate_histogram.app import lambda_handler
+from rate.get_rate_histogram.connection import clear_secret_cache, discard_connection
+
+
+class TestGetRateHistogram(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    @patch('rate.get_rate_histogram.app.get_connection')
+    def test_lambda_handler_missing_id_auto(self, mock_get_connection):
+        response = lambda_handler({'queryStringParameters': None}, None)
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(json.loads(response['body'])['message'], 'Debe proporcionar el parámetro id_auto')
+        mock_get_connection.assert_not_called()
+
+    @patch('rate.get_rate_histogram.app.get_connection')
+    def test_lambda_handler_success(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchone.return_value = (6, 25, 0, 1, 0, 2, 3)
+
+        response = lambda_handler({'queryStringParameters': {'id_auto': '4'}}, None)
+
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT rate_count, rate_sum, star_1, star_2, star_3, star_4, star_5 FROM rate_summary WHERE id_auto = %s",
+            (4,))
+        self.assertEqual(json.loads(response['body'])['data'], {
+            'id_auto': 4,
+            'rate_count': 6,
+            'average_rating': 4.17,
+            'histogram': {'1': 0, '2': 1, '3': 0, '4': 2, '5': 3}
+        })
+
+    @patch('rate.get_rate_histogram.app.get_connection')
+    def test_lambda_handler_without_reviews(self, mock_get_connection):
+        mock_get_connection.return_value.cursor.return_value.__enter__.return_value.fetchone.return_value = None
+
+        response = lambda_handler({'queryStringParameters': {'id_auto': '9'}}, None)
+
+        self.assertEqual(json.loads(response['body'])['data'], {
+            'id_auto': 9,
+            'rate_count': 0,
+            'average_rating': 0,
+            'histogram': {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0}
+        })
+
+    @patch('rate.get_rate_histogram.app.get_connection')
+    def test_lambda_handler_database_error(self, mock_get_connection):
+        mock_get_connection.return_value.cursor.return_value.__enter__.return_value.execute.side_effect = \
+            Exception('DB error')
+
+        response = lambda_handler({'queryStringParameters': {'id_auto': '4'}}, None)
+
+        self.assertEqual(response['statusCode'], 500)
+        self.assertEqual(json.loads(response['body'])['message'], 'Ocurrió un error al obtener las calificaciones')
+
+
+if __name__ == '__main__':
+    unittest.main()
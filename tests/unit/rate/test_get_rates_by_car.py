@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch
+import json
+from datetime import datetime
+from rate.get_rates_by_car.app import lambda_handler, encode_cursor, decode_cursor
+from rate.get_rates_by_car.connection import clear_secret_cache, discard_connection
+
+T1 = datetime(2026, 10, 2, 9, 30, 0, 500000)
+T2 = datetime(2026, 10, 1, 18, 0, 0)
+
+ROWS = [
+    (12, 5, 'Excelente', T1, 'Ana', 'López', 'ana.jpg'),
+    (11, 4, 'Muy bueno', T2, 'Luis', 'Pérez', None),
+    (10, 3, 'Regular', T2, 'Eva', 'Ruiz', None)
+]
+
+
+class TestGetRatesByCar(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(T1, 12)), (T1, 12))
+
+    @patch('rate.get_rates_by_car.app.get_connection')
+    def test_lambda_handler_invalid_parameters(self, mock_get_connection):
+        cases = [
+            ({}, 'Debe proporcionar el parámetro id_auto'),
+            ({'id_auto': 'x'}, 'Debe proporcionar el parámetro id_auto'),
+            ({'id_auto': '1', 'limit': '101'}, 'El parámetro limit debe ser un entero entre 1 y 100.'),
+            ({'id_auto': '1', 'after': '%%%'}, 'El parámetro after no es un cursor válido.')
+        ]
+        for query_params, message in cases:
+            response = lambda_handler({'queryStringParameters': query_params}, None)
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])['message'], message)
+
+        mock_get_connection.assert_not_called()
+
+    @patch('rate.get_rates_by_car.app.get_connection')
+    def test_lambda_handler_first_page(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = ROWS
+
+        response = lambda_handler({'queryStringParameters': {'id_auto': '7', 'limit': '2'}}, None)
+
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('WHERE r.id_auto = %s AND r.id_status = %s ORDER BY r.created_at DESC, r.id_rate DESC LIMIT %s',
+                      ' '.join(query.split()))
+        self.assertEqual(params, [7, 5, 3])
+
+        body = json.loads(response['body'])
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual([rate['id_rate'] for rate in body['data']], [12, 11])
+        self.assertEqual(body['data'][0], {
+            'id_rate': 12, 'value': 5, 'comment': 'Excelente', 'created_at': '2026-10-02T09:30:00.500000',
+            'name': 'Ana', 'lastname': 'López', 'profile_image': 'ana.jpg'
+        })
+        self.assertEqual(decode_cursor(body['next_cursor']), (T2, 11))
+
+    @patch('rate.get_rates_by_car.app.get_connection')
+    def test_lambda_handler_next_page(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = ROWS[2:]
+
+        response = lambda_handler({'queryStringParameters': {'id_auto': '7', 'after': encode_cursor(T2, 11)}}, None)
+
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('AND (r.created_at < %s OR (r.created_at = %s AND r.id_rate < %s))', query)
+        self.assertEqual(params, [7, 5, T2, T2, 11, 21])
+
+        body = json.loads(response['body'])
+        self.assertEqual([rate['id_rate'] for rate in body['data']], [10])
+        self.assertIsNone(body['next_cursor'])
+
+    @patch('rate.get_rates_by_car.app.get_connection')
+    def test_lambda_handler_database_error(self, mock_get_connection):
+        mock_get_connection.return_value.cursor.return_value.__enter__.return_value.execute.side_effect = \
+            Exception('DB error')
+
+        response = lambda_handler({'queryStringParameters': {'id_auto': '7'}}, None)
+
+        self.assertEqual(response['statusCode'], 500)
+        self.assertEqual(json.loads(response['body'])['message'], 'Ocurrió un error al obtener las reseñas')
+
+
+if __name__ == '__main__':
+    unittest.main()
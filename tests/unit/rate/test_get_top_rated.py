@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch
+import json
+from decimal import Decimal
+from rate.get_top_rated.app import lambda_handler, TOP_RATED_QUERY
+from rate.get_top_rated.connection import clear_secret_cache, discard_connection
+
+
+class TestGetTopRated(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    @patch('rate.get_top_rated.app.get_connection')
+    def test_lambda_handler_invalid_limit(self, mock_get_connection):
+        for limit in ('0', '51', 'abc'):
+            response = lambda_handler({'queryStringParameters': {'limit': limit}}, None)
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])['message'],
+                             'El parámetro limit debe ser un entero entre 1 y 50.')
+
+        mock_get_connection.assert_not_called()
+
+    @patch('rate.get_top_rated.app.get_connection')
+    def test_lambda_handler_success(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = [
+            (3, 'Toyota', 'Corolla', 2020, 40, Decimal('4.6000'), Decimal('4.55123')),
+            (8, 'Tesla', 'Model 3', 2022, 1, Decimal('5.0000'), Decimal('4.08333'))
+        ]
+
+        response = lambda_handler({'queryStringParameters': None}, None)
+
+        mock_cursor.execute.assert_called_once_with(TOP_RATED_QUERY, (5.0, 5.0, 3, 10))
+        self.assertEqual(json.loads(response['body'])['data'], [
+            {'id_auto': 3, 'brand': 'Toyota', 'model': 'Corolla', 'year': 2020, 'rate_count': 40,
+             'average_rating': 4.6, 'score': 4.5512},
+            {'id_auto': 8, 'brand': 'Tesla', 'model': 'Model 3', 'year': 2022, 'rate_count': 1,
+             'average_rating': 5.0, 'score': 4.0833}
+        ])
+
+    def test_top_rated_query_uses_bayesian_average(self):
+        self.assertIn('(%s * g.mean + rs.rate_sum) / (%s + rs.rate_count) AS score', TOP_RATED_QUERY)
+        self.assertIn('SELECT SUM(rate_sum) / SUM(rate_count) AS mean FROM rate_summary', TOP_RATED_QUERY)
+        self.assertNotIn('FROM rate ', TOP_RATED_QUERY)
+
+    @patch('rate.get_top_rated.app.get_connection')
+    def test_lambda_handler_database_error(self, mock_get_connection):
+        mock_get_connection.return_value.cursor.return_value.__enter__.return_value.execute.side_effect = \
+            Exception('DB error')
+
+        response = lambda_handler({'queryStringParameters': {'limit': '5'}}, None)
+
+        self.assertEqual(response['statusCode'], 500)
+        self.assertEqual(json.loads(response['body'])['message'],
+                         'Ocurrió un error al obtener los autos mejor calificados')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+from unittest.mock import patch
+import json
+from rate.import_data_rate.app import lambda_handler, parse_lines, INSERT_RATE_QUERY, UPDATE_SUMMARY_QUERY
+from rate.import_data_rate.database import clear_secret_cache, discard_connection
+
+ADMIN_CLAIMS = {'cognito:username': 'admin', 'cognito:groups': ['AdminUserGroup']}
+
+
+def ndjson(*reviews):
+    return '\n'.join(review if isinstance(review, str) else json.dumps(review) for review in reviews)
+
+
+class TestImportDataRate(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    def test_parse_lines(self):
+        reviews, errors = parse_lines([
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': 5, 'comment': 'Bien'}),
+            '',
+            '{no es json',
+            json.dumps({'id_cognito': 'u1', 'value': 5}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 'x', 'value': 5}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': 6}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': 4, 'comment': 'a' * 101}),
+            json.dumps(['u1', 1, 5]),
+            json.dumps({'id_cognito': 'u2', 'id_auto': '2', 'value': '3'})
+        ])
+
+        self.assertEqual(reviews, [
+            {'line': 1, 'id_cognito': 'u1', 'id_auto': 1, 'value': 5, 'comment': 'Bien'},
+            {'line': 9, 'id_cognito': 'u2', 'id_auto': 2, 'value': 3, 'comment': ''}
+        ])
+        self.assertEqual(errors, [
+            {'line': 3, 'error': 'JSON inválido.'},
+            {'line': 4, 'error': 'Faltan parámetros.'},
+            {'line': 5, 'error': 'El valor de la reseña y el auto deben ser números enteros.'},
+            {'line': 6, 'error': 'El valor de la reseña debe estar entre 1 y 5.'},
+            {'line': 7, 'error': 'El comentario no debe exceder los 100 caracteres.'},
+            {'line': 8, 'error': 'Faltan parámetros.'}
+        ])
+
+    def test_parse_lines_rejects_wrong_types(self):
+        reviews, errors = parse_lines([
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': 4.7}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1.9, 'value': 4}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': True}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': '4.7'}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': 4, 'comment': 5}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': 4, 'comment': ['Bien']}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': 4, 'comment': {'texto': 'Bien'}}),
+            json.dumps({'id_cognito': 'u1', 'id_auto': 1, 'value': 4, 'comment': None})
+        ])
+
+        self.assertEqual(reviews, [{'line': 8, 'id_cognito': 'u1', 'id_auto': 1, 'value': 4, 'comment': ''}])
+        self.assertEqual(errors, [
+            {'line': 1, 'error': 'El valor de la reseña y el auto deben ser números enteros.'},
+            {'line': 2, 'error': 'El valor de la reseña y el auto deben ser números enteros.'},
+            {'line': 3, 'error': 'El valor de la reseña y el auto deben ser números enteros.'},
+            {'line': 4, 'error': 'El valor de la reseña y el auto deben ser números enteros.'},
+            {'line': 5, 'error': 'El comentario debe ser texto.'},
+            {'line': 6, 'error': 'El comentario debe ser texto.'},
+            {'line': 7, 'error': 'El comentario debe ser texto.'}
+        ])
+
+    @patch('rate.import_data_rate.app.get_jwt_claims')
+    def test_lambda_handler_rejects_clients(self, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = {'cognito:groups': ['ClientUserGroup']}
+
+        response = lambda_handler({'headers': {'Authorization': 'token'}, 'body': ''}, None)
+
+        self.assertEqual(response['statusCode'], 401)
+        self.assertEqual(json.loads(response['body'])['message'], 'Acceso denegado.')
+
+    @patch('rate.import_data_rate.app.get_jwt_claims')
+    @patch('rate.import_data_rate.app.MAX_LINES', 2)
+    def test_lambda_handler_too_many_lines(self, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = ADMIN_CLAIMS
+
+        response = lambda_handler({'headers': {'Authorization': 'token'}, 'body': '{}\n{}\n{}'}, None)
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(json.loads(response['body'])['message'], 'No se pueden importar más de 2 reseñas a la vez.')
+
+    @patch('rate.import_data_rate.app.get_jwt_claims')
+    @patch('rate.import_data_rate.app.CHUNK_SIZE', 2)
+    @patch('rate.import_data_rate.database.get_connection')
+    def test_lambda_handler_imports_in_chunks(self, mock_get_connection, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = ADMIN_CLAIMS
+        mock_connection = mock_get_connection.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [
+            [('u1', 10), ('u2', 20)], [],  # usuarios
+            [(1,), (2,)], [],  # autos
+            [(20, 2)]  # reseñas existentes
+        ]
+        body = ndjson(
+            {'id_cognito': 'u1', 'id_auto': 1, 'value': 5, 'comment': 'Excelente'},
+            {'id_cognito': 'u2', 'id_auto': 1, 'value': 3},
+            {'id_cognito': 'u2', 'id_auto': 2, 'value': 4},
+            {'id_cognito': 'u3', 'id_auto': 1, 'value': 4},
+            {'id_cognito': 'u1', 'id_auto': 9, 'value': 4},
+            {'id_cognito': 'u1', 'id_auto': 1, 'value': 1},
+            'basura',
+            {'id_cognito': 'u1', 'id_auto': 2, 'value': 4}
+        )
+
+        response = lambda_handler({'headers': {'Authorization': 'token'}, 'body': body}, None)
+
+        body = json.loads(response['body'])
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(body['imported'], 3)
+        self.assertEqual(body['errors'], [
+            {'line': 3, 'error': 'El usuario ya ha reseñado este auto.'},
+            {'line': 4, 'error': 'El usuario no fue encontrado.'},
+            {'line': 5, 'error': 'El auto no fue encontrado.'},
+            {'line': 6, 'error': 'El usuario ya ha reseñado este auto.'},
+            {'line': 7, 'error': 'JSON inválido.'}
+        ])
+
+        mock_cursor.execute.assert_any_call("SELECT id_cognito, id_user FROM user WHERE id_cognito IN (%s, %s)",
+                                            ['u1', 'u2'])
+        mock_cursor.execute.assert_any_call("SELECT id_cognito, id_user FROM user WHERE id_cognito IN (%s)", ['u3'])
+        inserts = [call[0][1] for call in mock_cursor.executemany.call_args_list if call[0][0] == INSERT_RATE_QUERY]
+        self.assertEqual(inserts, [
+            [(5, 'Excelente', 1, 10, 5), (3, '', 1, 20, 5)],
+            [(4, '', 2, 10, 5)]
+        ])
+        summaries = [call[0][1] for call in mock_cursor.executemany.call_args_list
+                     if call[0][0] == UPDATE_SUMMARY_QUERY]
+        self.assertEqual(summaries, [[(1, 2, 8, 0, 0, 1, 0, 1), (2, 1, 4, 0, 0, 0, 1, 0)]])
+        mock_cursor.execute.assert_called_with("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+        mock_connection.commit.assert_called_once()
+
+    @patch('rate.import_data_rate.app.get_jwt_claims')
+    @patch('rate.import_data_rate.database.get_connection')
+    def test_lambda_handler_nothing_valid(self, mock_get_connection, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = ADMIN_CLAIMS
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+
+        response = lambda_handler({'headers': {'Authorization': 'token'}, 'body': 'x\ny'}, None)
+
+        body = json.loads(response['body'])
+        self.assertEqual(body['imported'], 0)
+        self.assertEqual(len(body['errors']), 2)
+        mock_cursor.execute.assert_not_called()
+        mock_cursor.executemany.assert_not_called()
+
+    @patch('rate.import_data_rate.app.get_jwt_claims')
+    @patch('rate.import_data_rate.database.get_connection')
+    def test_lambda_handler_database_error(self, mock_get_connection, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = ADMIN_CLAIMS
+        mock_connection = mock_get_connection.return_value
+        mock_connection.cursor.return_value.__enter__.return_value.execute.side_effect = Exception('DB error')
+
+        response = lambda_handler({
+            'headers': {'Authorization': 'token'},
+            'body': ndjson({'id_cognito': 'u1', 'id_auto': 1, 'value': 5})
+        }, None)
+
+        self.assertEqual(response['statusCode'], 500)
+        self.assertEqual(json.loads(response['body'])['message'], 'Error al importar las reseñas.')
+        mock_connection.commit.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
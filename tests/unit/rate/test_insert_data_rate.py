@@ -2,13 +2,18 @@ import unittest
 from unittest.mock import patch, MagicMock, ANY
 import json
 import base64
-from rate.insert_data_rate.app import lambda_handler, insert_into_rate, verify_user, verify_auto, check_existing_review, get_jwt_claims
-from rate.insert_data_rate.database import get_secret, get_connection, execute_query, close_connection, headers_cors, \
-    handle_response
+import pymysql
+from rate.insert_data_rate.app import lambda_handler, insert_into_rate, verify_user, get_jwt_claims
+from rate.insert_data_rate.database import get_secret, clear_secret_cache, discard_connection, get_connection, execute_query, close_connection, headers_cors, \
+    handle_response, UnitOfWork
 from botocore.exceptions import ClientError
 
 
 class TestInsertRate(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
     @patch('rate.insert_data_rate.app.get_jwt_claims')
     @patch('rate.insert_data_rate.app.handle_response')
     def test_invalid_token(self, mock_handle_response, mock_get_jwt_claims):
@@ -50,9 +55,9 @@ class TestInsertRate(unittest.TestCase):
         )
 
     @patch('rate.insert_data_rate.app.get_jwt_claims')
-    @patch('rate.insert_data_rate.app.get_connection')
+    @patch('rate.insert_data_rate.app.UnitOfWork')
     @patch('rate.insert_data_rate.app.handle_response')
-    def test_lambda_handler_invalid_value(self, mock_handle_response, mock_get_connection, mock_get_jwt_claims):
+    def test_lambda_handler_invalid_value(self, mock_handle_response, mock_unit_of_work, mock_get_jwt_claims):
         event = {'body': json.dumps({'value': 'invalid', 'comment': 'test', 'id_auto': 1, 'id_user': 1})}
         context = {}
         lambda_handler(event, context)
@@ -75,46 +80,50 @@ class TestInsertRate(unittest.TestCase):
         self.assertIn('El valor de la reseña debe estar entre 1 y 5.', body['message'])
 
     @patch('rate.insert_data_rate.app.get_jwt_claims')
-    @patch('rate.insert_data_rate.app.get_connection')
-    @patch('rate.insert_data_rate.app.verify_user', return_value=True)
-    @patch('rate.insert_data_rate.app.handle_response')
-    def test_error_getting_user_id(self, mock_handle_response, mock_verify_user, mock_get_connection, mock_get_jwt_claims):
-        mock_connection = MagicMock()
-        mock_connection.cursor.return_value.__enter__.return_value.execute.side_effect = Exception('DB error')
-        mock_get_connection.return_value = mock_connection
-        event = {
-            'headers': {'Authorization': 'valid_token'},
-            'body': json.dumps({'value': '5', 'comment': 'Good car', 'id_auto': '1'})
-        }
-        context = {}
-        lambda_handler(event, context)
-        mock_handle_response.assert_called_with(
-            unittest.mock.ANY, 'Error al obtener el id del usuario.', 500
-        )
+    @patch('rate.insert_data_rate.app.UnitOfWork')
+    def test_value_out_of_star_range(self, mock_unit_of_work, mock_get_jwt_claims):
+        for value in ['0', '6']:
+            event = {
+                'body': json.dumps({
+                    'value': value,
+                    'comment': 'Buen servicio',
+                    'id_auto': '123'
+                })
+            }
+            response = lambda_handler(event, {})
+            body = json.loads(response['body'])
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(body['message'], 'El valor de la reseña debe estar entre 1 y 5.')
+
+        mock_unit_of_work.assert_not_called()
 
     @patch('rate.insert_data_rate.app.get_jwt_claims')
-    @patch('rate.insert_data_rate.app.verify_user')
-    @patch('rate.insert_data_rate.app.get_connection')
+    @patch('rate.insert_data_rate.app.UnitOfWork')
     @patch('rate.insert_data_rate.app.handle_response')
-    def test_lambda_handler_user_not_found(self, mock_handle_response, mock_get_connection, mock_verify_user, mock_get_jwt_claims):
-        mock_verify_user.return_value = False
+    def test_lambda_handler_user_not_found(self, mock_handle_response, mock_unit_of_work, mock_get_jwt_claims):
+        mock_uow = mock_unit_of_work.return_value.__enter__.return_value
+        mock_cursor = mock_uow.cursor.return_value.__enter__.return_value
+        mock_cursor.rowcount = 0
+        mock_cursor.fetchone.return_value = None
         event = {'body': json.dumps({'value': '4', 'comment': 'test', 'id_auto': 1, 'id_user': 1})}
         context = {}
         lambda_handler(event, context)
         mock_handle_response.assert_called_with(None, 'El usuario no fue encontrado.', 400)
+        mock_uow.commit.assert_not_called()
 
     @patch('rate.insert_data_rate.app.get_jwt_claims')
-    @patch('rate.insert_data_rate.app.verify_user')
-    @patch('rate.insert_data_rate.app.verify_auto')
-    @patch('rate.insert_data_rate.app.get_connection')
+    @patch('rate.insert_data_rate.app.UnitOfWork')
     @patch('rate.insert_data_rate.app.handle_response')
-    def test_lambda_handler_auto_not_found(self, mock_handle_response, mock_get_connection, mock_verify_auto, mock_verify_user, mock_get_jwt_claims):
-        mock_verify_user.return_value = True
-        mock_verify_auto.return_value = False
+    def test_lambda_handler_auto_not_found(self, mock_handle_response, mock_unit_of_work, mock_get_jwt_claims):
+        mock_uow = mock_unit_of_work.return_value.__enter__.return_value
+        mock_cursor = mock_uow.cursor.return_value.__enter__.return_value
+        mock_cursor.rowcount = 0
+        mock_cursor.fetchone.return_value = (7,)
         event = {'body': json.dumps({'value': '4', 'comment': 'test', 'id_auto': 1, 'id_user': 1})}
         context = {}
         lambda_handler(event, context)
         mock_handle_response.assert_called_with(None, 'El auto no fue encontrado.', 400)
+        mock_uow.commit.assert_not_called()
 
     @patch('rate.insert_data_rate.app.get_jwt_claims')
     @patch('rate.insert_data_rate.app.handle_response')
@@ -129,12 +138,10 @@ class TestInsertRate(unittest.TestCase):
             None, 'El comentario no debe exceder los 100 caracteres.', 400
         )
 
-    @patch('rate.insert_data_rate.app.get_connection')
     @patch('rate.insert_data_rate.app.handle_response')
-    def test_insert_into_rate_exception(self, mock_handle_response, mock_get_connection):
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
-        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    def test_insert_into_rate_exception(self, mock_handle_response):
+        mock_uow = MagicMock()
+        mock_cursor = mock_uow.cursor.return_value.__enter__.return_value
         mock_cursor.execute.side_effect = Exception("DB Error")
 
         mock_handle_response.return_value = {
@@ -142,106 +149,100 @@ class TestInsertRate(unittest.TestCase):
             'body': 'Error al insertar la reseña.'
         }
 
-        response = insert_into_rate(4, 'test', 1, 1)
+        response = insert_into_rate(mock_uow, 4, 'test', 1, 'cognito-id')
 
         mock_handle_response.assert_called_with(ANY, 'Error al insertar la reseña.', 500)
         self.assertEqual(response['statusCode'], 500)
+        mock_uow.commit.assert_not_called()
 
     @patch('rate.insert_data_rate.app.get_jwt_claims')
-    @patch('rate.insert_data_rate.app.verify_user')
-    @patch('rate.insert_data_rate.app.verify_auto')
-    @patch('rate.insert_data_rate.app.check_existing_review')
-    @patch('rate.insert_data_rate.app.insert_into_rate')
-    @patch('rate.insert_data_rate.app.get_connection')
+    @patch('rate.insert_data_rate.app.UnitOfWork')
     @patch('rate.insert_data_rate.app.handle_response')
-    def test_lambda_handler_existing_review(self, mock_handle_response, mock_get_connection, mock_insert_into_rate, mock_check_existing_review, mock_verify_auto, mock_verify_user, mock_get_jwt_claims):
-        mock_verify_user.return_value = True
-        mock_verify_auto.return_value = True
-        mock_check_existing_review.return_value = True
+    def test_lambda_handler_existing_review(self, mock_handle_response, mock_unit_of_work, mock_get_jwt_claims):
+        mock_uow = mock_unit_of_work.return_value.__enter__.return_value
+        mock_cursor = mock_uow.cursor.return_value.__enter__.return_value
+        mock_cursor.execute.side_effect = pymysql.err.IntegrityError(1062, "Duplicate entry '1-1'")
         event = {'body': json.dumps({'value': '4', 'comment': 'test', 'id_auto': 1, 'id_user': 1})}
         context = {}
         lambda_handler(event, context)
         mock_handle_response.assert_called_with(None, 'El usuario ya ha reseñado este auto.', 400)
 
+    @patch('rate.insert_data_rate.app.handle_response')
+    def test_insert_into_rate_integrity_error(self, mock_handle_response):
+        mock_uow = MagicMock()
+        mock_cursor = mock_uow.cursor.return_value.__enter__.return_value
+        mock_cursor.execute.side_effect = pymysql.err.IntegrityError(1452, 'Foreign key constraint fails')
+
+        insert_into_rate(mock_uow, 4, 'test', 1, 'cognito-id')
+
+        mock_handle_response.assert_called_with(ANY, 'Error al insertar la reseña.', 500)
+
     @patch('rate.insert_data_rate.app.get_jwt_claims')
-    @patch('rate.insert_data_rate.app.verify_user')
-    @patch('rate.insert_data_rate.app.verify_auto')
-    @patch('rate.insert_data_rate.app.check_existing_review')
-    @patch('rate.insert_data_rate.app.get_connection')
-    def test_lambda_handler_successful(self, mock_get_connection, mock_check_existing_review, mock_verify_auto, mock_verify_user, mock_get_jwt_claims):
-        mock_verify_user.return_value = True
-        mock_verify_auto.return_value = True
-        mock_check_existing_review.return_value = False
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
+    @patch('rate.insert_data_rate.app.UnitOfWork')
+    def test_lambda_handler_successful(self, mock_unit_of_work, mock_get_jwt_claims):
+        mock_get_jwt_claims.return_value = {'cognito:username': 'cognito-id'}
+        mock_uow = mock_unit_of_work.return_value.__enter__.return_value
+        mock_cursor = mock_uow.cursor.return_value.__enter__.return_value
+        mock_cursor.rowcount = 1
         event = {'body': json.dumps({'value': '4', 'comment': 'test', 'id_auto': 1, 'id_user': 1})}
         context = {}
         response = lambda_handler(event, context)
         self.assertEqual(response['statusCode'], 200)
-
-    @patch('rate.insert_data_rate.app.get_connection')
-    def test_insert_into_rate(self, mock_get_connection):
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
-        response = insert_into_rate(4, 'test', 1, 1)
+        self.assertEqual(mock_cursor.execute.call_args_list[0][0][1], (4, 'test', 1, 'cognito-id'))
+        summary_query, summary_params = mock_cursor.execute.call_args_list[1][0]
+        self.assertIn('INSERT INTO rate_summary', summary_query)
+        self.assertEqual(summary_params, (1, 1, 4, 0, 0, 0, 1, 0))
+        self.assertEqual(mock_cursor.execute.call_args_list[2][0][0], "UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+        mock_uow.commit.assert_called_once()
+        mock_unit_of_work.return_value.__exit__.assert_called_once()
+
+    def test_insert_into_rate(self):
+        mock_uow = MagicMock()
+        mock_uow.cursor.return_value.__enter__.return_value.rowcount = 1
+        response = insert_into_rate(mock_uow, 4, 'test', 1, 'cognito-id')
         self.assertEqual(response['statusCode'], 200)
+        mock_uow.commit.assert_called_once()
 
-    @patch('rate.insert_data_rate.app.get_connection')
-    def test_verify_user(self, mock_get_connection):
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
-        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
-        mock_cursor.fetchone.return_value = True
-        self.assertTrue(verify_user(1))
-
-    @patch('rate.insert_data_rate.app.get_connection')
-    def test_verify_auto(self, mock_get_connection):
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
-        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    def test_verify_user(self):
+        mock_uow = MagicMock()
+        mock_cursor = mock_uow.cursor.return_value.__enter__.return_value
         mock_cursor.fetchone.return_value = True
-        self.assertTrue(verify_auto(1))
+        self.assertTrue(verify_user(mock_uow, 'cognito-id'))
 
-    @patch('rate.insert_data_rate.app.get_connection')
-    def test_check_existing_review(self, mock_get_connection):
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
-        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
-        mock_cursor.fetchone.return_value = True
-        self.assertTrue(check_existing_review(1, 1))
-
-    @patch('rate.insert_data_rate.app.get_connection')
-    def test_verify_user_exception(self, mock_get_connection):
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
-        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    def test_verify_user_exception(self):
+        mock_uow = MagicMock()
+        mock_cursor = mock_uow.cursor.return_value.__enter__.return_value
         mock_cursor.execute.side_effect = Exception("DB Error")
 
-        result = verify_user(1)
+        result = verify_user(mock_uow, 'cognito-id')
 
         self.assertFalse(result)
 
-    @patch('rate.insert_data_rate.app.get_connection')
-    def test_verify_auto_exception(self, mock_get_connection):
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
-        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
-        mock_cursor.execute.side_effect = Exception("DB Error")
+    @patch('rate.insert_data_rate.database.release_connection')
+    @patch('rate.insert_data_rate.database.get_connection')
+    def test_unit_of_work(self, mock_get_connection, mock_release_connection):
+        mock_connection = mock_get_connection.return_value
 
-        result = verify_auto(1)
+        with UnitOfWork() as uow:
+            uow.cursor()
+            uow.commit()
 
-        self.assertFalse(result)
+        mock_get_connection.assert_called_once()
+        mock_connection.cursor.assert_called_once()
+        mock_connection.commit.assert_called_once()
+        mock_release_connection.assert_called_once_with(mock_connection)
 
-    @patch('rate.insert_data_rate.app.get_connection')
-    def test_check_existing_review_exception(self, mock_get_connection):
-        mock_conn = MagicMock()
-        mock_get_connection.return_value = mock_conn
-        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
-        mock_cursor.execute.side_effect = Exception("DB Error")
+    @patch('rate.insert_data_rate.database.release_connection')
+    @patch('rate.insert_data_rate.database.get_connection')
+    def test_unit_of_work_exception(self, mock_get_connection, mock_release_connection):
+        mock_connection = mock_get_connection.return_value
 
-        result = check_existing_review(1, 1)
+        with self.assertRaises(ValueError):
+            with UnitOfWork():
+                raise ValueError('boom')
 
-        self.assertFalse(result)
+        mock_connection.commit.assert_not_called()
+        mock_release_connection.assert_called_once_with(mock_connection)
 
     # Test for connection.py
 
@@ -0,0 +1,134 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+from decimal import Decimal
+from rate.rebuild_rate_summary.app import lambda_handler, find_drift, get_expected_summary, rebuild_summary
+from rate.rebuild_rate_summary.database import get_secret, clear_secret_cache, discard_connection, handle_response, \
+    headers_cors
+from botocore.exceptions import ClientError
+
+
+class TestRebuildRateSummary(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
+    @patch('rate.rebuild_rate_summary.app.get_connection')
+    def test_lambda_handler_rebuilds_on_drift(self, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [
+            [(1, 2, Decimal('9'), Decimal('0'), Decimal('0'), Decimal('0'), Decimal('1'), Decimal('1'))],
+            [(1, 1, 5, 0, 0, 0, 0, 1), (2, 1, 3, 0, 0, 1, 0, 0)],
+            # A third review of car 1 committed after the snapshot.
+            [(1, 3, Decimal('12'), Decimal('0'), Decimal('0'), Decimal('1'), Decimal('1'), Decimal('1'))]
+        ]
+
+        response = lambda_handler({}, {})
+
+        body = json.loads(response['body'])
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(body['data'], {'drift': [1, 2], 'rebuilt': True})
+        executed = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        self.assertFalse(any(query.startswith('DELETE') for query in executed))
+        self.assertTrue(executed[2].endswith('GROUP BY id_auto FOR SHARE'))
+        self.assertEqual(mock_cursor.execute.call_args_list[2][0][1], [5, 1, 2])
+        self.assertEqual(mock_cursor.executemany.call_args[0][1],
+                         [(1, 3, 12, 0, 0, 1, 1, 1), (2, 0, 0, 0, 0, 0, 0, 0)])
+        self.assertEqual(executed[-1], "UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+        mock_connection.commit.assert_called_once()
+
+    @patch('rate.rebuild_rate_summary.app.get_connection')
+    def test_lambda_handler_dry_run(self, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [[(1, 1, 5, 0, 0, 0, 0, 1)], []]
+
+        response = lambda_handler({'dry_run': True}, {})
+
+        body = json.loads(response['body'])
+        self.assertEqual(body['data'], {'drift': [1], 'rebuilt': False})
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        mock_connection.commit.assert_not_called()
+
+    @patch('rate.rebuild_rate_summary.app.get_connection')
+    def test_lambda_handler_no_drift(self, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.side_effect = [[(1, 1, 5, 0, 0, 0, 0, 1)], [(1, 1, 5, 0, 0, 0, 0, 1)]]
+
+        response = lambda_handler(None, {})
+
+        self.assertEqual(json.loads(response['body'])['data'], {'drift': [], 'rebuilt': False})
+        mock_connection.commit.assert_not_called()
+        mock_connection.rollback.assert_not_called()
+
+    @patch('rate.rebuild_rate_summary.app.get_connection')
+    @patch('rate.rebuild_rate_summary.app.handle_response')
+    def test_lambda_handler_exception(self, mock_handle_response, mock_get_connection):
+        mock_connection = mock_get_connection.return_value
+        mock_connection.cursor.side_effect = Exception('Database error')
+
+        response = lambda_handler({}, {})
+
+        mock_handle_response.assert_called_once_with(
+            unittest.mock.ANY, 'Ocurrió un error al reconstruir el resumen de reseñas.', 500)
+        self.assertEqual(response, mock_handle_response.return_value)
+        mock_connection.close.assert_called_once()
+
+    def test_find_drift_ignores_empty_rows(self):
+        expected = {1: (1, 5, 0, 0, 0, 0, 1)}
+        current = {1: (1, 5, 0, 0, 0, 0, 1), 2: (0, 0, 0, 0, 0, 0, 0)}
+
+        self.assertEqual(find_drift(expected, current), [])
+
+    def test_get_expected_summary_active_reviews(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(3, 1, Decimal('4'), 0, 0, 0, Decimal('1'), 0)]
+
+        summary = get_expected_summary(mock_cursor)
+
+        self.assertEqual(summary, {3: (1, 4, 0, 0, 0, 1, 0)})
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertEqual(params, [5])
+        self.assertNotIn('FOR SHARE', query)
+
+    def test_rebuild_summary_upserts_values_read_under_lock(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(1, 1, Decimal('5'), 0, 0, 0, 0, 1)]
+
+        rebuild_summary(mock_cursor, [1, 2])
+
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('AND id_auto IN (%s, %s)', query)
+        self.assertTrue(query.endswith('FOR SHARE'))
+        self.assertEqual(params, [5, 1, 2])
+        query, rows = mock_cursor.executemany.call_args[0]
+        self.assertIn('ON DUPLICATE KEY UPDATE', query)
+        self.assertEqual(rows, [(1, 1, 5, 0, 0, 0, 0, 1), (2, 0, 0, 0, 0, 0, 0, 0)])
+
+    # Test for database.py
+
+    @patch('rate.rebuild_rate_summary.database.boto3.session.Session')
+    def test_get_secret(self, mock_session):
+        mock_client = mock_session.return_value.client.return_value
+        mock_client.get_secret_value.return_value = {'SecretString': json.dumps({'HOST': 'localhost'})}
+
+        self.assertEqual(get_secret(), {'HOST': 'localhost'})
+        mock_client.get_secret_value.assert_called_once_with(SecretId='COAUTO')
+
+    @patch('rate.rebuild_rate_summary.database.boto3.session.Session')
+    def test_get_secret_error(self, mock_session):
+        mock_client = mock_session.return_value.client.return_value
+        mock_client.get_secret_value.side_effect = ClientError(
+            {'Error': {'Code': 'ResourceNotFoundException'}}, 'GetSecretValue')
+
+        with self.assertRaises(ClientError):
+            get_secret()
+
+    def test_handle_response(self):
+        response = handle_response('TestError', 'TestMessage', 400)
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(response['headers'], headers_cors)
+        self.assertEqual(json.loads(response['body'])['error'], 'TestError')
@@ -1,12 +1,25 @@
 import unittest
 from unittest.mock import patch
 import json
-from rate.search_rate_by.app import lambda_handler, handle_response
+from datetime import datetime
+from rate.search_rate_by.app import lambda_handler, handle_response, encode_cursor, decode_cursor
 from botocore.exceptions import ClientError
-from rate.search_rate_by.connection import get_secret, headers_cors, get_connection
+from rate.search_rate_by.connection import get_secret, clear_secret_cache, discard_connection, headers_cors, get_connection
+
+T1 = datetime(2026, 10, 2, 9, 30)
+T2 = datetime(2026, 10, 1, 18, 0)
+
+ROWS = [
+    (3, 5, 'Excelente', 'Civic', 'Honda', 'Ana', 'López', 1, None, 'Activo', 2020, 'ana@example.com', T1),
+    (2, 4, 'Bueno', 'Civic', 'Honda', 'Luis', 'Pérez', 1, None, 'Activo', 2020, 'luis@example.com', T2),
+    (1, 4, 'Bueno', 'Accord', 'Honda', 'Eva', 'Ruiz', 2, None, 'Activo', 2021, 'eva@example.com', T2)
+]
 
 
 class TestSearchRateBy(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
 
     @patch('rate.search_rate_by.app.get_connection')
     @patch('rate.search_rate_by.app.handle_response')
@@ -20,7 +33,7 @@ class TestSearchRateBy(unittest.TestCase):
         mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
         mock_cursor.fetchall.return_value = [
             (1, 5, 'Great car!', 'Civic', 'Honda', 'John', 'Doe', 1, 'profile_image_url', 'Active', 2020,
-             'john@example.com')
+             'john@example.com', T1)
         ]
 
         response = lambda_handler(event, context)
@@ -32,6 +45,71 @@ class TestSearchRateBy(unittest.TestCase):
         self.assertTrue(len(body['data']) > 0)
         mock_connection.close.assert_called_once()
 
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor('highest', 4, T2, 2), 'highest'), (4, T2, 2))
+
+        with self.assertRaises(ValueError):
+            decode_cursor(encode_cursor('highest', 4, T2, 2), 'lowest')
+
+    @patch('rate.search_rate_by.app.get_connection')
+    def test_lambda_handler_invalid_pagination(self, mock_get_connection):
+        cases = [
+            ({'type': 'año', 'value': 'dos mil'}, 'El año debe ser un número entero.'),
+            ({'type': 'marca', 'value': 'Honda', 'sort': 'oldest'},
+             'El parámetro sort debe ser uno de los siguientes: newest, highest, lowest'),
+            ({'type': 'marca', 'value': 'Honda', 'limit': '0'}, 'El parámetro limit debe ser un entero entre 1 y 100.'),
+            ({'type': 'marca', 'value': 'Honda', 'after': '%%%'}, 'El parámetro after no es un cursor válido.'),
+            ({'type': 'marca', 'value': 'Honda', 'sort': 'lowest', 'after': encode_cursor('newest', 5, T1, 3)},
+             'El parámetro after no es un cursor válido.')
+        ]
+        for query_params, message in cases:
+            response = lambda_handler({'queryStringParameters': query_params}, None)
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])['message'], message)
+
+        response = lambda_handler({'queryStringParameters': None}, None)
+        self.assertEqual(response['statusCode'], 400)
+
+        mock_get_connection.assert_not_called()
+
+    @patch('rate.search_rate_by.app.get_connection')
+    def test_lambda_handler_first_page_newest(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = ROWS
+
+        response = lambda_handler({'queryStringParameters': {'type': 'año', 'value': '2020', 'limit': '2'}}, None)
+
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('WHERE a.year = %s ORDER BY r.created_at DESC, r.id_rate DESC LIMIT %s', ' '.join(query.split()))
+        self.assertEqual(params, [2020, 3])
+
+        body = json.loads(response['body'])
+        self.assertEqual([rate['id_rate'] for rate in body['data']], [3, 2])
+        self.assertEqual(body['data'][0]['created_at'], '2026-10-02T09:30:00')
+        self.assertEqual(decode_cursor(body['next_cursor'], 'newest'), (4, T2, 2))
+
+    @patch('rate.search_rate_by.app.get_connection')
+    def test_lambda_handler_next_page_by_rating(self, mock_get_connection):
+        mock_cursor = mock_get_connection.return_value.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = ROWS[2:]
+
+        for sort, operator, order_by in [('highest', '<', 'r.value DESC'), ('lowest', '>', 'r.value ASC')]:
+            response = lambda_handler({'queryStringParameters': {
+                'type': 'marca', 'value': 'Honda', 'sort': sort, 'after': encode_cursor(sort, 4, T2, 2)
+            }}, None)
+
+            query, params = mock_cursor.execute.call_args[0]
+            query = ' '.join(query.split())
+            self.assertIn(f'AND (r.value {operator} %s OR (r.value = %s AND '
+                          '(r.created_at < %s OR (r.created_at = %s AND r.id_rate < %s))))', query)
+            self.assertIn(f'ORDER BY {order_by}, r.created_at DESC, r.id_rate DESC LIMIT %s', query)
+            self.assertEqual(params, ['Honda', 4, 4, T2, T2, 2, 21])
+
+            body = json.loads(response['body'])
+            self.assertEqual([rate['id_rate'] for rate in body['data']], [1])
+            self.assertIsNone(body['next_cursor'])
+
     @patch('rate.search_rate_by.connection.pymysql.connect')
     @patch('rate.search_rate_by.connection.get_secret')
     def test_lambda_handler_missing_parameters(self, mock_get_secret, mock_connect):
@@ -47,14 +125,10 @@ class TestSearchRateBy(unittest.TestCase):
             'DB_NAME': 'database'
         }
 
-        mock_connection = mock_connect.return_value
-        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
-
         response = lambda_handler(event, context)
 
         self.assertEqual(response['statusCode'], 400)
-        mock_cursor.execute.assert_not_called()
-        mock_connect.assert_called_once()
+        mock_connect.assert_not_called()
 
     @patch('rate.search_rate_by.connection.pymysql.connect')
     @patch('rate.search_rate_by.connection.get_secret')
@@ -71,14 +145,10 @@ class TestSearchRateBy(unittest.TestCase):
             'DB_NAME': 'database'
         }
 
-        mock_connection = mock_connect.return_value
-        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
-
         response = lambda_handler(event, context)
 
         self.assertEqual(response['statusCode'], 400)
-        mock_cursor.execute.assert_not_called()
-        mock_connect.assert_called_once()
+        mock_connect.assert_not_called()
 
     @patch('rate.search_rate_by.app.get_connection')
     @patch('rate.search_rate_by.app.handle_response')
@@ -112,15 +182,11 @@ class TestSearchRateBy(unittest.TestCase):
             'DB_NAME': 'database'
         }
 
-        mock_connection = mock_connect.return_value
-        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
-
         response = lambda_handler(event, context)
 
         self.assertEqual(response['statusCode'], 400)
         self.assertIn('Debe proporcionar los parámetros: type y value', json.loads(response['body'])['message'])
-        mock_cursor.execute.assert_not_called()
-        mock_connect.assert_called_once()
+        mock_connect.assert_not_called()
 
     @patch('rate.search_rate_by.connection.boto3.session.Session')
     def test_get_secret(self, mock_session):
@@ -4,7 +4,7 @@ import json
 
 from botocore.exceptions import ClientError
 from user.delete_data_user.app import lambda_handler, get_username_by_id, get_status_value, update_user_status
-from user.delete_data_user.connection import get_connection, get_secret, handle_response
+from user.delete_data_user.connection import get_connection, get_secret, clear_secret_cache, discard_connection, handle_response
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -14,6 +14,10 @@ headers_cors = {
 
 
 class TestDeleteUser(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
     @patch('user.delete_data_user.app.get_connection')
     def test_get_username_by_id_success(self, mock_get_connection):
         mock_connection = MagicMock()
@@ -5,7 +5,7 @@ import json
 
 from botocore.exceptions import ClientError
 
-from user.get_data_user.connection import get_connection, get_secret, handle_response
+from user.get_data_user.connection import get_connection, get_secret, clear_secret_cache, discard_connection, handle_response
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
     'Access-Control-Allow-Headers': '*',
@@ -14,6 +14,9 @@ headers_cors = {
 
 
 class TestGetUser(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
 
     @patch('user.get_data_user.app.get_connection')
     @patch('user.get_data_user.app.handle_response')
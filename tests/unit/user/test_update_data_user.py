@@ -2,11 +2,15 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 from user.update_data_user.app import lambda_handler, update_user, headers_cors
-from user.update_data_user.connection import get_connection, get_secret, handle_response
+from user.update_data_user.connection import get_connection, get_secret, clear_secret_cache, discard_connection, handle_response
 from botocore.exceptions import ClientError
 
 
 class TestUpdateUser(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
+
     def test_invalid_request_body(self):
         event = {
             'body': 'invalid json'
@@ -67,10 +71,11 @@ class TestUpdateUser(unittest.TestCase):
         response = update_user('123', 'John', 'Doe')
         self.assertEqual(response['statusCode'], 200)
         self.assertEqual(json.loads(response['body'])['message'], 'Usuario actualizado correctamente')
-        mock_cursor.execute.assert_called_once_with(
+        mock_cursor.execute.assert_any_call(
             "UPDATE user SET name=%s, lastname=%s WHERE id_user=%s",
             ('John', 'Doe', '123')
         )
+        mock_cursor.execute.assert_called_with("UPDATE rate_listing_version SET version = version + 1 WHERE id = 1")
         mock_connection.commit.assert_called_once()
         mock_connection.close.assert_called_once()
 
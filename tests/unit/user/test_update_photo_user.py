@@ -3,11 +3,14 @@ from unittest.mock import patch, Mock, ANY, MagicMock
 import json
 import base64
 from user.update_photo_user.app import lambda_handler, update_photo, get_jwt_claims, headers_cors
-from user.update_photo_user.connection import get_connection, get_secret, handle_response
+from user.update_photo_user.connection import get_connection, get_secret, clear_secret_cache, discard_connection, handle_response
 from botocore.exceptions import ClientError
 
 
 class TestUpdatePhotoUser(unittest.TestCase):
+    def setUp(self):
+        clear_secret_cache()
+        discard_connection()
 
     @patch('user.update_photo_user.app.get_connection')
     @patch('user.update_photo_user.app.get_jwt_claims')
@@ -105,10 +108,11 @@ class TestUpdatePhotoUser(unittest.TestCase):
             mock_get_jwt_claims.return_value = {'cognito:username': id_user}
 
             response = update_photo(profile_image, token)
-            mock_cursor.execute.assert_called_once_with(
+            mock_cursor.execute.assert_any_call(
                 "UPDATE user SET profile_image=%s WHERE id_cognito=%s",
                 (profile_image, id_user)
             )
+            mock_cursor.execute.assert_called_with("UPDATE rate_listing_version SET version = version + 1 WHERE id = 1")
             self.assertEqual(response['statusCode'], 200)
 
     def test_get_jwt_claims_invalid_token(self):
@@ -2,9 +2,9 @@ import json
 import boto3
 from botocore.exceptions import ClientError
 try:
-    from connection import get_connection, handle_response, get_secret
+    from connection import get_connection, release_connection, handle_response, get_secret
 except ImportError:
-    from .connection import get_connection, handle_response, get_secret
+    from .connection import get_connection, release_connection, handle_response, get_secret
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -65,7 +65,7 @@ def update_user_status(id_user, status, value):
     except Exception as e:
         return handle_response(e, 'Ocurrió un error al actualizar el usuario', 500)
     finally:
-        connection.close()
+        release_connection(connection)
 
     return {
         'statusCode': 200,
@@ -90,7 +90,7 @@ def get_username_by_id(id_user):
     except Exception as e:
         raise e
     finally:
-        connection.close()
+        release_connection(connection)
 
 
 def get_status_value(id_status):
@@ -106,4 +106,4 @@ def get_status_value(id_status):
     except Exception as e:
         raise e
     finally:
-        connection.close()
+        release_connection(connection)
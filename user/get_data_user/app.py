@@ -1,8 +1,8 @@
 import json
 try:
-    from connection import get_connection, handle_response
+    from connection import get_connection, release_connection, handle_response
 except ImportError:
-    from .connection import get_connection, handle_response
+    from .connection import get_connection, release_connection, handle_response
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -49,7 +49,7 @@ def lambda_handler(event, context):
         return handle_response(e, 'Error al obtener usuarios', 500)
 
     finally:
-        connection.close()
+        release_connection(connection)
 
     return {
         "statusCode": 200,
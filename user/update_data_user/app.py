@@ -1,8 +1,8 @@
 import json
 try:
-    from connection import get_connection, handle_response
+    from connection import get_connection, release_connection, handle_response
 except ImportError:
-    from .connection import get_connection, handle_response
+    from .connection import get_connection, release_connection, handle_response
 
 headers_cors = {
     'Access-Control-Allow-Origin': '*',
@@ -44,13 +44,14 @@ def update_user(id_user, name, lastname):
                 "UPDATE user SET name=%s, lastname=%s WHERE id_user=%s",
                 (name, lastname, id_user)
             )
+            bump_rate_listing_version(cursor)
             connection.commit()
 
     except Exception as e:
         return handle_response(e,'Ocurrió un error al actualizar usuario.', 500)
 
     finally:
-        connection.close()
+        release_connection(connection)
 
     return {
         'statusCode': 200,
@@ -60,3 +61,7 @@ def update_user(id_user, name, lastname):
             'message': 'Usuario actualizado correctamente'
         })
     }
+
+
+def bump_rate_listing_version(cursor):
+    cursor.execute("UPDATE rate_listing_version SET version = version + 1 WHERE id = 1")
@@ -1,8 +1,8 @@
 import json
 try:
-    from connection import get_connection, handle_response
+    from connection import get_connection, release_connection, handle_response
 except ImportError:
-    from .connection import get_connection, handle_response
+    from .connection import get_connection, release_connection, handle_response
 
 import base64
 headers_cors = {
@@ -48,11 +48,15 @@ def update_photo(profile_image, token):
                 "UPDATE user SET profile_image=%s WHERE id_cognito=%s",
                 (profile_image, id_user)
             )
+            bump_rate_listing_version(cursor)
             connection.commit()
 
     except Exception as e:
         return handle_response(e, 'Ocurrió un error al actualizar usuario.', 500)
 
+    finally:
+        release_connection(connection)
+
     return {
         'statusCode': 200,
         'headers': headers_cors,
@@ -79,3 +83,7 @@ def get_jwt_claims(token):
 
     except ValueError:
         return None
+
+
+def bump_rate_listing_version(cursor):
+    cursor.execute("UPDATE rate_listing_version SET version = version + 1 WHERE id = 1")